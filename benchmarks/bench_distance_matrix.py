@@ -0,0 +1,57 @@
+"""
+Benchmark del calculo de la matriz de distancias (TSPlibReader.compute_distances) con los kernels vectorizados
+por bloques de filas contra el calculo anterior par a par con las funciones de redondeo de TSPLIB
+
+Uso: python benchmarks/bench_distance_matrix.py [instancia ...]
+
+"""
+
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from timeit import default_timer as timer
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.tspf.TSPlibReader import TSPlibReader, Distance_type
+
+INSTANCES = ["1000-3", "2000-5", "3000-4"]
+# Repeticiones del calculo vectorizado, se reporta el mejor tiempo
+REPEAT = 3
+
+
+def pair_matrix(reader: TSPlibReader) -> list:
+    """ Calculo anterior: lista de listas con una llamada por par a la funcion de distancia del tipo de la instancia """
+    distance = {Distance_type.EUC_2D: reader.round_distance, Distance_type.CEIL_2D: reader.ceil_distance,
+                Distance_type.GEO: reader.geo_distance, Distance_type.ATT: reader.att_distance}[reader.distance_type]
+    matrix = []
+    for i in range(reader.n):
+        matrix.append([])
+        for j in range(reader.n):
+            matrix[i].append(distance(i, j))
+    return matrix
+
+def vectorized_matrix(reader: TSPlibReader) -> float:
+    """ Mejor tiempo de compute_distances """
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = timer()
+        reader.compute_distances()
+        best = min(best, timer() - start)
+    return best
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or INSTANCES:
+        with redirect_stdout(StringIO()):
+            reader = TSPlibReader(str(ROOT / "instances" / f"{name}.tsp"), cache=False)
+        vectorized = vectorized_matrix(reader)
+        start = timer()
+        matrix = pair_matrix(reader)
+        pairs = timer() - start
+        assert np.array_equal(np.asarray(reader.distance), np.array(matrix)), "las matrices no coinciden"
+        print(f"{name} (n={reader.n}): par a par {pairs:.3f} s, vectorizado {vectorized:.3f} s ({pairs / vectorized:.1f}x)")
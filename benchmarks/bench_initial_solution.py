@@ -0,0 +1,44 @@
+"""
+Benchmark de la solución inicial SPACE_FILLING_CURVE (orden de la curva de Hilbert) contra NEAREST_N desde el nodo 0:
+tiempo de construccion y diferencia de costo en las instancias portgen incluidas
+
+Uso: python benchmarks/bench_initial_solution.py [instancia ...]
+
+"""
+
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from timeit import default_timer as timer
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.tspf import AlgorithmsOptions, Tsp
+
+INSTANCES = ["1000-3", "1500-1", "2000-5", "2500-2", "3000-4"]
+# Repeticiones de cada construccion, se reporta el mejor tiempo
+REPEAT = 5
+
+
+def best_time(build) -> tuple:
+    """ Mejor tiempo en milisegundos y tour de la funcion build """
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = timer()
+        tour = build()
+        best = min(best, timer() - start)
+    return best * 1000, tour
+
+
+if __name__ == "__main__":
+    AlgorithmsOptions.use_cache = False
+    for name in sys.argv[1:] or INSTANCES:
+        with redirect_stdout(StringIO()):
+            problem = Tsp(filename=str(ROOT / "instances" / f"{name}.tsp"))
+        curve, curve_tour = best_time(problem.space_filling_curve_tour)
+        nearest, nearest_tour = best_time(lambda: problem.greedy_nearest_n(0))
+        curve_cost, nearest_cost = problem.compute_tour_length(curve_tour), problem.compute_tour_length(nearest_tour)
+        print(f"{name} (n={problem.getSize()}): SPACE_FILLING_CURVE {curve:.1f} ms costo {curve_cost}, "
+              f"NEAREST_N {nearest:.1f} ms costo {nearest_cost} ({100 * (curve_cost - nearest_cost) / nearest_cost:+.1f}%)")
@@ -0,0 +1,59 @@
+"""
+Benchmark de la lectura de instancias (TSPlibReader.read_etsp): NODE_COORD_SECTION convertida en un solo paso
+a un arreglo contra la lectura anterior linea por linea con un objeto Point por ciudad
+
+Uso: python benchmarks/bench_parser.py [instancia ...]
+
+"""
+
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from timeit import default_timer as timer
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.tspf.TSPlibReader import TSPlibReader, Point
+
+INSTANCES = ["burma14", "berlin52", "kroA100", "lin318", "att532", "uy734", "1000-3", "3000-4"]
+# Tiempo minimo de medicion por instancia en segundos
+MIN_TIME = 0.5
+
+
+def line_parser(tsp_file_name: str) -> list:
+    """ Lectura anterior: cabecera y coordenadas con readline, split y un Point por ciudad """
+    nodeptr = []
+    found_coord_section = False
+    with open(tsp_file_name, "r") as archivo:
+        linea = archivo.readline()
+        while linea:
+            if linea.find("EOF") != -1:
+                break
+            if found_coord_section:
+                city_info = linea.split()
+                nodeptr.append(Point(float(city_info[1]), float(city_info[2])))
+            if linea.startswith("NODE_COORD_SECTION"):
+                found_coord_section = True
+            linea = archivo.readline()
+    return nodeptr
+
+def best_time(parse) -> float:
+    """ Mejor tiempo de la funcion parse en milisegundos """
+    best, start = float("inf"), timer()
+    while timer() - start < MIN_TIME:
+        begin = timer()
+        parse()
+        best = min(best, timer() - begin)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    reader = TSPlibReader.__new__(TSPlibReader) # solo se utiliza read_etsp, sin calcular distancias
+    for name in sys.argv[1:] or INSTANCES:
+        filename = str(ROOT / "instances" / f"{name}.tsp")
+        with redirect_stdout(StringIO()):
+            vectorized = best_time(lambda: reader.read_etsp(filename))
+        lines = best_time(lambda: line_parser(filename))
+        print(f"{name} (n={reader.n}): linea por linea {lines:.2f} ms, read_etsp {vectorized:.2f} ms ({lines / vectorized:.1f}x)")
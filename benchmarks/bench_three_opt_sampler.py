@@ -0,0 +1,49 @@
+"""
+Benchmark del muestreo de indices aleatorios para el movimiento 3-opt (Tour.getIndThreeOpt)
+
+Uso: python benchmarks/bench_three_opt_sampler.py [instancia ...]
+
+"""
+
+import sys
+from pathlib import Path
+from timeit import default_timer as timer
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.tspf import AlgorithmsOptions, Tsp, Tour, InitialSolution
+from src.tspf.Tools import utilities
+
+INSTANCES = ["berlin52", "1000-3", "3000-4"]
+# Tiempo minimo de medicion por instancia en segundos
+MIN_TIME = 0.5
+
+
+def loop_sampler(n: int) -> tuple:
+    """ Muestreo anterior por recorrido de los ciclos anidados, como referencia (no uniforme) """
+    for i in range(n):
+        for j in range(i + 2, n):
+            for k in range(j + 2, n + (i > 0)):
+                if utilities.random.randint(0, 100) <= 1:
+                    return i, j, k
+    return 0, 2, 4
+
+def rate(sample) -> float:
+    """ Muestras por segundo de la funcion sample """
+    count, start = 0, timer()
+    while timer() - start < MIN_TIME:
+        for _ in range(1000):
+            sample()
+        count += 1000
+    return count / (timer() - start)
+
+
+if __name__ == "__main__":
+    AlgorithmsOptions.use_cache = False
+    utilities.random.seed(0)
+    for name in sys.argv[1:] or INSTANCES:
+        tour = Tour(problem=Tsp(filename=str(ROOT / "instances" / f"{name}.tsp")), type_initial_sol=InitialSolution.RANDOM)
+        n = tour.problem.getSize()
+        print(f"{name} (n={n}): getIndThreeOpt {rate(tour.getIndThreeOpt):,.0f} muestras/s, "
+              f"ciclos anidados {rate(lambda: loop_sampler(n)):,.0f} muestras/s")
@@ -0,0 +1,92 @@
+"""
+Benchmark de las representaciones del tour para 2-opt (-tb array | linked): movimientos 2-opt aleatorios por segundo
+con Tour.twoOptSwap y con TwoLevelList.move (solo se aplica el movimiento, sin calcular el costo), y tiempo de la
+búsqueda local 2-opt con cada representacion. Los tamaños sin instancia incluida se generan con puntos uniformes en modo lazy
+
+Uso: python benchmarks/bench_tour_backend.py [instancia | tamaño ...]
+
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from timeit import default_timer as timer
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from prettytable import PrettyTable
+
+from src.tspf import AlgorithmsOptions, Tsp, Tour, InitialSolution, TourBackend, TSPMove, TwoLevelList
+from src.tspf.Algorithms import LocalSearch
+from src.tspf.Tools import utilities
+
+INSTANCES = ["lin318", "uy734", "1000-3", "2000-5", "3000-4", "10000", "30000", "100000"]
+# Instancias de la búsqueda local completa desde el vecino mas cercano
+SEARCH_INSTANCES = ["berlin52", "kroA100", "ch130", "lin318"]
+# Tiempo minimo de medicion por instancia en segundos
+MIN_TIME = 1.0
+
+
+def load(name: str, folder: str) -> Tsp:
+    """ Instancia incluida o instancia uniforme de name nodos (modo lazy) """
+    if not name.isdigit():
+        return Tsp(filename=str(ROOT / "instances" / f"{name}.tsp"))
+    n = int(name)
+    filename = Path(folder) / f"uniform{n}.tsp"
+    with open(filename, "w") as file:
+        file.write(f"NAME : uniform{n}\nTYPE : TSP\nDIMENSION : {n}\nEDGE_WEIGHT_TYPE : EUC_2D\nNODE_COORD_SECTION\n")
+        for i in range(n):
+            file.write(f"{i + 1} {utilities.random.randint(0, 10**6)} {utilities.random.randint(0, 10**6)}\n")
+        file.write("EOF\n")
+    return Tsp(filename=str(filename), options=AlgorithmsOptions(lazy=True))
+
+def rate(move) -> float:
+    """ Movimientos por segundo de la funcion move """
+    count, start = 0, timer()
+    while timer() - start < MIN_TIME:
+        for _ in range(100):
+            move()
+        count += 100
+    return count / (timer() - start)
+
+def array_move(tour: Tour) -> None:
+    n = tour.problem.getSize()
+    tour.twoOptSwap(utilities.random.randrange(n), utilities.random.randrange(n))
+
+def linked_move(linked: TwoLevelList) -> None:
+    a, c = utilities.random.randrange(linked.n), utilities.random.randrange(linked.n)
+    linked.move(a, linked.next(a), c, linked.next(c))
+
+def search_time(problem: Tsp, backend: TourBackend) -> tuple:
+    """ Tiempo y costo final de la búsqueda local 2-opt (first improvement) desde el vecino mas cercano """
+    options = AlgorithmsOptions(tour_backend=backend.value)
+    options.move, options.silent = TSPMove.TWO_OPT, True
+    utilities.random.seed(0) # mismo nodo de inicio del vecino mas cercano
+    first = Tour(problem=problem, type_initial_sol=InitialSolution.NEAREST_N)
+    solver = LocalSearch(options=options, problem=problem)
+    solver.best_tour.copy(first)
+    tour = Tour(tour=first)
+    start = timer()
+    solver.twoOptSearch(tour, PrettyTable())
+    return timer() - start, tour.cost
+
+
+if __name__ == "__main__":
+    AlgorithmsOptions.use_cache = False
+    utilities.random.seed(0)
+    with tempfile.TemporaryDirectory() as folder:
+        for name in sys.argv[1:] or INSTANCES:
+            problem = load(name, folder)
+            tour = Tour(problem=problem, type_initial_sol=InitialSolution.RANDOM)
+            tour.delta_cost_two_opt = lambda current, cost, s, e: cost # sin calcular el costo, como en linked_move
+            linked = TwoLevelList(tour.current)
+            array, two_level = rate(lambda: array_move(tour)), rate(lambda: linked_move(linked))
+            print(f"{name} (n={problem.getSize()}): array {array:,.0f} movimientos/s, "
+                  f"linked {two_level:,.0f} movimientos/s ({two_level / array:.2f}x)")
+    if len(sys.argv) == 1:
+        for name in SEARCH_INSTANCES:
+            problem = load(name, "")
+            (array, cost), (two_level, linked_cost) = search_time(problem, TourBackend.ARRAY), search_time(problem, TourBackend.LINKED)
+            print(f"{name} (n={problem.getSize()}): búsqueda 2-opt array {array:.2f} s, linked {two_level:.2f} s "
+                  f"(costo {cost} / {linked_cost})")
@@ -0,0 +1,67 @@
+"""
+Benchmark del movimiento 2-opt aleatorio (Tour.twoOptSwap, inversion en el mismo tour del lado mas corto del ciclo)
+contra la version anterior que reconstruia el tour con tres cortes y lo copiaba, tal cual (sin indice de posiciones)
+y actualizando las posiciones de la seccion invertida como requiere Tour
+
+Uso: python benchmarks/bench_two_opt_move.py [instancia ...]
+
+"""
+
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from timeit import default_timer as timer
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.tspf import AlgorithmsOptions, Tsp, Tour, InitialSolution
+from src.tspf.Tools import utilities
+
+INSTANCES = ["1000-3", "3000-4"]
+# Movimientos aleatorios por medicion
+MOVES = 20000
+
+
+def slice_two_opt(tour: Tour, n1: int, n2: int, positions: bool = False) -> None:
+    """ Version anterior: nuevo tour con [0,s) + [s,e] invertida + (e,n] y copia completa """
+    if n1 == n2:
+        return
+    s, e = min(n1, n2), max(n1, n2)
+    new_tour = tour.current[:s]
+    section = tour.current[s:e + 1]
+    section.reverse()
+    new_tour.extend(section)
+    new_tour.extend(tour.current[e + 1:])
+    new_tour[len(tour.current) - 1] = new_tour[0]
+    tour.cost = tour.delta_cost_two_opt(tour.current, tour.cost, s, e)
+    tour.current = new_tour.copy()
+    if positions:
+        tour.updatePosition(s, e + 1)
+
+def rate(tour: Tour, move) -> float:
+    """ Movimientos por segundo de MOVES movimientos aleatorios """
+    n = tour.problem.getSize()
+    pairs = [(utilities.random.randrange(n), utilities.random.randrange(n)) for _ in range(MOVES)]
+    start = timer()
+    for n1, n2 in pairs:
+        move(tour, n1, n2)
+    return MOVES / (timer() - start)
+
+
+if __name__ == "__main__":
+    AlgorithmsOptions.use_cache = False
+    utilities.random.seed(0)
+    for name in sys.argv[1:] or INSTANCES:
+        with redirect_stdout(StringIO()):
+            problem = Tsp(filename=str(ROOT / "instances" / f"{name}.tsp"))
+        tour = Tour(problem=problem, type_initial_sol=InitialSolution.RANDOM)
+        in_place = rate(tour, Tour.twoOptSwap)
+        copies_positions = rate(tour, lambda tour, n1, n2: slice_two_opt(tour, n1, n2, True))
+        # sin posiciones se mide al final, deja desactualizado el indice que utiliza twoOptSwap
+        copies = rate(tour, slice_two_opt)
+        assert tour.cost == problem.compute_tour_length(tour.current)
+        print(f"{name} (n={problem.getSize()}): twoOptSwap {in_place:,.0f} movimientos/s, "
+              f"tres cortes y copia {copies_positions:,.0f} movimientos/s con posiciones ({in_place / copies_positions:.2f}x), "
+              f"{copies:,.0f} movimientos/s sin posiciones ({in_place / copies:.2f}x)")
@@ -0,0 +1,244 @@
+"""
+Modulo que contiene la clase la cual representa el metodo exacto de programación dinámica de Held-Karp
+
+"""
+
+from ..Tools import utilities, bcolors, plot, Trajectory
+from . import path, csv, datetime, Path, timer, LocalSearch
+from .. import AlgorithmsOptions, Tsp, Tour, np
+
+# Numero maximo de nodos para resolver de forma exacta
+DP_MAX_NODES = 22
+# Memoria maxima en bytes para las tablas de la programación dinámica
+DP_MEMORY_LIMIT = 1 << 30
+
+class DynamicProgramming():
+
+
+    def __init__(self, options: AlgorithmsOptions = None, problem: Tsp = None) -> None:
+        """ Clase Dynamic Programming la cual resuelve el TSP de forma exacta con la programación dinámica de Held-Karp
+            sobre subconjuntos codificados como mascaras de bits, O(n^2 * 2^n) en tiempo y O(n * 2^n) en memoria.
+            Sobre DP_MAX_NODES nodos o DP_MEMORY_LIMIT bytes se usa Local Search y la solución no es óptima demostrada
+
+        Parameters
+        ----------
+        problem : Tsp
+            Instancia del problema TSP
+        options : AlgorithmsOptions
+            Objeto de opciones para el algoritmo
+
+        Attributes
+        ----------
+        best_tour : Tour
+            Instancia del mejor tour
+        optimal : bool
+            La solución es el óptimo demostrado
+        evaluations : int
+            Numero de estados evaluados
+        total_time : float
+            Tiempo de ejecucion de la programación dinámica
+        trajectory : list
+            Lista de objetos de la trayectoria de la solución
+
+        Examples
+        --------
+        >>> options = AlgorithmsOptions()
+        >>> problem = Tsp(filename=options.instance)
+        >>> solver = DynamicProgramming(options=options, problem=problem)
+    """
+
+        # Atributos de instancia
+        self.problem: Tsp # Problema TSP
+
+        self.best_tour: Tour # Mejor tour
+
+        self.optimal = False # solución óptima demostrada
+
+        self.evaluations = 1 # numero de evaluaciones
+
+        self.total_time = 0.0 # tiempo de ejecucion de la programación dinámica
+
+        self.options: AlgorithmsOptions # Opciones
+
+        self.trajectory = [] # lista con la trayectoria de la solución
+
+        # Si por el objeto con las opciones no es enviado al iniciar la clase
+        if not options:
+            self.options = AlgorithmsOptions()
+        else:
+            self.options = options
+        # Si el objeto con el problema tsp no esta incluido
+        if not problem:
+            self.problem = Tsp(filename=self.options.instance, options=self.options)
+        else:
+            self.problem = problem
+
+        print(f"{bcolors.HEADER}\nIniciando Programación Dinámica...{bcolors.ENDC}")
+
+
+    def print_best_solution(self) -> None:
+        """ Escribir la mejor solución """
+        self.updateLog()
+        print()
+        print(f"\t\t{bcolors.UNDERLINE}Mejor Solución Encontrada{bcolors.ENDC}\n")
+        self.best_tour.printSol(True)
+        if self.optimal:
+            print(f"{bcolors.BOLD}Solución óptima demostrada{bcolors.ENDC}")
+        print(f"{bcolors.BOLD}Total de evaluaciones:{bcolors.ENDC} {bcolors.OKBLUE}{self.evaluations-1}{bcolors.ENDC}")
+        self.problem.print_gap(self.best_tour.cost)
+        print(f"{bcolors.BOLD}Tiempo total de búsqueda con Programación Dinámica:{bcolors.ENDC} {bcolors.OKBLUE}{self.total_time:.3f} segundos{bcolors.ENDC}")
+
+
+    def memory(self) -> int:
+        """ Retorna la memoria en bytes que usa la tabla de costos para la instancia """
+        m = self.problem.getSize() - 1
+        return m * (1 << m) * np.dtype(self.cost_type()).itemsize
+
+    def cost_type(self) -> type:
+        """ Tipo entero de la tabla de costos, int32 si ningun camino puede superar su rango """
+        n = self.problem.getSize()
+        longest = int(max(self.problem.distance_row(node).max() for node in range(n)))
+        return np.int32 if (n + 1) * longest < np.iinfo(np.int32).max // 2 else np.int64
+
+
+    def search(self, first_solution: Tour = None) -> None:
+        """ Ejecuta la programación dinámica, si la instancia es muy grande ejecuta Local Search desde la solución inicial """
+        n = self.problem.getSize()
+
+        if n > DP_MAX_NODES:
+            print(f"{bcolors.WARNING}Advertencia: La instancia tiene {n} nodos, la programación dinámica resuelve hasta {DP_MAX_NODES} nodos, se ejecuta Local Search{bcolors.ENDC}")
+            self.fallback(first_solution)
+            return
+        if self.memory() > DP_MEMORY_LIMIT:
+            print(f"{bcolors.WARNING}Advertencia: La programación dinámica requiere {utilities.format_bytes(self.memory())}, el límite es {utilities.format_bytes(DP_MEMORY_LIMIT)}, se ejecuta Local Search{bcolors.ENDC}")
+            self.fallback(first_solution)
+            return
+
+        start = timer()
+        try:
+            self.best_tour = Tour(problem=self.problem, current=self.solve(), trusted=True)
+        except MemoryError:
+            print(f"{bcolors.WARNING}Advertencia: No hay memoria suficiente para la programación dinámica, se ejecuta Local Search{bcolors.ENDC}")
+            self.fallback(first_solution)
+            return
+        self.optimal = True
+        self.total_time = timer() - start
+
+        # Guardar Trayectoria Final
+        self.trajectory.append( Trajectory(
+                            tour=self.best_tour.current.copy(),
+                            cost=self.best_tour.cost,
+                            iterations=self.evaluations,
+                            evaluations=self.evaluations) )
+
+    def fallback(self, first_solution: Tour = None) -> None:
+        """ Ejecuta Local Search desde la solución inicial cuando la instancia no se puede resolver de forma exacta """
+        if not first_solution:
+            first_solution = Tour(problem=self.problem, type_initial_sol=self.options.initial_solution)
+        solver = LocalSearch(options=self.options, problem=self.problem)
+        solver.search(first_solution)
+        self.best_tour = solver.best_tour
+        self.evaluations = solver.evaluations
+        self.total_time = solver.total_time
+        self.trajectory = solver.trajectory
+
+    def solve(self) -> list:
+        """ Programación dinámica de Held-Karp con el tour comenzando en el nodo 0, cost[S, j] es el menor costo de un camino
+            desde 0 que visita el conjunto S (bit i para el nodo i+1) y termina en j+1. Los subconjuntos se procesan por
+            cardinalidad y para cada nodo final se evaluan todos los subconjuntos de la capa en una sola operacion NumPy """
+        n = self.problem.getSize()
+        if n <= 3:
+            return list(range(n)) + [0]
+
+        m = n - 1
+        dtype = self.cost_type()
+        infinity = np.iinfo(dtype).max // 2
+        distances = self.problem.distance_rows(np.arange(n)).astype(dtype)
+        inner = distances[1:, 1:]
+
+        # una fila por subconjunto para que leer los costos de los subconjuntos previos sea contiguo
+        cost = np.full((1 << m, m), infinity, dtype=dtype)
+        for j in range(m):
+            cost[1 << j, j] = distances[0, j + 1]
+
+        # subconjuntos ordenados por cardinalidad
+        masks = np.arange(1 << m, dtype=np.int32)
+        size = np.zeros(1 << m, dtype=np.int8)
+        for bit in range(m):
+            size += ((masks >> bit) & 1).astype(np.int8)
+        masks = masks[np.argsort(size, kind='stable')]
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(size, minlength=m + 1))))
+        del size
+
+        for k in range(2, m + 1):
+            layer = masks[bounds[k]:bounds[k + 1]]
+            for j in range(m):
+                subset = layer[(layer >> j) & 1 == 1]
+                previous = subset ^ (1 << j)
+                # costo de llegar a j desde cada ultimo nodo del subconjunto sin j
+                candidates = cost[previous] + inner[:, j]
+                cost[subset, j] = candidates.min(axis=1)
+                self.evaluations += candidates.size
+        del masks
+
+        # cerrar el ciclo volviendo al nodo 0 y reconstruir el tour desde el final, el predecesor de cada nodo es
+        # el que alcanza su costo (no se guarda una tabla de predecesores)
+        full = (1 << m) - 1
+        node = int(np.argmin(cost[full] + distances[1:, 0]))
+        tour = [0]
+        subset = full
+        while subset:
+            tour.append(node + 1)
+            previous = subset ^ (1 << node)
+            if previous:
+                node = int(np.argmin(cost[previous] + inner[:, node]))
+            subset = previous
+        tour.append(0)
+        tour.reverse()
+        return tour
+
+
+    def printSolFile(self, outputSol: str) -> None:
+        """ Guarda la solución en archivo de texto """
+        utilities.printSolToFile(outputSol, self.best_tour.current)
+
+    def printTraFile(self, outputTra: str) -> None:
+        """ Guarda la trayectoria de la solución en archivo de texto """
+        utilities.printTraToFile(outputTra, self.trajectory)
+
+    def updateLog(self) -> None:
+        """ Actualiza el registro de mejores soluciones con todas las caracteristicas de su ejecución """
+        # crea la carpeta en caso de que no exista (python 3.5+)
+        Path("log/").mkdir(exist_ok=True)
+        logFile = "log/DPlog.csv"
+        # usar el archivo en modo append
+        with open(logFile, "a", newline="\n") as csvfile:
+
+            print(f"{bcolors.OKGREEN}\nActualizando log con mejores soluciones en archivo... {bcolors.ENDC}{path.abspath(logFile)}")
+            # Headers
+            fields = ["solution","cost","instance","date","optimal","time","bound","gap"]
+            writer = csv.DictWriter(csvfile, delimiter=';', fieldnames=fields)
+            # Si la posicion de el archivo es cero se escriben los headers
+            if not csvfile.tell():
+                writer.writeheader()
+
+            # crear texto con la solución separando cada elemento con espacios y luego guardarlo en el archivo
+            sol = " ".join([str(elem) for elem in self.best_tour.current])
+
+            # escribir la mejor solución y todas las caracteristicas de su ejecucion
+            writer.writerow({
+                "solution": sol,
+                "cost": self.best_tour.cost,
+                "instance": self.options.instance,
+                "date": datetime.today(),
+                "optimal": self.optimal,
+                "time": self.total_time,
+                **self.problem.gap_log(self.best_tour.cost)
+            })
+
+    def visualize(self) -> None:
+        """ Visualiza la trayectoria de la solución """
+        plot.Graph.replit = self.options.replit
+        plot.Graph.trajectory = self.trajectory
+
+        plot.show(self.options.gui)
@@ -79,7 +79,7 @@ class GeneticAlgorithm():
             self.options = options
         # Si el objeto con el problema tsp no esta incluido
         if not problem:
-            self.problem = Tsp(self.options.instance)
+            self.problem = Tsp(self.options.instance, options=self.options)
         else:
             self.problem = problem
 
@@ -110,6 +110,7 @@ class GeneticAlgorithm():
         self.best_tour.printSol(True)
         print(f"{bcolors.BOLD}Total de iteraciones:{bcolors.ENDC} {bcolors.OKBLUE}{self.iterations-1}{bcolors.ENDC}")
         print(f"{bcolors.BOLD}Total de evaluaciones:{bcolors.ENDC} {bcolors.OKBLUE}{self.evaluations-self.offspring_size}{bcolors.ENDC}")
+        self.problem.print_gap(self.best_tour.cost)
         print(f"{bcolors.BOLD}Tiempo total de búsqueda con Algoritmo Genético:{bcolors.ENDC} {bcolors.OKBLUE}{self.total_time:.3f} segundos{bcolors.ENDC}")
 
 
@@ -245,6 +246,10 @@ class GeneticAlgorithm():
         if (self.options.max_time > 0):
             if (time > self.options.max_time):
                 return False
+
+        # Criterio de termino por gap objetivo sobre la cota inferior
+        if (self.problem.target_reached(self.best_tour.cost)):
+            return False
         
         return True
 
@@ -269,7 +274,7 @@ class GeneticAlgorithm():
             fields = ["solution","cost","instance","date","pop_size","offspring_size", 
                      "pselection_type","crossover_type","mutation_type","mutation_prob", 
                      "selection_strategy","gselection_type","seed","move","max_evaluations",
-                     "max_iterations","max_time","initial_solution"]
+                     "max_iterations","max_time","initial_solution","bound","gap"]
 
             writer = csv.DictWriter(csvfile, delimiter=';', fieldnames=fields)
             # Si la posicion de el archivo es cero se escriben los headers
@@ -298,7 +303,8 @@ class GeneticAlgorithm():
                 "max_evaluations": self.options.max_evaluations,
                 "max_iterations": self.options.max_iterations, 
                 "max_time": self.options.max_time,
-                "initial_solution": self.options.initial_solution.value
+                "initial_solution": self.options.initial_solution.value,
+                **self.problem.gap_log(self.best_tour.cost)
             })
     
 
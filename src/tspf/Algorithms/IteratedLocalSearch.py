@@ -76,7 +76,7 @@ class IteratedLocalSearch():
             self.options = options
         # Si el objeto con el problema tsp no esta incluido
         if not problem:
-            self.problem = Tsp(filename=self.options.instance)
+            self.problem = Tsp(filename=self.options.instance, options=self.options)
         else:
             self.problem = problem
 
@@ -96,6 +96,7 @@ class IteratedLocalSearch():
         self.best_tour.printSol(True)
         print(f"{bcolors.BOLD}Total de iteraciones:{bcolors.ENDC} {bcolors.OKBLUE}{self.iterations-1}{bcolors.ENDC}")
         print(f"{bcolors.BOLD}Total de evaluaciones:{bcolors.ENDC} {bcolors.OKBLUE}{self.evaluations-1}{bcolors.ENDC}")
+        self.problem.print_gap(self.best_tour.cost)
         print(f"{bcolors.BOLD}Tiempo total de búsqueda con Iterated Local Search:{bcolors.ENDC} {bcolors.OKBLUE}{self.total_time:.3f} segundos{bcolors.ENDC}")
 
     
@@ -153,6 +154,8 @@ class IteratedLocalSearch():
                 solver.twoOptSearch(current_tour)
             elif self.options.move == TSPMove.THREE_OPT:
                 solver.threeOptSearch(current_tour)    
+            elif self.options.move == TSPMove.OR_OPT:
+                solver.orOptSearch(current_tour)
             
             current_tour.copy(solver.best_tour)
             
@@ -165,8 +168,10 @@ class IteratedLocalSearch():
                     current_tour.randomMove(TSPMove.TWO_OPT)
                 elif self.perturbation == PerturbationType.THREE_OPT:
                     current_tour.randomMove(TSPMove.THREE_OPT)
+                elif self.perturbation == PerturbationType.OR_OPT:
+                    current_tour.randomMove(TSPMove.OR_OPT)
                 elif self.perturbation == PerturbationType.RANDOM:
-                    move = utilities.random.choice([m.value for m in TSPMove]) # seleccionar Perturbacion aleatoria
+                    move = utilities.random.choice(list(TSPMove)) # seleccionar Perturbacion aleatoria
                     current_tour.randomMove(move)
 
             # si se encontro una mejor solución
@@ -232,6 +237,10 @@ class IteratedLocalSearch():
         if (self.options.max_time > 0):
             if (time > self.options.max_time):
                 return False
+
+        # Criterio de termino por gap objetivo sobre la cota inferior
+        if (self.problem.target_reached(self.best_tour.cost)):
+            return False
         
         return True
         
@@ -254,7 +263,7 @@ class IteratedLocalSearch():
             
             print(f"{bcolors.OKGREEN}\nActualizando log con mejores soluciones en archivo... {bcolors.ENDC}{path.abspath(logFile)}")
             # Headers
-            fields = ["solution","cost","instance","date","seed","move","perturbation","nPerturbations","max_evaluations","max_time","initial_solution"]
+            fields = ["solution","cost","instance","date","seed","move","perturbation","nPerturbations","max_evaluations","max_time","initial_solution","bound","gap"]
             writer = csv.DictWriter(csvfile, delimiter=';', fieldnames=fields)
             # Si la posicion de el archivo es cero se escriben los headers
             if not csvfile.tell():
@@ -274,7 +283,8 @@ class IteratedLocalSearch():
                 "perturbation": self.perturbation.value,
                 "max_evaluations": self.options.max_evaluations, 
                 "max_time": self.options.max_time,
-                "initial_solution": self.options.initial_solution.value
+                "initial_solution": self.options.initial_solution.value,
+                **self.problem.gap_log(self.best_tour.cost)
             })
 
     def visualize(self) -> None:
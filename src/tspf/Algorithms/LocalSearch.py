@@ -5,7 +5,7 @@ Modulo que contiene la clase la cual representa el metodo de búsqueda de LocalS
 
 from ..Tools import utilities, bcolors, plot, Trajectory
 from . import path, csv, datetime, Path, timer, PrettyTable
-from .. import AlgorithmsOptions, Tsp, Tour, TSPMove, InitialSolution
+from .. import AlgorithmsOptions, Tsp, Tour, TSPMove, InitialSolution, TourBackend, TwoLevelList
 
 class LocalSearch():
     
@@ -66,7 +66,7 @@ class LocalSearch():
             self.options = options
         # Si el objeto con el problema tsp no esta incluido
         if not problem:
-            self.problem = Tsp(filename=self.options.instance)
+            self.problem = Tsp(filename=self.options.instance, options=self.options)
         else:
             self.problem = problem
 
@@ -84,6 +84,7 @@ class LocalSearch():
         print(f"\t\t{bcolors.UNDERLINE}Mejor Solución Encontrada{bcolors.ENDC}\n")
         self.best_tour.printSol(True)
         print(f"{bcolors.BOLD}Total de evaluaciones:{bcolors.ENDC} {bcolors.OKBLUE}{self.evaluations-1}{bcolors.ENDC}")
+        self.problem.print_gap(self.best_tour.cost)
         print(f"{bcolors.BOLD}Tiempo total de búsqueda con Local Search:{bcolors.ENDC} {bcolors.OKBLUE}{self.total_time:.3f} segundos{bcolors.ENDC}")
 
     
@@ -130,6 +131,8 @@ class LocalSearch():
             self.twoOptSearch(current_tour, table)
         elif self.move_type == TSPMove.THREE_OPT:
             self.threeOptSearch(current_tour, table)
+        elif self.move_type == TSPMove.OR_OPT:
+            self.orOptSearch(current_tour, table)
         else:
             self.twoOptSearch(current_tour, table)
         
@@ -167,7 +170,7 @@ class LocalSearch():
         improved = True
         best_cost = self.best_tour.cost # mejor optimo local
         
-        while improved:
+        while improved and not self.problem.target_reached(self.best_tour.cost):
             
             details = '' # variable de texto con los detalles
 
@@ -241,6 +244,9 @@ class LocalSearch():
         n = self.problem.getSize()
         if n < 3: 
             return
+        if self.options.tour_backend == TourBackend.LINKED:
+            self.linkedTwoOptSearch(tour, table)
+            return
         
         # tiempo inicial para iteraciones y condicion de termino por tiempo
         start = end = timer()
@@ -248,7 +254,7 @@ class LocalSearch():
         improved = True
         best_cost = self.best_tour.cost
         
-        while improved:
+        while improved and not self.problem.target_reached(self.best_tour.cost):
             
             details = '' # variable de texto con los detalles
 
@@ -307,6 +313,219 @@ class LocalSearch():
         self.total_time = timer() - start
         
 
+    def linkedTwoOptSearch(self, tour: Tour, table: PrettyTable = PrettyTable()) -> None:
+        """ Aplica la búsqueda por 2-opt de twoOptSearch sobre la lista de dos niveles: recorre los mismos indices (i, j)
+            en el mismo orden avanzando con next/prev desde el nodo del indice 0, y cada movimiento es O(sqrt(n)).
+            Se sigue el nodo del indice 0 y el sentido que dejaria Tour.twoOptSwap, por lo que el resultado es el mismo,
+            el arreglo del tour solo se construye al guardar la trayectoria y al terminar la búsqueda """
+        n = self.problem.getSize()
+        if n < 3: 
+            return
+        distance = self.problem.get_distance
+        linked = TwoLevelList(tour.current)
+        first, forward = tour.current[0], True # nodo del indice 0 y si el sentido del arreglo es el de next
+
+        # tiempo inicial para iteraciones y condicion de termino por tiempo
+        start = end = timer()
+        a, b = 0, 0
+        nodes = None # nodos (s-1, s, e, e+1) del movimiento
+        move_cost = tour.cost
+        moved = False # si se aplico algun movimiento
+        improved = True
+        best_cost = self.best_tour.cost
+        
+        while improved and not self.problem.target_reached(self.best_tour.cost):
+            
+            details = '' # variable de texto con los detalles
+
+            improved = False
+            step = linked.next if forward else linked.prev
+            s_prev, s_node = (linked.prev if forward else linked.next)(first), first # nodos de los indices i-1 e i
+            
+            for i in range(n):
+                if improved and not self.bestImprovement: # si es best improvement se continua el loop si no se corta al ser first improvement
+                    break
+                e_next = step(step(s_node)) # nodo del indice i+2
+                for j in range(i + 2, n):
+                    if improved and not self.bestImprovement:
+                        break
+                    e_node, e_next = e_next, step(e_next) # nodos de los indices j y j+1
+                    
+                    # mismo costo que Tour.delta_cost_two_opt, invertir todo el tour no lo modifica
+                    if (i == 0 and j == n - 1):
+                        cost = tour.cost
+                    else:
+                        cost = tour.cost - distance(s_prev, s_node) - distance(e_node, e_next) \
+                                         + distance(s_prev, e_node) + distance(s_node, e_next)
+                    
+                    if cost < best_cost:
+                        
+                        a, b = i, j # se guardan los indices del optimo local si se encuentra uno mejor
+                        nodes = (s_prev, s_node, e_node, e_next)
+                        move_cost = cost
+                        
+                        if self.bestImprovement: # cuando sea best improvement se sigue buscando por lo que se actualiza el mejor para esta búsqueda
+                            best_cost = cost
+                            
+                        improved = True
+                    else:
+                        if self.options.verbose:
+                            details = f"{bcolors.OKBLUE} Solución actual: {tour.cost}{bcolors.ENDC}"
+                                                   
+                    # Agregar la informacion a la tabla
+                    if details:
+                        table.add_row([f"{bcolors.BOLD}{self.evaluations}", 
+                                    f"{end-start:.4f}{bcolors.ENDC}", 
+                                    f"{details}"
+                                    ])
+                        details = ''
+                        
+                    self.evaluations += 1
+                    end = timer() # tiempo actual de iteracion
+                
+                s_prev, s_node = s_node, step(s_node)
+                        
+            if improved: # se encontro una mejora en la búsqueda
+                first, forward = self.linkedTwoOptMove(linked, first, forward, a, b, nodes)
+                tour.cost = move_cost
+                moved = True
+                self.best_tour.cost = tour.cost
+                best_cost = self.best_tour.cost
+                
+                details = f"{bcolors.OKGREEN} Solución actual con mejor costo encontrada: {tour.cost}{bcolors.ENDC}"
+                table.add_row([f"{bcolors.BOLD}{self.evaluations}", 
+                                    f"{end-start:.4f}{bcolors.ENDC}", 
+                                    f"{details}"
+                                    ])
+                details = ''
+                # Guardar Trayectoria
+                self.trajectory.append( Trajectory(
+                                    tour=linked.tour(first, forward),
+                                    cost=tour.cost, 
+                                    iterations=self.evaluations, 
+                                    evaluations=self.evaluations) )
+    
+        # construir el arreglo del tour solo al terminar, como en twoOptSearch el mejor tour solo cambia si hubo mejoras
+        if moved:
+            tour.current = linked.tour(first, forward)
+            tour.updatePosition()
+            self.best_tour.copy(tour)
+
+        # actualizar tiempo total de búsqueda
+        self.total_time = timer() - start
+
+    def linkedTwoOptMove(self, linked: TwoLevelList, first: int, forward: bool, s: int, e: int, nodes: tuple) -> tuple:
+        """ Aplica en O(sqrt(n)) sobre la lista de dos niveles el movimiento Tour.twoOptSwap(s, e) con los nodos
+            (s-1, s, e, e+1) y retorna el nodo del indice 0 y el sentido del arreglo que dejaria twoOptSwap """
+        n = self.problem.getSize()
+        a, b, c, d = nodes
+        # twoOptSwap invierte la seccion [s,e] o su complemento, el que sea mas corto
+        inner = e - s + 1 <= n - (e - s + 1)
+        if not inner and s > 0:
+            # al invertir el complemento queda en el indice 0 el nodo del indice (s+e) mod n
+            m = (s + e) % n
+            first = linked.walk(first, m if forward else n - m)
+        # la lista puede recorrer el tour en el sentido contrario al arreglo
+        if linked.next(a) == b:
+            linked.move(a, b, c, d)
+        else:
+            linked.move(b, a, d, c)
+        if inner:
+            # el resto del tour no cambia y el arreglo queda ... a, c .. b, d ...
+            if s == 0:
+                first = c
+            return first, linked.next(a) == c
+        # la seccion [s,e] no cambia y el arreglo queda ... d, b .. c, a ...
+        return first, linked.next(d) == b
+        
+    """
+    
+    
+    O R - O P T 
+    
+    
+    """
+
+    def orOptSearch(self, tour: Tour, table: PrettyTable = PrettyTable()) -> None:
+        """ Aplica la búsqueda por or-opt, mueve segmentos de 1 a 3 nodos (invertidos o no, incluidos los que pasan por
+            el final del tour) a todas las posiciones """
+        n = self.problem.getSize()
+        if n < 4: 
+            return
+        
+        # tiempo inicial para iteraciones y condicion de termino por tiempo
+        start = end = timer()
+        move = None # movimiento del optimo local (i, largo, p, invertido)
+        improved = True
+        best_cost = self.best_tour.cost # mejor optimo local
+        
+        while improved and not self.problem.target_reached(self.best_tour.cost):
+            
+            details = '' # variable de texto con los detalles
+
+            improved = False
+            
+            for i in range(n):
+                if improved and not self.bestImprovement: # si es best improvement se continua el loop si no se corta al ser first improvement
+                    break
+                for length in range(1, min(3, n - 2) + 1): # el segmento puede pasar por el final del tour
+                    if improved and not self.bestImprovement:
+                        break
+                    for p in range(n):
+                        if improved and not self.bestImprovement:
+                            break
+                        if not tour.valid_or_opt(i, length, p):
+                            continue
+                        for reverse in (False, True):
+                            cost = tour.delta_cost_or_opt(tour.current, tour.cost, i, length, p, reverse)
+                            if cost < best_cost:
+                                
+                                move = (i, length, p, reverse) # se guarda el movimiento del optimo local si se encuentra uno mejor
+                                
+                                if self.bestImprovement: # cuando sea best improvement se sigue buscando por lo que se actualiza el mejor para esta búsqueda
+                                    best_cost = cost
+                                    
+                                improved = True
+                                if not self.bestImprovement:
+                                    break
+                            else:
+                                if self.options.verbose:
+                                    details = f"{bcolors.OKBLUE} Solución actual: {tour.cost}{bcolors.ENDC}"
+                                                    
+                            # Agregar la informacion a la tabla
+                            if details:
+                                table.add_row([f"{bcolors.BOLD}{self.evaluations}", 
+                                            f"{end-start:.4f}{bcolors.ENDC}", 
+                                            f"{details}"
+                                            ])
+                                details = ''
+                                
+                            self.evaluations += 1
+                            end = timer() # tiempo actual de iteracion
+                        
+                        
+            if improved: # se encontro una mejora en la búsqueda
+                tour.orOptMove(*move)
+                self.best_tour.copy(tour)
+                best_cost = self.best_tour.cost
+                
+                details = f"{bcolors.OKGREEN} Solución actual con mejor costo encontrada: {tour.cost}{bcolors.ENDC}"
+                table.add_row([f"{bcolors.BOLD}{self.evaluations}", 
+                                    f"{end-start:.4f}{bcolors.ENDC}", 
+                                    f"{details}"
+                                    ])
+                details = ''
+                # Guardar Trayectoria
+                self.trajectory.append( Trajectory(
+                                    tour=tour.current.copy(),
+                                    cost=tour.cost, 
+                                    iterations=self.evaluations, 
+                                    evaluations=self.evaluations) )
+    
+        # actualizar tiempo total de búsqueda
+        self.total_time = timer() - start
+        
+
     """
     
     
@@ -326,12 +545,11 @@ class LocalSearch():
         # tiempo inicial para iteraciones y condicion de termino por tiempo
         start = end = timer()
     
-        while improved:
+        while improved and not self.problem.target_reached(self.best_tour.cost):
             
             details = '' # variable de texto con los detalles
             
             improved = False
-            delta = 0
             for i in range(n):
                 if improved and not self.bestImprovement:
                     break
@@ -342,9 +560,13 @@ class LocalSearch():
                         if improved and not self.bestImprovement:
                             break
                         
-                        delta = tour.bestThreeOptSwap(i, j, k)
+                        # evaluar las reconexiones sin modificar el tour, solo se aplica la que mejora
+                        cost, move = tour.delta_cost_three_opt(tour.current, tour.cost, i, j, k)
                         
-                        if delta < 0:
+                        if move:
+                            
+                            tour.threeOptMove(i, j, k, move)
+                            tour.cost = cost
                             
                             self.trajectory.append( Trajectory(
                                     tour=tour.current.copy(),
@@ -396,7 +618,7 @@ class LocalSearch():
             
             print(f"{bcolors.OKGREEN}\nActualizando log con mejores soluciones en archivo... {bcolors.ENDC}{path.abspath(logFile)}")
             # Headers
-            fields = ["solution","cost","instance","date","seed","move","max_evaluations","max_time","initial_solution"]
+            fields = ["solution","cost","instance","date","seed","move","max_evaluations","max_time","initial_solution","bound","gap"]
             writer = csv.DictWriter(csvfile, delimiter=';', fieldnames=fields)
             # Si la posicion de el archivo es cero se escriben los headers
             if not csvfile.tell():
@@ -415,7 +637,8 @@ class LocalSearch():
                 "move": self.options.move.value,
                 "max_evaluations": self.options.max_evaluations, 
                 "max_time": self.options.max_time,
-                "initial_solution": self.options.initial_solution.value
+                "initial_solution": self.options.initial_solution.value,
+                **self.problem.gap_log(self.best_tour.cost)
             })
 
     def visualize(self) -> None:
@@ -58,9 +58,8 @@ class Population():
         # Si se inicia con una población
         if ('pop_size' in kwargs):
             self.pop_size = kwargs['pop_size']
-            # Agregar individuos a la población
-            for _ in range(self.pop_size):
-                self.pop.append( Tour(type_initial_sol=InitialSolution.RANDOM, problem=self.problem) )
+            # Agregar individuos a la población, los costos se calculan en lote
+            self.pop.extend( self.createTours([self.problem.random_tour() for _ in range(self.pop_size)]) )
             # encontrar mejor individuo    
             self.searchBest()
         
@@ -91,14 +90,32 @@ class Population():
     def start(self) -> None:
         """Inicializa la población"""
         self.pop.clear()
-        # Agregar individuos a la población
+        # Agregar individuos a la población, los costos se calculan en lote
+        self.pop.extend( self.createTours([self.problem.random_tour() for _ in range(self.pop_size)]) )
         for i in range(self.pop_size):
-            self.pop.append( Tour(type_initial_sol=InitialSolution.RANDOM, problem=self.problem) )
             self.pop[i].printSol()
         # encontrar mejor individuo    
         self.searchBest()
 
     
+    def createTours(self, tours: list) -> list:
+        """Crea los individuos de una lista de recorridos generados por los operadores (confiables, sin validacion
+        salvo en modo estricto) evaluando todos sus costos en una sola operacion
+
+            Parameters
+            ----------
+            tours : list
+                lista con los recorridos cerrados (listas de nodos)
+
+            Returns
+            -------
+            list
+                lista con los individuos (Tour) generados
+        """
+        costs = self.problem.evaluate_many(tours).tolist()
+        return [Tour(current=tour, problem=self.problem, cost=cost, trusted=True) for tour, cost in zip(tours, costs)]
+
+    
     def add(self, indivi: any) -> None:
         """Añade un individuo o varios de estos a la solución """
         if isinstance(indivi, Tour): # si es un solo individuo
@@ -572,9 +589,8 @@ class Population():
         # Completar las rutas para que se vuelva al comienzo y concretar el tour
         h1.append(h1[0])
         h2.append(h2[0])
-        # Guardar los hijos como lista de tours
-        offspring.append( Tour(current=h1, problem=self.problem) )
-        offspring.append( Tour(current=h2, problem=self.problem) )
+        # Guardar los hijos como lista de tours, evaluando ambos en lote
+        offspring.extend( self.createTours([h1, h2]) )
 
         #print( r1, r2 , h1 , len(h1), h2, len(h2))
         return offspring
@@ -631,9 +647,8 @@ class Population():
         h1.append(h1[0])
         h2.append(h2[0])
 
-        # Guardar los hijos como lista de tours
-        offspring.append( Tour(current=h1, problem=self.problem) )
-        offspring.append( Tour(current=h2, problem=self.problem) )
+        # Guardar los hijos como lista de tours, evaluando ambos en lote
+        offspring.extend( self.createTours([h1, h2]) )
         
         #print(p1.current, p2.current, cpoint)
         #print(h1, len(h1), h2, len(h2))
@@ -667,6 +682,8 @@ class Population():
             self.twoOptMutation(mut_probability)
         elif (mtype == TSPMove.THREE_OPT):
             self.threeOptMutation(mut_probability)
+        elif (mtype == TSPMove.OR_OPT):
+            self.orOptMutation(mut_probability)
         else:
             self.swapMutation(mut_probability)
 
@@ -719,6 +736,21 @@ class Population():
             if (mut_probability > r):
                 self.pop[i].randomMove(TSPMove.THREE_OPT)
 
+    def orOptMutation(self, mut_probability: float) -> None:
+        """Aplica el movimiento or-opt aleatoriamente a toda la población segun la probabilidad recibida
+
+            Parameters
+            ----------
+            mut_probability : float
+                probabilidad de mutacion
+        """
+        r = 0.0
+        for i in range(self.pop_size):
+            # obtener probabilidad de [0,1]
+            r = utilities.random.random()
+            if (mut_probability > r):
+                self.pop[i].randomMove(TSPMove.OR_OPT)
+
 
 
     
@@ -69,7 +69,7 @@ class SimulatedAnnealing():
             self.options = options
         # Si el objeto con el problema tsp no esta incluido
         if not problem:
-            self.problem = Tsp(filename=self.options.instance)
+            self.problem = Tsp(filename=self.options.instance, options=self.options)
         else:
             self.problem = problem
 
@@ -89,6 +89,7 @@ class SimulatedAnnealing():
         print(f"\t\t{bcolors.UNDERLINE}Mejor Solución Encontrada{bcolors.ENDC}\n")
         self.best_tour.printSol(True)
         print(f"{bcolors.BOLD}Total de evaluaciones:{bcolors.ENDC} {bcolors.OKBLUE}{self.evaluations-1}{bcolors.ENDC}")
+        self.problem.print_gap(self.best_tour.cost)
         print(f"{bcolors.BOLD}Tiempo total de búsqueda con Simulated Annealing:{bcolors.ENDC} {bcolors.OKBLUE}{self.total_time:.3f} segundos{bcolors.ENDC}")
 
     def search(self, first_solution: Tour = None) -> None:
@@ -226,6 +227,10 @@ class SimulatedAnnealing():
         if (self.options.max_time > 0):
             if (time > self.options.max_time):
                 return False
+
+        # Criterio de termino por gap objetivo sobre la cota inferior
+        if (self.problem.target_reached(self.best_tour.cost)):
+            return False
         
         return True
 		
@@ -271,7 +276,7 @@ class SimulatedAnnealing():
             print(f"{bcolors.OKGREEN}\nActualizando log con mejores soluciones en archivo... {bcolors.ENDC}{path.abspath(logFile)}")
             # Headers
             fields = ["solution","cost","instance","date","alpha","t0","tmin",
-                     "cooling","seed","move","max_evaluations","max_time","initial_solution"]
+                     "cooling","seed","move","max_evaluations","max_time","initial_solution","bound","gap"]
             writer = csv.DictWriter(csvfile, delimiter=';', fieldnames=fields)
             # Si la posicion de el archivo es cero se escriben los headers
             if not csvfile.tell():
@@ -294,7 +299,8 @@ class SimulatedAnnealing():
                 "move": self.options.move.value,
                 "max_evaluations": self.options.max_evaluations, 
                 "max_time": self.options.max_time,
-                "initial_solution": self.options.initial_solution.value
+                "initial_solution": self.options.initial_solution.value,
+                **self.problem.gap_log(self.best_tour.cost)
             })
 
     def visualize(self) -> None:
@@ -16,4 +16,5 @@ from src.tspf.Algorithms.Population import Population
 from src.tspf.Algorithms.GeneticAlgorithm import GeneticAlgorithm
 from src.tspf.Algorithms.SimulatedAnnealing import SimulatedAnnealing
 from src.tspf.Algorithms.LocalSearch import LocalSearch
-from src.tspf.Algorithms.IteratedLocalSearch import IteratedLocalSearch
\ No newline at end of file
+from src.tspf.Algorithms.IteratedLocalSearch import IteratedLocalSearch
+from src.tspf.Algorithms.DynamicProgramming import DynamicProgramming
\ No newline at end of file
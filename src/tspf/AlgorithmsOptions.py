@@ -12,21 +12,25 @@ class MHType(Enum):
     GA: Genetic Algorithm
     LS: Local Search
     ILS: Iterated Local Search
+    DP: Dynamic Programming (Held-Karp exacto)
     """
     SA = 'SA'
     GA = 'GA'
     LS = 'LS'
     ILS = 'ILS'
+    DP = 'DP'
 
 class TSPMove(Enum):
     """Tipos de movimientos disponibles para el TSP 
     TWO_OPT: Operador 2-opt
     THREE_OPT: Operador 3-opt
     SWAP: Operador swap
+    OR_OPT: Operador or-opt, mueve un segmento de 1 a 3 nodos a otra posicion (invertido o no)
     """
     TWO_OPT = 'TWO_OPT'
     THREE_OPT = 'THREE_OPT'
     SWAP = 'SWAP'
+    OR_OPT = 'OR_OPT'
 
 """ S I M U L A T E D  A N N E A L I N G """
 
@@ -35,10 +39,20 @@ class InitialSolution(Enum):
     RANDOM: Solución aleatoria
     NEAREST_N: Solución creada con la heuristica del vecino mas cercano
     DETERMINISTIC: Solución creada deterministicamente para testing, en este caso es secuencial
+    GREEDY_EDGE: Solución creada con la heuristica greedy de aristas (Kruskal) sobre las listas de candidatos
+    SPACE_FILLING_CURVE: Solución que recorre los nodos en el orden de la curva de Hilbert, sin calcular distancias
+    NEAREST_INSERTION: Solución creada insertando el nodo mas cercano al tour parcial
+    FARTHEST_INSERTION: Solución creada insertando el nodo mas lejano al tour parcial
+    CHEAPEST_INSERTION: Solución creada insertando el nodo que menos aumenta el costo del tour parcial
     """
     RANDOM = 'RANDOM'
     NEAREST_N = 'NEAREST_N'
     DETERMINISTIC = 'DETERMINISTIC'
+    GREEDY_EDGE = 'GREEDY_EDGE'
+    SPACE_FILLING_CURVE = 'SPACE_FILLING_CURVE'
+    NEAREST_INSERTION = 'NEAREST_INSERTION'
+    FARTHEST_INSERTION = 'FARTHEST_INSERTION'
+    CHEAPEST_INSERTION = 'CHEAPEST_INSERTION'
 
 class CoolingType(Enum):
     """Esquemas de enfriamiento disponibles para Simulated Annealing
@@ -89,13 +103,23 @@ class PerturbationType(Enum):
     TWO_OPT: Operador 2-opt
     THREE_OPT: Operador 3-opt
     SWAP: Operador swap
+    OR_OPT: Operador or-opt
     RANDOM: Operador aleatorio entre los anteriores
     """
     TWO_OPT = 'TWO_OPT'
     THREE_OPT = 'THREE_OPT'
     SWAP = 'SWAP'
+    OR_OPT = 'OR_OPT'
     RANDOM = 'RANDOM'
 
+class TourBackend(Enum):
+    """Representaciones del tour para la búsqueda 2-opt de Local Search e Iterated Local Search
+    ARRAY: Lista de nodos, cada movimiento 2-opt invierte una seccion O(n)
+    LINKED: Lista doblemente enlazada de dos niveles recorrida directamente, cada movimiento 2-opt es O(sqrt(n)) (la búsqueda es la misma)
+    """
+    ARRAY = 'ARRAY'
+    LINKED = 'LINKED'
+
 class AlgorithmsOptions():
     """
     Clase para configurar y leer todas las opciones que pueda tener una metaheristica recibidas como atributo o como definiciones
@@ -114,6 +138,10 @@ class AlgorithmsOptions():
         Tipo del movimiento para la metaheurística
     max_evaluations : int
         Evaluaciones máximas 
+    target_gap : float
+        Gap objetivo (%) sobre la cota inferior de Held-Karp para terminar la búsqueda, 0 sin este criterio
+    lower_bound : bool
+        Calcular la cota inferior de Held-Karp y reportar el gap de la solución
     alpha : float
         Parámetro alfa para el enfriamiento de SA
     t0 : float
@@ -138,6 +166,24 @@ class AlgorithmsOptions():
         Estrategia de selección de la nueva población
     gselection_type : Enum
         Selección de la nueva población
+    lazy_distance : bool
+        Calcular las distancias bajo demanda en vez de la matriz completa
+    cache_rows : int
+        Cantidad de filas de distancias en el cache LRU del modo lazy
+    tour_backend : Enum
+        Representacion del tour para la búsqueda 2-opt de Local Search e Iterated Local Search
+    nn_size : int
+        Cantidad de vecinos mas cercanos en las listas de candidatos de cada nodo
+    use_cache : bool
+        Cargar y guardar la instancia preprocesada en el cache de disco
+    clear_cache : bool
+        Eliminar el cache de instancias antes de leer la instancia
+    mmap_distance : bool
+        Mapear la matriz de distancias desde el cache en modo solo lectura (compartida entre procesos)
+    workers : int
+        Cantidad de procesos para calcular la matriz de distancias y las listas de candidatos
+    strict_check : bool
+        Validar todos los tours construidos y sus costos, incluso los generados por los operadores (depuracion)
     Methods
     -------
     __init__(args: list, **kwargs: dict)
@@ -175,6 +221,10 @@ class AlgorithmsOptions():
     max_iterations = 20 # Numero de iteraciones máximas
     
     max_time = 60.0 # Tiempo de ejecucion máximo
+
+    target_gap = 0.0 # Gap objetivo (%) sobre la cota inferior para terminar la búsqueda, 0 desactivado
+
+    lower_bound = False # Calcular la cota inferior de Held-Karp para reportar el gap
     
     initial_solution = InitialSolution.RANDOM # Solución Inicial
     
@@ -187,6 +237,22 @@ class AlgorithmsOptions():
     verbose = False # modo verbose
     
     gui = False # modo Interfaz grafica
+
+    lazy_distance = False # Distancias bajo demanda sin matriz completa (instancias muy grandes)
+
+    cache_rows = 1024 # Cantidad de filas de distancias en el cache LRU del modo lazy
+
+    nn_size = 20 # Cantidad de vecinos mas cercanos en las listas de candidatos
+
+    use_cache = True # Cargar y guardar la instancia preprocesada (distancias y vecinos) en el cache de disco ($XDG_CACHE_HOME/tspf)
+
+    clear_cache = False # Eliminar el cache de instancias antes de leer la instancia
+
+    mmap_distance = False # Mapear la matriz de distancias desde el cache, procesos con la misma instancia comparten la memoria
+
+    workers = 1 # Cantidad de procesos para el preprocesamiento de la instancia (distancias y vecinos)
+
+    strict_check = False # Validar todos los tours construidos (modo depuracion), por defecto solo los que vienen desde fuera
     
     """ O P C I O N E S  P A R A  S I M U L A T E D  A N N E A L I N G """
     
@@ -224,6 +290,8 @@ class AlgorithmsOptions():
     
     nPerturbations = 3
 
+    tour_backend = TourBackend.ARRAY # Representacion del tour para la búsqueda 2-opt (lista o lista de dos niveles)
+
     def __init__(self, argv=[], **kwargs) -> None:
 
         # Semilla para el generador de números aleatorios
@@ -256,18 +324,28 @@ class AlgorithmsOptions():
         parser.add_argument("-gui", "--gui", help="Ejecuta en modo interfaz grafica", action="store_true")
 
                 
-        parser.add_argument("-mh", "--metaheuristic", help="Tipo de Metaherisitica a usar:\n SA: Simulated Annealing\n GA: Genetic Algorithm\n LS: Local Search")
+        parser.add_argument("-mh", "--metaheuristic", help="Tipo de Metaherisitica a usar:\n SA: Simulated Annealing\n GA: Genetic Algorithm\n LS: Local Search\n ILS: Iterated Local Search\n DP: Dynamic Programming (exacto, hasta 22 nodos)")
         parser.add_argument("-al", "--algorithm", help="Tipo de Algoritmo a usar:\n SA: Simulated Annealing\n GA: Genetic Algorithm\n LS: Local Search")
         parser.add_argument("-i", "--instance", help="Archivo con la instancia a utilizar en formato TSPLIB")
         parser.add_argument("-se", "--seed", help="Numero para ser usado como semilla para el generador de números aleatorios")
         parser.add_argument("-sol", "--solution", help="Nombre del archivo de salida para la solución y trayectoria")
-        parser.add_argument("-mhm", "--move", help="Tipo de movimiento a utilizar en la heuristica [ 2opt | swap | 3opt ]")
+        parser.add_argument("-mhm", "--move", help="Tipo de movimiento a utilizar en la heuristica [ 2opt | swap | 3opt | oropt ]")
         parser.add_argument("-e", "--evaluations", help="Numero máximo de soluciones a evaluar")
         parser.add_argument("-it", "--iterations", help="Numero máximo de iteraciones a realizar")
         parser.add_argument("-t", "--time", help="Limite de tiempo de ejecucion en segundos")
+        parser.add_argument("-tg", "--target-gap", help="Termina la búsqueda al alcanzar este gap (%%) sobre la cota inferior de Held-Karp [0,FLOAT_MAX]")
+        parser.add_argument("-lb", "--lowerbound", help="Calcula la cota inferior de Held-Karp y reporta el gap de la solución", action="store_true")
+        parser.add_argument("-lz", "--lazy", help="Calcula las distancias bajo demanda sin generar la matriz completa (instancias muy grandes)", action="store_true")
+        parser.add_argument("-cs", "--cachesize", help="Cantidad de filas de distancias en el cache LRU del modo lazy ]0,INT_MAX]")
+        parser.add_argument("-nc", "--nocache", help="No utiliza el cache de instancias preprocesadas (distancias y vecinos)", action="store_true")
+        parser.add_argument("-cc", "--clearcache", help="Elimina el cache de instancias preprocesadas antes de leer la instancia", action="store_true")
+        parser.add_argument("-mm", "--mmap", help="Mapea la matriz de distancias desde el cache en modo solo lectura, compartida entre procesos con la misma instancia", action="store_true")
+        parser.add_argument("-sc", "--strict", help="Valida todos los tours construidos y sus costos, incluso los generados por los operadores (depuración)", action="store_true")
+        parser.add_argument("-w", "--workers", help="Cantidad de procesos para calcular las distancias y los vecinos en paralelo ]0,INT_MAX]")
+        parser.add_argument("-nn", "--neighbours", help="Cantidad de vecinos mas cercanos en las listas de candidatos de cada nodo ]0,INT_MAX]")
 
         # Definir argumentos de Simulated Annealing
-        parser.add_argument("-is", "--insol", help="Solución inicial [ RANDOM | NEAREST_N | DETERMINISTIC ]")
+        parser.add_argument("-is", "--insol", help="Solución inicial [ RANDOM | NEAREST_N | DETERMINISTIC | GREEDY_EDGE | SPACE_FILLING_CURVE | NEAREST_INSERTION | FARTHEST_INSERTION | CHEAPEST_INSERTION ]")
         parser.add_argument("-a", "--alpha", help="Parámetro alfa para el esquema geometrico ]0,1]")
         parser.add_argument("-t0", "--tini", help="Temperatura inicial ]0,DOUBLE_MAX]")
         parser.add_argument("-tm", "--tmin", help="Temperatura mínima ]0,DOUBLE_MAX]")
@@ -278,14 +356,15 @@ class AlgorithmsOptions():
         parser.add_argument("-o", "--osize", help="Cantidad de hijos a generar ]0,INT_MAX]")
         parser.add_argument("-ps", "--pselection", help="Operador de selección de padres [ random | best | roulette | tournament ]")
         parser.add_argument("-cr", "--crossover", help="Operador de crossover [ ox | opx | pmx ]")
-        parser.add_argument("-mu", "--mutation", help="Operador de mutación [ swap | 2opt | 3opt ]")
+        parser.add_argument("-mu", "--mutation", help="Operador de mutación [ swap | 2opt | 3opt | oropt ]")
         parser.add_argument("-mp", "--mprobability", help="Probabilidad de mutación [0.0,1.0]")
         parser.add_argument("-gs", "--gselection", help="Operador de selección de población [ random | best | roulette | tournament ]")
         parser.add_argument("-g", "--gstrategy", help="Estrategia de selección de padres [ mu,lambda | mu+lambda ]")
         
         # Definir argumentos de Local Search e Iterated Local Search
         parser.add_argument("-b", "--best", help="Ejecuta Local Search en modo best improvement", action="store_true")
-        parser.add_argument("-per", "--perturbation", help="Tipo de perturbación a aplicar en ITS [ 2opt | swap | 3opt ]")
+        parser.add_argument("-tb", "--tour-backend", help="Representacion del tour para la búsqueda 2-opt de LS e ILS [ array | linked ]")
+        parser.add_argument("-per", "--perturbation", help="Tipo de perturbación a aplicar en ITS [ 2opt | swap | 3opt | oropt | random ]")
         parser.add_argument("-np", "--nperturbations", help="Cantidad de perturbaciones a aplicar en cada iteración de Iterated Local Search ]0,INT_MAX]")
         
         # Procesar argumentos
@@ -306,8 +385,8 @@ class AlgorithmsOptions():
             # Validar logica de opciones
             if self.errorsGA():
                 exit()
-        elif self.metaheuristic == MHType.LS or self.metaheuristic == MHType.ILS:
-            # Procesar argumentos de Local Search e Iterated Local Search
+        elif self.metaheuristic == MHType.LS or self.metaheuristic == MHType.ILS or self.metaheuristic == MHType.DP:
+            # Procesar argumentos de Local Search e Iterated Local Search (Programación Dinámica los usa sobre el limite de nodos)
             self.argsLS(args, kwargs)
         
 
@@ -320,6 +399,20 @@ class AlgorithmsOptions():
             except: 
                 print(f"{bcolors.FAIL}Error: El tiempo máximo debe ser un número (-t | --time){bcolors.ENDC}")
 
+        # Gap objetivo sobre la cota inferior
+        if (args.target_gap or 'target_gap' in kwargs):
+            try:
+                self.target_gap = float(args.target_gap) if args.target_gap else float(kwargs['target_gap'])
+                if self.target_gap < 0:
+                    raise ValueError
+            except: 
+                self.target_gap = AlgorithmsOptions.target_gap
+                print(f"{bcolors.FAIL}Error: El gap objetivo debe ser un número >= 0 (-tg | --target-gap){bcolors.ENDC}")
+
+        # Cota inferior de Held-Karp
+        if (args.lowerbound or 'lowerbound' in kwargs):
+            self.lower_bound = args.lowerbound if args.lowerbound else kwargs['lowerbound']
+
         # Semilla 
         if (args.seed or 'seed' in kwargs):
             try:
@@ -356,6 +449,56 @@ class AlgorithmsOptions():
         if (args.replit or 'replit' in kwargs):
             self.replit = args.replit if args.replit else kwargs['replit']
 
+        # Distancias bajo demanda
+        if (args.lazy or 'lazy' in kwargs):
+            self.lazy_distance = args.lazy if args.lazy else kwargs['lazy']
+
+        # Filas del cache LRU de distancias
+        if (args.cachesize or 'cachesize' in kwargs):
+            try:
+                self.cache_rows = int(args.cachesize) if args.cachesize else int(kwargs['cachesize'])
+                if self.cache_rows <= 0:
+                    raise ValueError
+            except: 
+                self.cache_rows = AlgorithmsOptions.cache_rows
+                print(f"{bcolors.FAIL}Error: El tamaño del cache debe ser un número entero > 0 (-cs | --cachesize){bcolors.ENDC}")
+
+        # Vecinos en las listas de candidatos
+        if (args.neighbours or 'neighbours' in kwargs):
+            try:
+                self.nn_size = int(args.neighbours) if args.neighbours else int(kwargs['neighbours'])
+                if self.nn_size <= 0:
+                    raise ValueError
+            except: 
+                self.nn_size = AlgorithmsOptions.nn_size
+                print(f"{bcolors.FAIL}Error: La cantidad de vecinos debe ser un número entero > 0 (-nn | --neighbours){bcolors.ENDC}")
+
+        # Cache de instancias preprocesadas
+        if (args.nocache or 'nocache' in kwargs):
+            self.use_cache = not (args.nocache if args.nocache else kwargs['nocache'])
+
+        # Eliminar el cache de instancias
+        if (args.clearcache or 'clearcache' in kwargs):
+            self.clear_cache = args.clearcache if args.clearcache else kwargs['clearcache']
+
+        # Matriz de distancias mapeada en memoria
+        if (args.mmap or 'mmap' in kwargs):
+            self.mmap_distance = args.mmap if args.mmap else kwargs['mmap']
+
+        # Procesos del preprocesamiento en paralelo
+        if (args.workers or 'workers' in kwargs):
+            try:
+                self.workers = int(args.workers) if args.workers else int(kwargs['workers'])
+                if self.workers <= 0:
+                    raise ValueError
+            except: 
+                self.workers = AlgorithmsOptions.workers
+                print(f"{bcolors.FAIL}Error: La cantidad de procesos debe ser un número entero > 0 (-w | --workers){bcolors.ENDC}")
+
+        # Modo estricto de validacion de tours
+        if (args.strict or 'strict' in kwargs):
+            self.strict_check = args.strict if args.strict else kwargs['strict']
+
         # Archivo de instancia
         if (args.instance or 'instance' in kwargs):
             self.instance = args.instance if args.instance else kwargs['instance']
@@ -371,6 +514,8 @@ class AlgorithmsOptions():
                 self.metaheuristic = MHType.LS
             elif (val == 'ILS'):
                 self.metaheuristic = MHType.ILS
+            elif (val == 'DP'):
+                self.metaheuristic = MHType.DP
             else: print(f"{bcolors.FAIL}Error: Metaheuristica no reconocida (-mh | --metaheristic) {bcolors.ENDC}")  
         
         # Numero máximo de evaluaciones
@@ -396,6 +541,8 @@ class AlgorithmsOptions():
                 self.move = TSPMove.THREE_OPT
             elif (val == 'swap'):
                 self.move = TSPMove.SWAP
+            elif (val == 'oropt' or val == 'or-opt'):
+                self.move = TSPMove.OR_OPT
             else: print(f"{bcolors.FAIL}Error: Tipo de movimiento no reconocido (-mhm | --move) {bcolors.ENDC}") 
             
         # Solución inicial
@@ -407,6 +554,16 @@ class AlgorithmsOptions():
                 self.initial_solution = InitialSolution.NEAREST_N
             elif (val == 'DETERMINISTIC'):
                 self.initial_solution = InitialSolution.DETERMINISTIC
+            elif (val == 'GREEDY_EDGE'):
+                self.initial_solution = InitialSolution.GREEDY_EDGE
+            elif (val == 'SPACE_FILLING_CURVE'):
+                self.initial_solution = InitialSolution.SPACE_FILLING_CURVE
+            elif (val == 'NEAREST_INSERTION'):
+                self.initial_solution = InitialSolution.NEAREST_INSERTION
+            elif (val == 'FARTHEST_INSERTION'):
+                self.initial_solution = InitialSolution.FARTHEST_INSERTION
+            elif (val == 'CHEAPEST_INSERTION'):
+                self.initial_solution = InitialSolution.CHEAPEST_INSERTION
             else: print(f"{bcolors.FAIL}Error: Opcion no reconocida en solución inicial (-is | --inso) {bcolors.ENDC}")
 
         # Modo de salida reducido para no mostrar todos los cambios en los ciclos de los algoritmos
@@ -499,6 +656,8 @@ class AlgorithmsOptions():
                 self.mutation_type = TSPMove.THREE_OPT
             elif (val == 'swap'):
                 self.mutation_type = TSPMove.SWAP
+            elif (val == 'oropt' or val == 'or-opt'):
+                self.mutation_type = TSPMove.OR_OPT
             else: print(f"{bcolors.FAIL}Error: Tipo de mutación no reconocido (-mu | --mutation) {bcolors.ENDC}")
 
         # Probabilidad de mutación
@@ -543,6 +702,8 @@ class AlgorithmsOptions():
                 self.perturbation = PerturbationType.THREE_OPT
             elif (val == 'swap'):
                 self.perturbation = PerturbationType.SWAP
+            elif (val == 'oropt' or val == 'or-opt'):
+                self.perturbation = PerturbationType.OR_OPT
             elif (val == 'random'):
                 self.perturbation = PerturbationType.RANDOM
             else: print(f"{bcolors.FAIL}Error: Tipo de perturbación no reconocido (-per | --perturbation) {bcolors.ENDC}")
@@ -558,6 +719,15 @@ class AlgorithmsOptions():
             except: 
                 print(f"{bcolors.FAIL}Error: El número de perturbaciones debe ser un número entero (-np | --nperturbations){bcolors.ENDC}")
 
+        # Representacion del tour para la búsqueda 2-opt
+        if (args.tour_backend or 'tour_backend' in kwargs):
+            val = args.tour_backend.upper() if args.tour_backend else kwargs['tour_backend'].upper()
+            if (val == 'ARRAY'):
+                self.tour_backend = TourBackend.ARRAY
+            elif (val == 'LINKED'):
+                self.tour_backend = TourBackend.LINKED
+            else: print(f"{bcolors.FAIL}Error: Representacion del tour no reconocida (-tb | --tour-backend) {bcolors.ENDC}")
+
 
     def errorsSA(self) -> bool:
         """ Validar que algunos parámetros cumplan con la lógica del algoritmo a aplicar """
@@ -616,6 +786,18 @@ class AlgorithmsOptions():
         print(f"{bcolors.OKBLUE}Iteraciones máximas: {bcolors.ENDC}{self.max_iterations}")
         print(f"{bcolors.OKBLUE}Solución Inicial: {bcolors.ENDC}{self.initial_solution.value}")
         print(f"{bcolors.OKBLUE}Límite de tiempo de ejecución: {bcolors.ENDC}{self.max_time} segundos")
+        if self.target_gap > 0:
+            print(f"{bcolors.OKBLUE}Gap objetivo sobre la cota inferior: {bcolors.ENDC}{self.target_gap}%")
+        print(f"{bcolors.OKBLUE}Vecinos en las listas de candidatos: {bcolors.ENDC}{self.nn_size}")
+        print(f"{bcolors.OKBLUE}Cache de instancias: {bcolors.ENDC}{self.use_cache}")
+        if self.strict_check:
+            print(f"{bcolors.OKBLUE}Validación estricta de tours: {bcolors.ENDC}{self.strict_check}")
+        if self.workers > 1:
+            print(f"{bcolors.OKBLUE}Procesos para el preprocesamiento: {bcolors.ENDC}{self.workers}")
+        if self.mmap_distance:
+            print(f"{bcolors.OKBLUE}Matriz de distancias mapeada en memoria: {bcolors.ENDC}{self.mmap_distance}")
+        if self.lazy_distance:
+            print(f"{bcolors.OKBLUE}Distancias bajo demanda, filas en cache: {bcolors.ENDC}{self.cache_rows}")
 
         # Opciones para Simulated Annealing
         if (self.metaheuristic == MHType.SA):
@@ -640,6 +822,7 @@ class AlgorithmsOptions():
             print(f"{bcolors.OKBLUE}Best Improvement: {bcolors.ENDC}{self.bestImprovement}")
             print(f"{bcolors.OKBLUE}Tipo de perturbación para búsqueda ILS: {bcolors.ENDC}{self.perturbation.value}")
             print(f"{bcolors.OKBLUE}Número de perturbaciones a aplicar para búsqueda ILS: {bcolors.ENDC}{self.nPerturbations}")
+            print(f"{bcolors.OKBLUE}Representacion del tour para 2-opt: {bcolors.ENDC}{self.tour_backend.value}")
         
                         
         print()
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Modulo que contiene la clase que calcula la cota inferior de Held-Karp para una instancia TSP
+
+"""
+
+from . import math, np
+from .TSPlibReader import LazyDistance
+from .Tools import bcolors
+
+# Numero maximo de iteraciones de la optimizacion por subgradiente
+BOUND_ITERATIONS = 100
+# Iteraciones sin mejorar la cota antes de reducir a la mitad el tamaño de paso
+BOUND_PATIENCE = 10
+
+class LowerBound():
+    """ Clase que calcula la cota inferior de Held-Karp de una instancia TSP: el mayor valor de un 1-arbol minimo
+        con penalizaciones pi en los nodos, L(pi) = w(1-arbol con pesos d(i,j) + pi[i] + pi[j]) - 2 * suma(pi),
+        optimizado por subgradiente. Los 1-arboles de las iteraciones se calculan sobre las aristas de las listas
+        de candidatos (Kruskal), la cota final se recalcula sobre el grafo completo (Prim) para que sea valida;
+        en modo lazy no se recalcula y la cota queda como una estimacion
+
+        Parameters
+        ----------
+        problem : Tsp
+            Instancia del problema TSP
+        iterations : int, optional
+            Numero maximo de iteraciones del subgradiente
+
+        Attributes
+        ----------
+        bound : int
+            Cota inferior (None si no se pudo calcular)
+        exact : bool
+            La cota se calculo sobre el grafo completo y es valida
+        pi : np.ndarray
+            Penalizaciones de los nodos con las que se obtuvo la cota
+
+        Examples
+        --------
+        >>> problem = Tsp(filename=options.instance)
+        >>> LowerBound(problem).bound
+    """
+
+    def __init__(self, problem: 'Tsp', iterations: int = BOUND_ITERATIONS) -> None:
+
+        self.problem = problem # Problema TSP
+
+        self.bound = None # Cota inferior
+
+        self.exact = False # Cota valida sobre el grafo completo
+
+        self.pi = np.zeros(problem.nodes) # Penalizaciones de los nodos
+
+        if (problem.nodes >= 3):
+            self.compute(iterations)
+
+    def compute(self, iterations: int) -> None:
+        """ Optimiza las penalizaciones por subgradiente con paso de Polyak t = lambda * (UB - L(pi)) / |d - 2|^2,
+            donde UB es el costo del tour greedy de aristas y lambda se reduce a la mitad al estancarse la cota """
+        lazy = isinstance(self.problem.distances, LazyDistance)
+        edges = self.candidate_edges()
+        one_tree = self.sparse_one_tree
+        if (one_tree(self.pi, edges) is None):
+            # Las listas de candidatos no conectan el grafo
+            if (lazy):
+                print(f"{bcolors.WARNING}Advertencia: Las listas de candidatos no conectan el grafo, no se calcula la cota inferior en modo lazy{bcolors.ENDC}")
+                return
+            one_tree = self.dense_one_tree
+
+        upper = self.problem.compute_tour_length(self.problem.greedy_edge())
+        pi = np.zeros(self.problem.nodes)
+        best, best_pi = -math.inf, pi.copy()
+        step, stall = 2.0, 0
+        for _ in range(iterations):
+            total, degree = one_tree(pi, edges)
+            value = total - 2.0 * pi.sum()
+            if (value > best):
+                best, best_pi, stall = value, pi.copy(), 0
+            else:
+                stall += 1
+                if (stall >= BOUND_PATIENCE):
+                    step, stall = step / 2.0, 0
+            subgradient = degree - 2
+            norm = int((subgradient * subgradient).sum())
+            # El 1-arbol es un tour, la cota es optima
+            if (norm == 0 or upper <= value):
+                break
+            pi = pi + step * (upper - value) / norm * subgradient
+
+        self.pi = best_pi
+        if (lazy):
+            self.exact = False
+        else:
+            # Recalcular la cota con el 1-arbol minimo sobre todas las aristas
+            total, _ = self.dense_one_tree(best_pi, edges)
+            best = total - 2.0 * best_pi.sum()
+            self.exact = True
+        # Los costos de los tours son enteros
+        self.bound = int(math.ceil(best - 1e-6))
+
+    def candidate_edges(self) -> tuple:
+        """ Retorna las aristas de las listas de candidatos sin el nodo especial 0 y sin repetir (a < b) con sus distancias """
+        n = self.problem.nodes
+        neighbours = self.problem.neighbours
+        first = np.repeat(np.arange(n, dtype=np.int64), neighbours.shape[1])
+        second = neighbours.ravel().astype(np.int64)
+        keys = np.sort(np.minimum(first, second) * n + np.maximum(first, second))
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        first, second = keys // n, keys % n
+        keep = first != 0
+        first, second = first[keep], second[keep]
+        return first, second, np.asarray(self.problem.distances[first, second], dtype=np.float64)
+
+    def special_edges(self, pi: np.ndarray, degree: np.ndarray) -> float:
+        """ Suma al 1-arbol las dos aristas mas baratas del nodo especial 0 y actualiza los grados """
+        row = self.problem.distance_row(0) + pi[0] + pi
+        row[0] = math.inf
+        pair = np.argpartition(row, 2)[:2]
+        degree[0] += 2
+        degree[pair] += 1
+        return float(row[pair].sum())
+
+    def sparse_one_tree(self, pi: np.ndarray, edges: tuple) -> tuple:
+        """ 1-arbol minimo con el arbol de expansion (Kruskal) sobre las aristas de las listas de candidatos
+
+            Returns
+            -------
+            tuple
+                (peso, grados) del 1-arbol, None si las aristas no conectan los nodos 1..n-1
+        """
+        n = self.problem.nodes
+        first, second, dist = edges
+        weight = dist + pi[first] + pi[second]
+        order = np.argsort(weight, kind='stable')
+        parent = list(range(n))
+        degree = np.zeros(n, dtype=np.int64)
+        chosen = []
+        for e, i, j in zip(order.tolist(), first[order].tolist(), second[order].tolist()):
+            # raices de los componentes con compresion de caminos por mitades
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            while parent[j] != j:
+                parent[j] = parent[parent[j]]
+                j = parent[j]
+            if (i != j):
+                parent[i] = j
+                chosen.append(e)
+                if (len(chosen) == n - 2):
+                    break
+        if (len(chosen) < n - 2):
+            return None
+        chosen = np.array(chosen, dtype=np.int64)
+        np.add.at(degree, first[chosen], 1)
+        np.add.at(degree, second[chosen], 1)
+        total = float(weight[chosen].sum()) + self.special_edges(pi, degree)
+        return total, degree
+
+    def dense_one_tree(self, pi: np.ndarray, edges: tuple = None) -> tuple:
+        """ 1-arbol minimo con el arbol de expansion (Prim) sobre todas las aristas, O(n^2)
+
+            Returns
+            -------
+            tuple
+                (peso, grados) del 1-arbol
+        """
+        n = self.problem.nodes
+        degree = np.zeros(n, dtype=np.int64)
+        in_tree = np.zeros(n, dtype=bool)
+        in_tree[0] = in_tree[1] = True
+        key = self.problem.distance_row(1) + pi[1] + pi
+        key[in_tree] = math.inf
+        parent = np.ones(n, dtype=np.int64)
+        total = 0.0
+        for _ in range(n - 2):
+            node = int(np.argmin(key))
+            total += key[node]
+            degree[node] += 1
+            degree[parent[node]] += 1
+            in_tree[node] = True
+            key[node] = math.inf
+            weight = self.problem.distance_row(node) + pi[node] + pi
+            better = (weight < key) & ~in_tree
+            key[better] = weight[better]
+            parent[better] = node
+        total += self.special_edges(pi, degree)
+        return total, degree
@@ -4,41 +4,509 @@ que contengan porblemas TSP en formato TSPlib
 
 """
 
-from . import os, sys, Enum, math, Decimal
+from . import os, Enum, math, hashlib, multiprocessing, OrderedDict, np
 from .Tools import utilities, bcolors
 
+# Numero maximo de elementos por bloque al calcular la matriz de distancias de forma vectorizada
+BLOCK_ELEMENTS = 1 << 21
+# Tolerancia relativa para detectar distancias cercanas a un limite de redondeo, estas se recalculan por par
+ROUND_TOL = 1e-9
+# Tolerancia absoluta (km) para detectar distancias GEO cercanas a un entero
+GEO_TOL = 1e-6
+# Radio de la tierra utilizado en TSPLIB para las distancias geograficas
+RRR = 6378.388
+# Digitos significativos del contexto decimal por defecto, con el que se definieron las distancias GEO y ATT
+DECIMAL_DIGITS = 28
+# Cantidad de vecinos mas cercanos por defecto en las listas de candidatos
+NN_SIZE = 20
+# Numero maximo de celdas de la grilla consultadas por bloque al calcular los vecinos
+GRID_CELLS = 1 << 18
+# Carpeta del cache con las instancias preprocesadas (coordenadas, matriz de distancias y listas de candidatos),
+# en el cache del usuario ($XDG_CACHE_HOME/tspf o ~/.cache/tspf) y no en el directorio de trabajo
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "tspf")
+# Version del formato del cache, al cambiar se reconstruyen las entradas antiguas
+CACHE_VERSION = 1
+# Bloques por proceso al repartir el preprocesamiento en paralelo, mas bloques equilibran mejor la carga
+PARALLEL_BLOCKS = 4
+# Cantidad de caracteres leidos por bloque en la seccion EDGE_WEIGHT_SECTION
+READ_CHUNK = 1 << 20
+# Orden de la curva de Hilbert, las coordenadas se discretizan en una grilla de 2^orden x 2^orden
+HILBERT_ORDER = 16
+
 class Point():
-    """ Clase puntero para coordenadas """
+    """ Clase puntero para coordenadas, las instancias usan un np.recarray con los mismos campos x e y
+        (se mantiene para abrir archivos guardados por la interfaz grafica con versiones anteriores) """
     def __init__(self, x, y) -> None:
         self.x = x
         self.y = y
 
-class Distance():
-    """ Clase de apoyo para ayudar a crear la matriz del vecindario para los nodos """
-    def __init__(self, val, pos) -> None:
-        self.distance = val
-        self.position = pos
-
 class Distance_type(Enum):
     """Tipos de instancias en TSPlib"""
     EUC_2D = 'EUC_2D'
     CEIL_2D = 'CEIL_2D'
     GEO = 'GEO'
     ATT = 'ATT'
+    EXPLICIT = 'EXPLICIT'
+
+class Edge_weight_format(Enum):
+    """Formatos de la seccion EDGE_WEIGHT_SECTION para instancias EXPLICIT"""
+    FULL_MATRIX = 'FULL_MATRIX'
+    UPPER_ROW = 'UPPER_ROW'
+    LOWER_ROW = 'LOWER_ROW'
+    UPPER_DIAG_ROW = 'UPPER_DIAG_ROW'
+    LOWER_DIAG_ROW = 'LOWER_DIAG_ROW'
+    UPPER_COL = 'UPPER_COL'
+    LOWER_COL = 'LOWER_COL'
+    UPPER_DIAG_COL = 'UPPER_DIAG_COL'
+    LOWER_DIAG_COL = 'LOWER_DIAG_COL'
+
+
+def decimal_parts(value: float) -> tuple:
+    """ Retorna el par de enteros (m, e) tal que m * 10**e es exactamente el numero decimal escrito por repr(value),
+        es el mismo valor que se obtiene con Decimal(f"{value}") """
+    mantissa, _, exponent = repr(float(value)).partition('e')
+    whole, _, frac = mantissa.partition('.')
+    return int(whole + frac), int(exponent or 0) - len(frac)
+
+def decimal_round(m: int, e: int) -> tuple:
+    """ Redondea m * 10**e a DECIMAL_DIGITS digitos significativos con redondeo al par, igual que el contexto Decimal por defecto """
+    digits = len(str(abs(m)))
+    if digits <= DECIMAL_DIGITS:
+        return m, e
+    shift = digits - DECIMAL_DIGITS
+    q, r = divmod(abs(m), 10 ** shift)
+    half = 5 * 10 ** (shift - 1)
+    if r > half or (r == half and q % 2 == 1):
+        q += 1
+    return (q if m >= 0 else -q), e + shift
+
+def decimal_add(a: tuple, b: tuple) -> tuple:
+    """ Suma exacta de dos decimales (m, e) redondeada como Decimal """
+    e = min(a[1], b[1])
+    return decimal_round(a[0] * 10 ** (a[1] - e) + b[0] * 10 ** (b[1] - e), e)
+
+def decimal_sub(a: tuple, b: tuple) -> tuple:
+    """ Resta exacta de dos decimales (m, e) redondeada como Decimal """
+    return decimal_add(a, (-b[0], b[1]))
+
+def decimal_mul(a: tuple, b: tuple) -> tuple:
+    """ Multiplicacion exacta de dos decimales (m, e) redondeada como Decimal """
+    return decimal_round(a[0] * b[0], a[1] + b[1])
+
+def decimal_float(a: tuple) -> float:
+    """ Convierte un decimal (m, e) al float mas cercano, la division entre enteros de python es correctamente redondeada """
+    m, e = a
+    return float(m * 10 ** e) if e >= 0 else m / 10 ** -e
+
+def geo_radians(value: float) -> float:
+    """ Convierte una coordenada en formato TSPLIB GEO (DDD.MM) a radianes, igual que la definicion de TSPLIB """
+    deg = utilities.dtrunc(value)
+    min = decimal_float(decimal_sub(decimal_parts(value), decimal_parts(deg)))
+    return math.pi * (deg + 5.0 * min / 3.0) / 180.0
+
+def euc_2d_kernel(x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray) -> tuple:
+    """ Distancia Euclidiana redondeada al entero mas cercano entre los puntos (x1, y1) y (x2, y2) (con broadcasting) """
+    dx = x1 - x2
+    dy = y1 - y2
+    d = np.sqrt(dx * dx + dy * dy)
+    # round() de python y rint redondean al par en caso de empate (0.5)
+    ambiguous = np.abs(d - np.floor(d) - 0.5) < ROUND_TOL * np.maximum(d, 1.0)
+    return np.rint(d), ambiguous
+
+def ceil_2d_kernel(x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray) -> tuple:
+    """ Distancia Euclidiana con funcion techo (redondeada antes a 2 decimales) entre los puntos (x1, y1) y (x2, y2) """
+    dx = x1 - x2
+    dy = y1 - y2
+    d = np.sqrt(dx * dx + dy * dy)
+    frac = d - np.floor(d)
+    # ceil(round(d, 2)) es el entero inferior cuando la parte decimal se redondea a .00
+    ambiguous = np.abs(frac - 0.005) < ROUND_TOL * np.maximum(d, 1.0)
+    return np.where(frac < 0.005, np.floor(d), np.ceil(d)), ambiguous
+
+def geo_kernel(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> tuple:
+    """ Distancia geografica TSPLIB entre dos conjuntos de puntos, recibe latitudes y longitudes en radianes """
+    q1 = np.cos(lon1 - lon2)
+    q2 = np.cos(lat1 - lat2)
+    q3 = np.cos(lat1 + lat2)
+    d = RRR * np.arccos(np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)) + 1.0
+    frac = d - np.floor(d)
+    ambiguous = (frac < GEO_TOL) | (frac > 1.0 - GEO_TOL)
+    return np.trunc(d), ambiguous
+
+def att_kernel(x1: np.ndarray, y1: np.ndarray, x2: np.ndarray, y2: np.ndarray) -> tuple:
+    """ Distancia pseudo-Euclidiana ATT entre los puntos (x1, y1) y (x2, y2) (con broadcasting) """
+    dx = x1 - x2
+    dy = y1 - y2
+    r = np.sqrt((dx * dx + dy * dy) / 10.0)
+    frac = r - np.floor(r)
+    tol = ROUND_TOL * np.maximum(r, 1.0)
+    ambiguous = (frac < tol) | (frac > 1.0 - tol)
+    return np.ceil(r), ambiguous
+
+def compact_dtype(max_value: int) -> type:
+    """ Retorna el tipo entero mas pequeño (int16, int32 o int64) capaz de almacenar distancias hasta max_value """
+    if max_value <= np.iinfo(np.int16).max:
+        return np.int16
+    if max_value <= np.iinfo(np.int32).max:
+        return np.int32
+    return np.int64
+
+def hilbert_index(x: np.ndarray, y: np.ndarray, order: int = HILBERT_ORDER) -> np.ndarray:
+    """ Retorna la posicion de cada punto a lo largo de la curva de Hilbert que cubre su rectangulo envolvente,
+        las coordenadas se discretizan con la misma escala en ambos ejes en una grilla de 2^order x 2^order """
+    side = 1 << order
+    xmin, ymin = x.min(), y.min()
+    extent = max(x.max() - xmin, y.max() - ymin)
+    scale = (side - 1) / extent if extent > 0 else 0.0
+    hx = ((x - xmin) * scale).astype(np.int64)
+    hy = ((y - ymin) * scale).astype(np.int64)
+    index = np.zeros(len(x), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = (hx & s) > 0
+        ry = (hy & s) > 0
+        index += s * s * ((3 * rx) ^ ry)
+        # rotar el cuadrante para que la curva sea continua
+        flip = ~ry & rx
+        hx = np.where(flip, side - 1 - hx, hx)
+        hy = np.where(flip, side - 1 - hy, hy)
+        hx, hy = np.where(ry, hx, hy), np.where(ry, hy, hx)
+        s >>= 1
+    return index
+
+# Kernel vectorizado para cada tipo de distancia
+KERNELS = {
+    Distance_type.EUC_2D: euc_2d_kernel,
+    Distance_type.CEIL_2D: ceil_2d_kernel,
+    Distance_type.GEO: geo_kernel,
+    Distance_type.ATT: att_kernel
+}
+
+
+class LazyDistance():
+    """ Oraculo de distancias bajo demanda para instancias donde la matriz completa no cabe en memoria.
+        Las distancias se calculan desde las coordenadas y las filas usadas recientemente se guardan en un cache LRU acotado.
+        Se indexa igual que la matriz de distancias: distance[i, j], distance[i] (fila) o distance[a, b] con arreglos de pares
+
+        Parameters
+        ----------
+        reader : TSPlibReader
+            Instancia leida con las coordenadas y el tipo de distancia
+        cache_rows : int
+            Cantidad maxima de filas en el cache LRU
+    """
+    def __init__(self, reader: 'TSPlibReader', cache_rows: int) -> None:
+        self.reader = reader
+        self.n = reader.n
+        self.cache_rows = max(1, cache_rows)
+        self.coords = reader.kernel_coords() # coordenadas preparadas para el kernel
+        self.rows = OrderedDict() # cache LRU: nodo -> fila de distancias (memoryview)
+
+    def __getstate__(self) -> dict:
+        """ Estado del objeto para ser guardado con pickle, el cache no se guarda """
+        state = self.__dict__.copy()
+        state['rows'] = OrderedDict()
+        return state
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, key):
+        # distancia entre dos nodos o entre pares de nodos
+        if isinstance(key, tuple):
+            i, j = key
+            if isinstance(i, np.ndarray) or isinstance(j, np.ndarray):
+                return self.reader.compute_distance_pairs(np.asarray(i), np.asarray(j), self.coords)
+            row = self.rows.get(i)
+            if row is not None:
+                self.rows.move_to_end(i)
+                return row[j]
+            # la matriz es simetrica, se usa la fila de j si ya esta en el cache
+            row = self.rows.get(j)
+            if row is not None:
+                self.rows.move_to_end(j)
+                return row[i]
+            return self.row(i)[j]
+        # fila completa
+        if key < 0 or key >= self.n:
+            raise IndexError(key)
+        return np.asarray(self.row(key))
+
+    def row(self, i: int) -> memoryview:
+        """ Retorna la fila de distancias del nodo i desde el cache o la calcula si no esta """
+        row = self.rows.get(i)
+        if row is not None:
+            self.rows.move_to_end(i)
+            return row
+        values = self.reader.compute_distance_rows(i, i + 1, self.coords)[0]
+        row = memoryview(values.astype(compact_dtype(int(values.max()))))
+        self.rows[i] = row
+        if len(self.rows) > self.cache_rows:
+            self.rows.popitem(last=False)
+        return row
+
+    def nbytes(self) -> int:
+        """ Memoria maxima (aproximada) utilizada por el cache de filas """
+        return self.cache_rows * self.n * np.dtype(np.int32).itemsize
+
+
+class PackedDistance():
+    """ Matriz de distancias simetrica guardada como triangulo inferior empaquetado (con diagonal) en un arreglo de n(n+1)/2 enteros,
+        la distancia entre i >= j esta en la posicion i(i+1)/2 + j. Se indexa igual que la matriz de distancias:
+        distance[i, j], distance[i] (fila), distance[start:end] (bloque de filas) o distance[a, b] con arreglos de pares
+
+        Parameters
+        ----------
+        n : int
+            numero de nodos
+        packed : np.ndarray
+            triangulo inferior empaquetado por filas
+    """
+    def __init__(self, n: int, packed: np.ndarray) -> None:
+        self.n = n
+        self.packed = packed
+        self.dtype = packed.dtype
+        self.nbytes = packed.nbytes
+        self.view = memoryview(packed) # entrega enteros de python sin pasar por numpy
+
+    def __getstate__(self) -> dict:
+        """ Estado del objeto para ser guardado con pickle, la vista memoryview no es serializable """
+        state = self.__dict__.copy()
+        state.pop('view')
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.view = memoryview(self.packed)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, key):
+        # distancia entre dos nodos o entre pares de nodos
+        if isinstance(key, tuple):
+            i, j = key
+            if isinstance(i, np.ndarray) or isinstance(j, np.ndarray):
+                i, j = np.asarray(i, dtype=np.int64), np.asarray(j, dtype=np.int64)
+                high, low = np.maximum(i, j), np.minimum(i, j)
+                return self.packed[high * (high + 1) // 2 + low]
+            if i < j:
+                i, j = j, i
+            return self.view[i * (i + 1) // 2 + j]
+        # bloque de filas
+        if isinstance(key, slice):
+            start, end, _ = key.indices(self.n)
+            return self.rows(start, end)
+        # fila completa
+        if key < 0 or key >= self.n:
+            raise IndexError(key)
+        return self.rows(key, key + 1)[0]
+
+    def rows(self, start: int, end: int) -> np.ndarray:
+        """ Retorna las filas [start, end) de la matriz completa """
+        i = np.arange(start, end, dtype=np.int64)[:, None]
+        j = np.arange(self.n, dtype=np.int64)[None, :]
+        high, low = np.maximum(i, j), np.minimum(i, j)
+        return self.packed[high * (high + 1) // 2 + low]
+
+
+class NeighbourGrid():
+    """ Indice espacial de buckets en una grilla regular para buscar los vecinos mas cercanos de cada nodo
+        sin calcular todas las distancias, en promedio cada celda contiene 2 puntos
+
+        Parameters
+        ----------
+        x, y : np.ndarray
+            coordenadas de los nodos
+    """
+    def __init__(self, x: np.ndarray, y: np.ndarray) -> None:
+        n = len(x)
+        xmin, ymin = x.min(), y.min()
+        width, height = x.max() - xmin, y.max() - ymin
+        self.xmin, self.ymin = float(xmin), float(ymin)
+        # Tamaño de celda, el segundo termino evita demasiadas celdas cuando los puntos son casi colineales
+        self.size = max(math.sqrt(width * height * 2.0 / n), max(width, height) * 2.0 / n)
+        if self.size <= 0:
+            self.size = 1.0
+        self.nx = int(width // self.size) + 1
+        self.ny = int(height // self.size) + 1
+        self.cx = np.minimum(((x - xmin) // self.size).astype(np.int64), self.nx - 1)
+        self.cy = np.minimum(((y - ymin) // self.size).astype(np.int64), self.ny - 1)
+        cell = self.cx * self.ny + self.cy
+        self.order = np.argsort(cell, kind='stable') # nodos ordenados por celda
+        self.counts = np.bincount(cell, minlength=self.nx * self.ny) # nodos por celda
+        self.starts = np.cumsum(self.counts) - self.counts # inicio de cada celda en order
+
+    def covers(self, r: int) -> bool:
+        """ Retorna verdadero si un radio de r celdas cubre toda la grilla desde cualquier celda """
+        return r >= max(self.nx, self.ny)
+
+    def candidates(self, nodes: np.ndarray, r: int) -> tuple:
+        """ Retorna los nodos en las celdas a r celdas o menos (distancia de Chebyshev) de las celdas de nodes
+
+            Returns
+            -------
+            tuple
+                (owner, candidate) arreglos planos donde owner es la posicion en nodes a la que pertenece cada candidato
+        """
+        offsets = np.arange(-r, r + 1)
+        gx = self.cx[nodes][:, None, None] + offsets[None, :, None]
+        gy = self.cy[nodes][:, None, None] + offsets[None, None, :]
+        valid = ((gx >= 0) & (gx < self.nx) & (gy >= 0) & (gy < self.ny)).reshape(len(nodes), -1)
+        cell = np.where(valid, (gx * self.ny + gy).reshape(len(nodes), -1), 0)
+        count = np.where(valid, self.counts[cell], 0).ravel()
+        start = self.starts[cell].ravel()
+        cells = (2 * r + 1) ** 2
+        owner = np.repeat(np.arange(len(count)) // cells, count)
+        # posicion de cada candidato dentro de su celda
+        inner = np.arange(int(count.sum())) - np.repeat(np.cumsum(count) - count, count)
+        return owner, self.order[np.repeat(start, count) + inner]
+
+
+class UnvisitedGrid():
+    """ Indice espacial de los nodos no visitados para coordenadas planas, entrega el nodo libre mas cercano a un nodo
+        (en caso de empate el de menor indice) cuando se agotan sus listas de candidatos al construir un tour.
+        Los nodos visitados se descartan al reconstruir la grilla, lo que ocurre cuando quedan menos de la mitad
+        de los nodos con los que se construyo
+
+        Parameters
+        ----------
+        reader : TSPlibReader
+            instancia con las coordenadas y el tipo de distancia
+
+        Attributes
+        ----------
+        visited : bytearray
+            marca de los nodos visitados
+    """
+    def __init__(self, reader: 'TSPlibReader') -> None:
+        self.reader = reader
+        self.visited = bytearray(reader.n)
+        self.remaining = reader.n
+        self.x, self.y = reader.kernel_coords()
+        self.px, self.py = self.x.tolist(), self.y.tolist()
+        # la distancia ATT es la distancia euclidiana dividida por raiz de 10
+        self.scale = math.sqrt(10.0) if reader.distance_type == Distance_type.ATT else 1.0
+        # la grilla se construye en la primera busqueda
+        self.built = 0
+
+    def visit(self, node: int) -> None:
+        """ Marca un nodo como visitado """
+        self.visited[node] = 1
+        self.remaining -= 1
+
+    def build(self) -> None:
+        """ Construye la grilla con los nodos no visitados """
+        nodes = np.flatnonzero(np.frombuffer(self.visited, dtype=np.uint8) == 0)
+        grid = NeighbourGrid(self.x[nodes], self.y[nodes])
+        self.size, self.nx, self.ny = grid.size, grid.nx, grid.ny
+        self.xmin, self.ymin = grid.xmin, grid.ymin
+        self.order = nodes[grid.order].tolist()
+        self.starts = grid.starts.tolist()
+        self.counts = grid.counts.tolist()
+        self.built = len(nodes)
+
+    def ring(self, qx: int, qy: int, r: int) -> list:
+        """ Retorna las celdas de la grilla a distancia de Chebyshev exactamente r de la celda (qx, qy) """
+        if r == 0:
+            return [qx * self.ny + qy] if 0 <= qx < self.nx and 0 <= qy < self.ny else []
+        cells = []
+        x0, x1 = max(qx - r, 0), min(qx + r, self.nx - 1)
+        y0, y1 = max(qy - r + 1, 0), min(qy + r - 1, self.ny - 1)
+        for gy in (qy - r, qy + r):
+            if 0 <= gy < self.ny:
+                cells.extend(gx * self.ny + gy for gx in range(x0, x1 + 1))
+        for gx in (qx - r, qx + r):
+            if 0 <= gx < self.nx:
+                cells.extend(gx * self.ny + gy for gy in range(y0, y1 + 1))
+        return cells
+
+    def nearest(self, node: int) -> int:
+        """ Retorna el nodo no visitado mas cercano a node, ampliando el radio de busqueda en anillos de celdas.
+            La busqueda usa la distancia euclidiana y termina cuando ningun nodo fuera del radio puede tener una
+            distancia entera menor o igual, la distancia entera (a menos de una unidad de la euclidiana escalada)
+            solo se calcula para los nodos cercanos al mas cercano """
+        if self.built == 0 or self.remaining * 2 < self.built:
+            self.build()
+        visited, order, starts, counts = self.visited, self.order, self.starts, self.counts
+        px, py = self.px, self.py
+        x, y = px[node], py[node]
+        # margen euclidiano dentro del cual un nodo puede empatar o mejorar la distancia entera del mas cercano
+        slack = 3.0 * self.scale
+        # celda del nodo en la grilla (puede estar fuera de ella si ya fue descartado)
+        qx = math.floor((x - self.xmin) / self.size)
+        qy = math.floor((y - self.ymin) / self.size)
+        r = max(0, -qx, qx - self.nx + 1, -qy, qy - self.ny + 1)
+        cover = max(qx, self.nx - 1 - qx, qy, self.ny - 1 - qy)
+        found = [] # (distancia euclidiana al cuadrado, nodo) de los nodos libres revisados
+        closest = math.inf
+        while True:
+            for cell in self.ring(qx, qy, r):
+                start = starts[cell]
+                for candidate in order[start:start + counts[cell]]:
+                    if not visited[candidate]:
+                        dx, dy = px[candidate] - x, py[candidate] - y
+                        d2 = dx * dx + dy * dy
+                        found.append((d2, candidate))
+                        if d2 < closest:
+                            closest = d2
+            if r >= cover or (found and r * self.size > math.sqrt(closest) + slack):
+                break
+            r += 1
+        limit = (math.sqrt(closest) + slack) ** 2
+        distance = self.reader.distance_between
+        return min((distance(node, candidate), candidate) for d2, candidate in found if d2 <= limit)[1]
+
+
+class UnvisitedScan():
+    """ Indice de los nodos no visitados para distancias geograficas y explicitas, sin una grilla valida,
+        el nodo libre mas cercano se busca sobre la fila de distancias de los nodos que quedan
+
+        Parameters
+        ----------
+        reader : TSPlibReader
+            instancia con la matriz o el oraculo de distancias
+
+        Attributes
+        ----------
+        visited : bytearray
+            marca de los nodos visitados
+    """
+    def __init__(self, reader: 'TSPlibReader') -> None:
+        self.distance = reader.distance
+        self.visited = bytearray(reader.n)
+        self.nodes = np.arange(reader.n)
+
+    def visit(self, node: int) -> None:
+        """ Marca un nodo como visitado """
+        self.visited[node] = 1
+
+    def nearest(self, node: int) -> int:
+        """ Retorna el nodo no visitado mas cercano a node (en caso de empate el de menor indice) """
+        self.nodes = self.nodes[np.frombuffer(self.visited, dtype=np.uint8)[self.nodes] == 0]
+        dist = np.asarray(self.distance[np.full(len(self.nodes), node), self.nodes])
+        return int(self.nodes[np.argmin(dist)])
 
 
 class TSPlibReader():
 
-    # Arreglo de estructuras que contiene las coordenadas, Tipo Point
+    # Arreglo de estructuras que contiene las coordenadas (np.recarray con campos x e y)
     nodeptr = []
     # Variable que indica el tipo de distancia
     distance_type: Distance_type
-    # Matriz de distancia: distancia de nodos i a j
+    # Formato de la matriz de distancias en instancias EXPLICIT
+    weight_format = None
+    # Matriz de distancia: distancia de nodos i a j (np.ndarray de enteros int16, int32 o int64, np.memmap de solo lectura si se mapea,
+    # PackedDistance con el triangulo empaquetado en instancias EXPLICIT)
     distance = []
-    # Lista de vecinos mas cercanos: para cada nodo i una lista de vecinos ordenados
+    # Listas de candidatos: para cada nodo i sus k vecinos mas cercanos ordenados (np.ndarray n x k)
     nn_list = []
+    # Coordenadas como listas de floats de python (x, y) para las distancias por par
+    points = None
     # Numero de nodos
     n = 0
+    # Cantidad de procesos del preprocesamiento en paralelo
+    workers = 1
     # Nombre del archivo de instancia
     name = ''
     # modo Gui
@@ -46,28 +514,206 @@ class TSPlibReader():
     # error
     error = ''
 
-    def __init__(self, tsp_file_name: str):
-        """ Constructor clase TSPlibReader recibe la ruta al archivo de la instancia"""
+    def __init__(self, tsp_file_name: str, lazy: bool = False, cache_rows: int = 1024, nn_size: int = NN_SIZE, cache: bool = True, mmap: bool = False, workers: int = 1):
+        """ Constructor clase TSPlibReader recibe la ruta al archivo de la instancia, 
+            en modo lazy las distancias se calculan bajo demanda con un cache LRU de cache_rows filas
+            y se guardan los nn_size vecinos mas cercanos de cada nodo.
+            Si cache es verdadero la instancia preprocesada se carga y guarda en la carpeta CACHE_DIR,
+            con mmap la matriz se mapea en modo solo lectura desde el archivo del cache y se comparte entre procesos.
+            Con workers > 1 la matriz y las listas de candidatos se calculan por bloques en un pool de procesos """
 
-        try:
-            # Leer instancia desde un archivo
-            self.nodeptr = self.read_etsp(tsp_file_name)
-           
-        except:
-            if not self.gui:
-                print(f"{bcolors.FAIL}Error: No se pudo leer el archivo.{bcolors.ENDC}")
-                exit()
+        if mmap and not cache:
+            print(f"{bcolors.WARNING}Advertencia: La matriz mapeada en memoria requiere el cache de instancias, se calculara en memoria{bcolors.ENDC}")
+            mmap = False
+        # Archivo del cache de la instancia (None si no se utiliza)
+        self.cache_file = self.cache_path(tsp_file_name) if cache else None
+        entry = self.load_cache(mmap and not lazy, lazy) if self.cache_file else {}
+
+        if entry:
+            print(f"Cargando instancia desde el cache {self.cache_file} ... ")
+        else:
+            try:
+                # Leer instancia desde un archivo
+                self.nodeptr = self.read_etsp(tsp_file_name)
+               
+            except:
+                if not self.gui:
+                    print(f"{bcolors.FAIL}Error: No se pudo leer el archivo.{bcolors.ENDC}")
+                    exit()
         if not self.error:
-            # Obtener la matriz de distancias
-            print('Calculando las distancias...')
-            self.compute_distances()
-            # Generar listas de vecinos ordenados
-            print('Calculando los vecinos...')
-            self.compute_nn_lists()
+            # Partes de la instancia que se deben guardar en el cache
+            save_entry = not entry
+            save_matrix = False
+            if lazy and self.distance_type == Distance_type.EXPLICIT:
+                print(f"{bcolors.WARNING}Advertencia: Las instancias EXPLICIT no tienen coordenadas, se utiliza la matriz leida{bcolors.ENDC}")
+                lazy = False
+            # Las listas del cache sirven si tienen al menos k vecinos, se usa el prefijo ya que estan ordenadas
+            k = max(0, min(nn_size, self.n - 1))
+            cached_nn = 'nn_list' in entry and entry['nn_list'].shape[1] >= k
+            compute_matrix = not lazy and 'distance' not in entry and self.distance_type != Distance_type.EXPLICIT
+            # Pool de procesos para calcular la matriz y las listas de candidatos en paralelo
+            pool, shared = None, None
+            if workers > 1 and self.distance_type != Distance_type.EXPLICIT and (compute_matrix or not cached_nn):
+                print(f"Preprocesamiento en paralelo con {workers} procesos")
+                pool, shared = self.create_pool(workers, compute_matrix)
+            try:
+                if lazy:
+                    # Las distancias se calculan bajo demanda
+                    self.distance = LazyDistance(self, cache_rows)
+                elif 'distance' in entry:
+                    self.distance = entry['distance']
+                elif self.distance_type == Distance_type.EXPLICIT:
+                    # La matriz ya fue leida desde el archivo
+                    save_matrix = True
+                else:
+                    # Obtener la matriz de distancias
+                    print('Calculando las distancias...')
+                    self.compute_distances(pool, shared)
+                    save_matrix = True
+                if cached_nn:
+                    self.nn_list = np.ascontiguousarray(entry['nn_list'][:, :k])
+                else:
+                    # Generar listas de candidatos con los vecinos mas cercanos
+                    print('Calculando los vecinos...')
+                    self.compute_nn_lists(nn_size, pool)
+                    save_entry = True
+            finally:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+            if self.cache_file and (save_entry or save_matrix):
+                self.save_cache(save_entry, save_matrix)
+            # La matriz recien calculada se reemplaza por la version mapeada del archivo para liberar la copia privada
+            if save_matrix and mmap and os.path.exists(self.cache_file + '.npy'):
+                self.distance = self.load_matrix(True)
             print(f"instancia {self.name} tiene {self.n} nodos")
+            if lazy:
+                print(f"Distancias bajo demanda con cache LRU de {self.distance.cache_rows} filas (máximo {utilities.format_bytes(self.distance.nbytes())})")
+            elif isinstance(self.distance, PackedDistance):
+                print(f"Memoria de la matriz de distancias (triangulo empaquetado{', mapeado en memoria' if isinstance(self.distance.packed, np.memmap) else ''}): {utilities.format_bytes(self.distance.nbytes)} ({self.distance.dtype})")
+            elif isinstance(self.distance, np.memmap):
+                print(f"Matriz de distancias mapeada en memoria (solo lectura) desde {self.distance.filename}: {utilities.format_bytes(self.distance.nbytes)} ({self.distance.dtype})")
+            else:
+                print(f"Memoria de la matriz de distancias: {utilities.format_bytes(self.distance.nbytes)} ({self.distance.dtype})")
             #print(self.distance)
             #print(self.nn_list)
 
+    @staticmethod
+    def clear_cache() -> None:
+        """ Elimina todas las instancias guardadas en la carpeta del cache """
+        if not os.path.isdir(CACHE_DIR):
+            return
+        for file in os.listdir(CACHE_DIR):
+            if file.endswith('.npz') or file.endswith('.npy'):
+                os.remove(os.path.join(CACHE_DIR, file))
+        print(f"{bcolors.OKGREEN}Cache de instancias eliminado {bcolors.ENDC}{os.path.abspath(CACHE_DIR)}")
+
+    def cache_path(self, tsp_file_name: str) -> str:
+        """ Retorna la ruta base en el cache para la instancia, identificada por el hash del contenido del archivo
+            y el tipo de distancia, o None si el archivo no se puede leer
+
+            Parameters
+            ----------
+            tsp_file_name : str
+                ruta al archivo de instancia
+
+            Returns
+            -------
+            str
+                ruta sin extension de la entrada en el cache
+        """
+        if tsp_file_name == None or not os.access(tsp_file_name, os.R_OK):
+            return None
+        with open(tsp_file_name, 'rb') as archivo:
+            content = archivo.read()
+        # tipo de distancia declarado en la cabecera, el cache de tipos no soportados no se usa
+        start = content.find(b"EDGE_WEIGHT_TYPE")
+        if start == -1:
+            return None
+        buf = content[start:content.find(b"\n", start)].split(b":")[-1].strip().decode()
+        if buf not in Distance_type.__members__:
+            return None
+        name = os.path.splitext(os.path.basename(tsp_file_name))[0]
+        return os.path.join(CACHE_DIR, f"{name}-{hashlib.sha256(content).hexdigest()[:24]}-{buf}")
+
+    def load_cache(self, mmap: bool = False, lazy: bool = False) -> dict:
+        """ Carga la instancia desde el cache (nombre, coordenadas, tipo de distancia y listas de candidatos)
+            Si la entrada no existe, es de otra version o esta dañada retorna un diccionario vacio y la instancia se reconstruye
+
+            Parameters
+            ----------
+            mmap : bool
+                mapear la matriz de distancias en modo solo lectura en vez de copiarla en memoria
+            lazy : bool
+                las distancias se calculan bajo demanda, la matriz solo se carga en instancias EXPLICIT
+
+            Returns
+            -------
+            dict
+                arreglos cargados, 'nn_list' y 'distance' si la matriz tambien esta en el cache
+        """
+        try:
+            with np.load(self.cache_file + '.npz') as data:
+                if int(data['version']) != CACHE_VERSION:
+                    return {}
+                entry = {'nn_list': data['nn_list']}
+                self.name = str(data['name'])
+                self.distance_type = Distance_type(str(data['distance_type']))
+                x = data['x']
+                y = data['y']
+            self.n = len(x)
+            self.nodeptr = np.rec.fromarrays((x, y), names='x,y')
+            # En modo lazy no se carga la matriz completa, salvo que la instancia no tenga coordenadas
+            if os.path.exists(self.cache_file + '.npy') and (not lazy or self.distance_type == Distance_type.EXPLICIT):
+                matrix = self.load_matrix(mmap)
+                if matrix is not None:
+                    entry['distance'] = matrix
+            # Las instancias EXPLICIT no se pueden reconstruir sin su matriz
+            if self.distance_type == Distance_type.EXPLICIT and 'distance' not in entry:
+                return {}
+            return entry
+        except Exception:
+            return {}
+
+    def load_matrix(self, mmap: bool) -> np.ndarray:
+        """ Carga la matriz de distancias del cache (triangulo empaquetado en instancias EXPLICIT), None si no corresponde a la instancia """
+        matrix = np.load(self.cache_file + '.npy', mmap_mode='r' if mmap else None)
+        if self.distance_type == Distance_type.EXPLICIT:
+            return PackedDistance(self.n, matrix) if matrix.shape == (self.n * (self.n + 1) // 2,) else None
+        return matrix if matrix.shape == (self.n, self.n) else None
+
+    def save_cache(self, entry: bool, matrix: bool) -> None:
+        """ Guarda la instancia en el cache, los archivos se escriben en un temporal y luego se reemplazan 
+            para que otro proceso nunca lea una entrada incompleta
+
+            Parameters
+            ----------
+            entry : bool
+                guardar coordenadas, tipo de distancia y listas de candidatos (.npz)
+            matrix : bool
+                guardar la matriz de distancias (.npy)
+        """
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            temp = f"{self.cache_file}.{os.getpid()}.tmp"
+            if entry:
+                # Eliminar las entradas de versiones anteriores del mismo archivo de instancia
+                prefix = os.path.basename(self.cache_file).rsplit('-', 2)[0]
+                for file in os.listdir(CACHE_DIR):
+                    if file.rsplit('-', 2)[0] == prefix and not file.startswith(os.path.basename(self.cache_file)):
+                        os.remove(os.path.join(CACHE_DIR, file))
+                with open(temp, 'wb') as archivo:
+                    np.savez(archivo, version=CACHE_VERSION, name=self.name, distance_type=self.distance_type.value,
+                             x=self.nodeptr.x, y=self.nodeptr.y,
+                             nn_list=self.nn_list)
+                os.replace(temp, self.cache_file + '.npz')
+            if matrix:
+                with open(temp, 'wb') as archivo:
+                    np.save(archivo, self.distance.packed if isinstance(self.distance, PackedDistance) else self.distance)
+                os.replace(temp, self.cache_file + '.npy')
+        except OSError as error:
+            print(f"{bcolors.WARNING}Advertencia: No se pudo guardar la instancia en el cache {self.cache_file} ({error}){bcolors.ENDC}")
+
 
     def read_etsp(self, tsp_file_name: str) -> list:
         """ Lectura y parsing de instancia TSPlib (archivo de instancia debe estar en formato TSPLIB)
@@ -79,17 +725,15 @@ class TSPlibReader():
             
             Returns
             -------
-            list
-                lista de coordenas
+            np.recarray
+                arreglo de coordenadas con campos x e y (nodeptr[i].x, nodeptr[i].y)
         """
         buf = ''
-       
-        nodeptr = []
-
-        i = 0
 
         # Encontrado seccion de coordenadas
         found_coord_section = False
+        # Encontrado seccion de distancias explicitas
+        found_weight_section = False
 
         if (tsp_file_name == None):
             if not self.gui:
@@ -128,7 +772,6 @@ class TSPlibReader():
                         return
                 elif(linea.startswith("DIMENSION")):
                     self.n = int(linea[linea.find(":")+2 : len(linea)-1])
-                    nodeptr = [Point] * self.n
                 else:
                     if(linea.startswith("EDGE_WEIGHT_TYPE")):
                         buf = linea[linea.find(":")+2 : len(linea)-1]
@@ -140,6 +783,8 @@ class TSPlibReader():
                             self.distance_type = Distance_type.GEO
                         elif(buf == "ATT"):
                             self.distance_type = Distance_type.ATT
+                        elif(buf == "EXPLICIT"):
+                            self.distance_type = Distance_type.EXPLICIT
                         else:
                             if not self.gui:
                                 print(f"{bcolors.FAIL}EDGE_WEIGHT_TYPE {buf} no implementado en la clase.{bcolors.ENDC}")
@@ -147,18 +792,37 @@ class TSPlibReader():
                             else:
                                 self.error = f'EDGE_WEIGHT_TYPE {buf} no implementado en la clase.'
                                 return
-            else:
-                  
-                city_info = linea.split()
-                nodeptr[i] = Point(float(city_info[1]), float(city_info[2]))
-                i += 1
-                
+                    elif(linea.startswith("EDGE_WEIGHT_FORMAT")):
+                        # Otros formatos (FUNCTION) no tienen EDGE_WEIGHT_SECTION
+                        buf = linea[linea.find(":")+1:].strip()
+                        if buf in Edge_weight_format.__members__:
+                            self.weight_format = Edge_weight_format(buf)
             
             if (linea.startswith("NODE_COORD_SECTION")):
                 found_coord_section = True
+                break
+
+            if (linea.startswith("EDGE_WEIGHT_SECTION")):
+                found_weight_section = True
+                break
 
             linea = archivo.readline()
     
+        if (found_weight_section):
+            if (self.distance_type != Distance_type.EXPLICIT or self.weight_format == None):
+                if not self.gui:
+                    print(f"{bcolors.FAIL}Error: EDGE_WEIGHT_SECTION requiere EDGE_WEIGHT_TYPE EXPLICIT y un EDGE_WEIGHT_FORMAT implementado ({', '.join(Edge_weight_format.__members__)}) !!{bcolors.ENDC}")
+                    exit()
+                else:
+                    self.error = 'EDGE_WEIGHT_SECTION requiere EDGE_WEIGHT_TYPE EXPLICIT y un EDGE_WEIGHT_FORMAT implementado !!'
+                    return
+            # Las distancias se leen directamente al triangulo empaquetado
+            self.distance = self.read_edge_weights(archivo)
+            archivo.close()
+            # Sin coordenadas, para la visualizacion los nodos se ubican en un circulo
+            angle = np.linspace(0.0, 2.0 * math.pi, self.n, endpoint=False)
+            return np.rec.fromarrays((np.cos(angle), np.sin(angle)), names='x,y')
+
         if (found_coord_section == False):
             if not self.gui:
                 print("Error: Ocurrio al buscar el inicio de las coordenadas !!")
@@ -167,9 +831,97 @@ class TSPlibReader():
                 self.error = 'Ocurrio al buscar el inicio de las coordenadas !!'
                 return
 
+        # Leer la seccion de coordenadas completa (hasta EOF) y convertirla en un solo paso a una matriz (n, 3): indice, x, y
+        seccion = archivo.read()
         archivo.close()
-        
-        return nodeptr
+        fin = seccion.find("EOF")
+        if (fin != -1):
+            seccion = seccion[:fin]
+        coords = np.array(seccion.split(), dtype=np.float64).reshape(-1, 3)
+        if (len(coords) != self.n):
+            raise ValueError(f"DIMENSION {self.n} no coincide con las {len(coords)} coordenadas")
+
+        return np.rec.fromarrays((coords[:, 1], coords[:, 2]), names='x,y')
+
+    def read_edge_weights(self, archivo) -> PackedDistance:
+        """ Lee la seccion EDGE_WEIGHT_SECTION por bloques de texto y guarda cada fila de la matriz directamente en el
+            triangulo inferior empaquetado, sin construir la matriz completa. En FULL_MATRIX se utiliza el triangulo inferior
+
+            Parameters
+            ----------
+            archivo : TextIO
+                archivo de instancia posicionado al inicio de la seccion
+
+            Returns
+            -------
+            PackedDistance
+                matriz de distancias simetrica empaquetada
+        """
+        n = self.n
+        fmt = self.weight_format
+        full = fmt == Edge_weight_format.FULL_MATRIX
+        # Las filas del triangulo superior equivalen a las columnas del inferior y viceversa
+        upper = fmt in (Edge_weight_format.UPPER_ROW, Edge_weight_format.UPPER_DIAG_ROW, Edge_weight_format.LOWER_COL, Edge_weight_format.LOWER_DIAG_COL)
+        diagonal = fmt in (Edge_weight_format.UPPER_DIAG_ROW, Edge_weight_format.LOWER_DIAG_ROW, Edge_weight_format.UPPER_DIAG_COL, Edge_weight_format.LOWER_DIAG_COL)
+        # Cantidad total de valores en la seccion
+        if full:
+            remaining = n * n
+        else:
+            remaining = n * (n + 1) // 2 if diagonal else n * (n - 1) // 2
+
+        packed = np.zeros(n * (n + 1) // 2, dtype=np.int32)
+        pending = np.empty(0, dtype=np.int64) # valores leidos que aun no se asignan a una fila
+        max_distance = 0
+        lower_sum = upper_sum = 0 # para revisar la simetria de FULL_MATRIX
+
+        for r in range(n):
+            # Rango [lo, hi) de columnas de la fila r que aparecen en el archivo
+            if full:
+                lo, hi = 0, n
+            elif upper:
+                lo, hi = (r if diagonal else r + 1), n
+            else:
+                lo, hi = 0, (r + 1 if diagonal else r)
+
+            while len(pending) < hi - lo:
+                chunk = archivo.read(READ_CHUNK)
+                if not chunk:
+                    raise ValueError(f"EDGE_WEIGHT_SECTION incompleta, faltan {remaining} valores")
+                # completar el ultimo numero si el bloque lo corto
+                if not chunk[-1].isspace():
+                    chunk += archivo.readline()
+                # solo se convierten los valores de la seccion, lo que sigue (EOF, DISPLAY_DATA_SECTION) se ignora
+                tokens = chunk.split()[:remaining - len(pending)]
+                values = np.array(tokens, dtype=np.float64)
+                if not np.array_equal(values, np.trunc(values)):
+                    raise ValueError("EDGE_WEIGHT_SECTION contiene distancias no enteras")
+                pending = np.concatenate((pending, values.astype(np.int64)))
+
+            row, pending = pending[:hi - lo], pending[hi - lo:]
+            remaining -= hi - lo
+            if len(row):
+                max_distance = max(max_distance, int(row.max()))
+            # Si las distancias no caben en int32 se amplia el arreglo
+            if compact_dtype(max_distance) == np.int64 and packed.dtype != np.int64:
+                packed = packed.astype(np.int64)
+
+            if full:
+                lower_sum += int(row[:r].sum())
+                upper_sum += int(row[r + 1:].sum())
+                row = row[:r + 1]
+                lo, hi = 0, r + 1
+            if upper:
+                # d(r, s) con s >= r esta en la fila s del triangulo inferior
+                s = np.arange(lo, hi, dtype=np.int64)
+                packed[s * (s + 1) // 2 + r] = row
+            else:
+                start = r * (r + 1) // 2
+                packed[start + lo : start + hi] = row
+
+        if (lower_sum != upper_sum):
+            print(f"{bcolors.WARNING}Advertencia: FULL_MATRIX no es simetrica, se utiliza el triangulo inferior{bcolors.ENDC}")
+
+        return PackedDistance(n, packed.astype(compact_dtype(max_distance), copy=False))
 
     def round_distance(self, i, j) -> int:
         """ Computa la distancia Euclidiana (redondea al siguiente entero) entre dos nodos.
@@ -185,8 +937,9 @@ class TSPlibReader():
             int
                 distancia entre dos nodos
         """      
-        diferencia_x = self.nodeptr[i].x - self.nodeptr[j].x
-        diferencia_y = self.nodeptr[i].y - self.nodeptr[j].y
+        xs, ys = self.point_lists()
+        diferencia_x = xs[i] - xs[j]
+        diferencia_y = ys[i] - ys[j]
         distancia = math.sqrt(pow(diferencia_x,2) + pow(diferencia_y,2)) 
         return round(distancia)
 
@@ -205,8 +958,9 @@ class TSPlibReader():
             int
                 distancia entre dos nodos
         """
-        diferencia_x = self.nodeptr[i].x - self.nodeptr[j].x
-        diferencia_y = self.nodeptr[i].y - self.nodeptr[j].y
+        xs, ys = self.point_lists()
+        diferencia_x = xs[i] - xs[j]
+        diferencia_y = ys[i] - ys[j]
         distancia = round(math.sqrt(pow(diferencia_x,2) + pow(diferencia_y,2)),2)
         return math.ceil(distancia)
 
@@ -224,39 +978,21 @@ class TSPlibReader():
             int
                 distancia entre dos nodos
         """
-        deg = float
-        min = float
-        lati = float
-        latj = float
-        longi = float
-        longj = float
-        q1 = float
-        q2 = float
-        q3 = float
-        dd = int
-        x1 = self.nodeptr[i].x
-        x2 = self.nodeptr[j].x
-        y1 = self.nodeptr[i].y
-        y2 = self.nodeptr[j].y
-        RRR = 6378.388
-
-        deg = utilities.dtrunc(x1)
-        min = float(Decimal(f"{x1}") - Decimal(f"{deg}"))
-        lati = math.pi * (deg + 5.0 * min / 3.0) / 180.0
-        deg = utilities.dtrunc(x2)
-        min = float(Decimal(f"{x2}") - Decimal(f"{deg}"))
-        latj = math.pi * (deg + 5.0 * min / 3.0) / 180.0
-
-        deg = utilities.dtrunc(y1)
-        min = float(Decimal(f"{y1}") - Decimal(f"{deg}"))
-        longi = math.pi * (deg + 5.0 * min / 3.0) / 180.0
-        deg = utilities.dtrunc(y2)
-        min = float(Decimal(f"{y2}") - Decimal(f"{deg}"))
-        longj = math.pi * (deg + 5.0 * min / 3.0) / 180.0
-
-        q1 = math.cos(float(Decimal(f"{longi}") - Decimal(f"{longj}")))
-        q2 = math.cos(float(Decimal(f"{lati}") - Decimal(f"{latj}")))
-        q3 = math.cos(float(Decimal(f"{lati}") + Decimal(f"{latj}")))
+        xs, ys = self.point_lists()
+        x1 = xs[i]
+        x2 = xs[j]
+        y1 = ys[i]
+        y2 = ys[j]
+
+        lati = geo_radians(x1)
+        latj = geo_radians(x2)
+        longi = geo_radians(y1)
+        longj = geo_radians(y2)
+
+        # diferencias y suma sobre los valores decimales de los radianes, igual que la definicion original con Decimal
+        q1 = math.cos(decimal_float(decimal_sub(decimal_parts(longi), decimal_parts(longj))))
+        q2 = math.cos(decimal_float(decimal_sub(decimal_parts(lati), decimal_parts(latj))))
+        q3 = math.cos(decimal_float(decimal_add(decimal_parts(lati), decimal_parts(latj))))
         dd = int(RRR * math.acos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3))+ 1.0)
         return dd
 
@@ -274,9 +1010,11 @@ class TSPlibReader():
             int
                 distancia entre dos nodos
         """
-        diferencia_x = Decimal(f"{self.nodeptr[i].x}") - Decimal(f"{self.nodeptr[j].x}")
-        diferencia_y = Decimal(f"{self.nodeptr[i].y}") - Decimal(f"{self.nodeptr[j].y}")
-        rij = math.sqrt(float(pow(diferencia_x,2) + pow(diferencia_y,2)) / 10.0)
+        xs, ys = self.point_lists()
+        diferencia_x = decimal_sub(decimal_parts(xs[i]), decimal_parts(xs[j]))
+        diferencia_y = decimal_sub(decimal_parts(ys[i]), decimal_parts(ys[j]))
+        suma = decimal_add(decimal_mul(diferencia_x, diferencia_x), decimal_mul(diferencia_y, diferencia_y))
+        rij = math.sqrt(decimal_float(suma) / 10.0)
         tij = utilities.dtrunc(rij)
 
         if (tij < rij):
@@ -285,54 +1023,319 @@ class TSPlibReader():
             dij = int(tij)
         return dij
 
-    def compute_distances(self):
-        """ Computa y guarda las distancias entre los nodos generando una lista de listas (matriz)
-            y la guarda en la variable distance """
-            
-        matrix = []
-        
-        for i in range(self.n):
-
-            matrix.append([])
-
-            for j in range(self.n):
-
-                if (self.distance_type == Distance_type.EUC_2D):
-                    matrix[i].append(self.round_distance(i,j))
-                elif (self.distance_type == Distance_type.CEIL_2D):
-                    matrix[i].append(self.ceil_distance(i,j))
-                elif (self.distance_type == Distance_type.GEO):
-                    matrix[i].append(self.geo_distance(i,j))
-                elif (self.distance_type == Distance_type.ATT):
-                    matrix[i].append(self.att_distance(i,j))
-
-        self.distance = matrix     
-
-    def compute_nn_lists(self):
-        """ Computa y guarda la lista de vecinos mas cercanos a cada nodo y genera una lista de listas (matriz) 
-            que se guarda en la variable nn_list """
-
-        distance_value = 0 # valor de distancia
-        distances = [Distance] * self.n # lista para las distancias del vecindario 
-        nn = self.n - 1 
-        m_nnear = [] # matriz del vecindario
-
-        for node in range(self.n): # Recorrer los nodos
-
-            for i in range(self.n): # Preparar distancias de la seccion
-                
-                distance_value = self.distance[node][i] # se guardan los valores de distancia
-                distances[i] = Distance(distance_value, i) # 
-                
-            #print(distance_values, [distance.distance for distance in distances])
-            distances[node].distance = sys.maxsize # Ciudad no es el vecino mas cercano y se le da un valor altisimo
-            
-            distances.sort(key=lambda dist: dist.distance) # ordenar de menor a mayor
-            #print(distance_values, [distance.distance for distance in distances])
+    def point_lists(self) -> tuple:
+        """ Retorna las coordenadas x e y como listas de floats de python para las distancias por par,
+            se generan una vez por instancia ya que acceder a un registro de nodeptr es lento """
+        if self.points is None or len(self.points[0]) != len(self.nodeptr):
+            self.points = (self.nodeptr.x.tolist(), self.nodeptr.y.tolist())
+        return self.points
+
+    def distance_between(self, i: int, j: int) -> int:
+        """ Computa la distancia entre dos nodos segun el tipo de distancia de la instancia """
+        if (self.distance_type == Distance_type.EUC_2D):
+            return self.round_distance(i,j)
+        elif (self.distance_type == Distance_type.CEIL_2D):
+            return self.ceil_distance(i,j)
+        elif (self.distance_type == Distance_type.GEO):
+            return self.geo_distance(i,j)
+        elif (self.distance_type == Distance_type.ATT):
+            return self.att_distance(i,j)
+        elif (self.distance_type == Distance_type.EXPLICIT):
+            return self.distance[i, j]
+
+    def hilbert_order(self) -> np.ndarray:
+        """ Retorna los nodos ordenados segun su posicion en la curva de Hilbert, None en instancias EXPLICIT sin coordenadas """
+        if (self.distance_type == Distance_type.EXPLICIT):
+            return None
+        x = np.asarray(self.nodeptr.x, dtype=np.float64)
+        y = np.asarray(self.nodeptr.y, dtype=np.float64)
+        return np.argsort(hilbert_index(x, y), kind='stable')
+
+    def unvisited_index(self) -> 'UnvisitedGrid | UnvisitedScan':
+        """ Retorna un indice de nodos no visitados para construir tours, una grilla para coordenadas planas
+            o una busqueda sobre las filas de distancias para distancias geograficas y explicitas """
+        if (self.distance_type == Distance_type.GEO or self.distance_type == Distance_type.EXPLICIT):
+            return UnvisitedScan(self)
+        return UnvisitedGrid(self)
+
+    def kernel_coords(self) -> tuple:
+        """ Retorna las coordenadas como arreglos numpy preparados para el kernel vectorizado del tipo de distancia """
+        x = np.ascontiguousarray(self.nodeptr.x, dtype=np.float64)
+        y = np.ascontiguousarray(self.nodeptr.y, dtype=np.float64)
+        if (self.distance_type == Distance_type.GEO):
+            # latitudes y longitudes en radianes se calculan una sola vez por nodo
+            x = np.array([geo_radians(val) for val in x], dtype=np.float64)
+            y = np.array([geo_radians(val) for val in y], dtype=np.float64)
+        return x, y
+
+    def compute_distance_rows(self, start: int, end: int, coords: tuple = None) -> np.ndarray:
+        """ Computa de forma vectorizada las distancias desde los nodos [start, end) hacia todos los nodos.
+            Los valores cercanos a un limite de redondeo se recalculan por par para obtener resultados identicos a TSPLIB
+
+            Parameters
+            ----------
+            start, end : int
+                rango de filas de la matriz a calcular
+            coords : tuple, optional
+                coordenadas preparadas con kernel_coords, si no se entregan se calculan
+
+            Returns
+            -------
+            np.ndarray
+                bloque de la matriz de distancias de tamaño (end - start, n)
+        """
+        if coords is None:
+            coords = self.kernel_coords()
+        x, y = coords
+        block, ambiguous = KERNELS[self.distance_type](x[start:end, None], y[start:end, None], x[None, :], y[None, :])
+        block = block.astype(np.int64)
+        for i, j in zip(*np.nonzero(ambiguous)):
+            block[i, j] = self.distance_between(start + int(i), int(j))
+        return block
+
+    def compute_distance_pairs(self, a: np.ndarray, b: np.ndarray, coords: tuple = None) -> np.ndarray:
+        """ Computa de forma vectorizada las distancias entre los pares de nodos (a[k], b[k])
+
+            Parameters
+            ----------
+            a, b : np.ndarray
+                arreglos de indices de nodos del mismo tamaño
+            coords : tuple, optional
+                coordenadas preparadas con kernel_coords, si no se entregan se calculan
+
+            Returns
+            -------
+            np.ndarray
+                distancia para cada par de nodos
+        """
+        if coords is None:
+            coords = self.kernel_coords()
+        x, y = coords
+        values, ambiguous = KERNELS[self.distance_type](x[a], y[a], x[b], y[b])
+        values = values.astype(np.int64)
+        for k in np.nonzero(ambiguous)[0]:
+            values[k] = self.distance_between(int(a[k]), int(b[k]))
+        return values
+
+    def compute_distances(self, pool: 'multiprocessing.pool.Pool' = None, shared: tuple = None):
+        """ Computa y guarda las distancias entre los nodos en una matriz numpy contigua y la guarda en la variable distance,
+            el calculo se realiza vectorizado por bloques de filas y se utiliza el tipo entero mas pequeño que contenga las distancias.
+            Con un pool de procesos los bloques se reparten entre los procesos que escriben en la matriz compartida shared """
+
+        if pool is not None:
+            self.distance = self.compute_distances_parallel(pool, shared)
+            return
+
+        matrix = np.empty((self.n, self.n), dtype=np.int32)
+        coords = self.kernel_coords()
+        rows = max(1, BLOCK_ELEMENTS // max(self.n, 1)) # filas por bloque
+        max_distance = 0
+
+        for start in range(0, self.n, rows):
+            end = min(start + rows, self.n)
+            block = self.compute_distance_rows(start, end, coords)
+            max_distance = max(max_distance, int(block.max()))
+            # Si las distancias no caben en int32 se amplia la matriz
+            if compact_dtype(max_distance) == np.int64 and matrix.dtype != np.int64:
+                matrix = matrix.astype(np.int64)
+            matrix[start:end] = block
+
+        self.distance = matrix.astype(compact_dtype(max_distance), copy=False)
+
+    def compute_distances_parallel(self, pool: 'multiprocessing.pool.Pool', shared: tuple) -> np.ndarray:
+        """ Computa la matriz de distancias repartiendo bloques de filas entre los procesos del pool,
+            cada proceso escribe su bloque directamente en la matriz compartida y retorna la distancia maxima del bloque """
+        buffer, dtype = shared
+        rows = max(1, min(BLOCK_ELEMENTS // self.n, math.ceil(self.n / (PARALLEL_BLOCKS * self.workers))))
+        blocks = [(start, min(start + rows, self.n)) for start in range(0, self.n, rows)]
+        max_distance = max(pool.map(distance_block_task, blocks))
+
+        matrix = np.frombuffer(buffer, dtype=dtype).reshape(self.n, self.n)
+        return matrix.astype(compact_dtype(max_distance), copy=False)
+
+    def distance_bound(self) -> int:
+        """ Cota superior de las distancias de la instancia, define el tipo entero de la matriz compartida antes de calcularla """
+        if (self.distance_type == Distance_type.GEO):
+            return int(RRR * math.pi + 1.0) + 1
+        x, y = self.nodeptr.x, self.nodeptr.y
+        diagonal = math.hypot(float(x.max() - x.min()), float(y.max() - y.min()))
+        if (self.distance_type == Distance_type.ATT):
+            diagonal /= math.sqrt(10.0)
+        return int(math.ceil(diagonal)) + 2
+
+    def create_pool(self, workers: int, matrix: bool) -> tuple:
+        """ Crea el pool de procesos para el preprocesamiento en paralelo, cada proceso recibe una copia liviana de la instancia
+
+            Parameters
+            ----------
+            workers : int
+                cantidad de procesos
+            matrix : bool
+                crear la matriz compartida donde los procesos escriben las distancias
+
+            Returns
+            -------
+            tuple
+                (pool, shared) donde shared es (buffer, dtype) de la matriz compartida o None
+        """
+        self.workers = workers
+        shared = None
+        if matrix:
+            dtype = np.dtype(compact_dtype(self.distance_bound()))
+            shared = (multiprocessing.RawArray('b', self.n * self.n * dtype.itemsize), dtype)
+        light = TSPlibReader.__new__(TSPlibReader)
+        light.n, light.name, light.distance_type, light.nodeptr = self.n, self.name, self.distance_type, self.nodeptr
+        pool = multiprocessing.Pool(workers, initializer=init_worker, initargs=(light, shared))
+        return pool, shared
+
+    def compute_nn_lists(self, k: int = NN_SIZE, pool: 'multiprocessing.pool.Pool' = None):
+        """ Computa y guarda las listas de candidatos con los k vecinos mas cercanos a cada nodo en la variable nn_list (matriz n x k),
+            ordenados por distancia y en caso de empate por indice. Para coordenadas planas se utiliza una grilla de buckets,
+            para distancias geograficas y explicitas se seleccionan desde las filas de distancias.
+            Con un pool de procesos los bloques de nodos se reparten entre los procesos """
+
+        k = max(0, min(k, self.n - 1))
+        if (k == 0):
+            self.nn_list = np.empty((self.n, 0), dtype=np.int32)
+        elif (self.distance_type == Distance_type.GEO or self.distance_type == Distance_type.EXPLICIT):
+            self.nn_list = self.nn_lists_from_rows(k, pool)
+        else:
+            self.nn_list = self.nn_lists_from_grid(k, pool)
+
+    def nn_lists_from_rows(self, k: int, pool: 'multiprocessing.pool.Pool' = None) -> np.ndarray:
+        """ Selecciona los k vecinos mas cercanos de cada nodo desde las filas de distancias por bloques, O(n^2) tiempo y O(nk) memoria """
+        lists = np.empty((self.n, k), dtype=np.int32)
+        rows = max(1, BLOCK_ELEMENTS // self.n)
+
+        if pool is not None:
+            rows = max(1, min(rows, math.ceil(self.n / (PARALLEL_BLOCKS * self.workers))))
+            blocks = [(start, min(start + rows, self.n), k) for start in range(0, self.n, rows)]
+            for start, block_lists in pool.imap_unordered(nn_rows_task, blocks):
+                lists[start:start + len(block_lists)] = block_lists
+            return lists
+
+        # la matriz completa o empaquetada entrega bloques de filas, en modo lazy se calculan
+        dense = not isinstance(self.distance, LazyDistance)
+        coords = None if dense else self.kernel_coords()
+
+        for start in range(0, self.n, rows):
+            end = min(start + rows, self.n)
+            block = self.distance[start:end] if dense else self.compute_distance_rows(start, end, coords)
+            lists[start:end] = self.nn_rows_block(block, start, k)
+
+        return lists
+
+    def nn_rows_block(self, block: np.ndarray, start: int, k: int) -> np.ndarray:
+        """ Retorna los k vecinos mas cercanos de los nodos [start, start + len(block)) desde su bloque de filas de distancias """
+        end = start + len(block)
+        # clave unica: distancia y luego indice, la ciudad no es su propio vecino
+        keys = block.astype(np.int64) * self.n + np.arange(self.n)
+        keys[np.arange(end - start), np.arange(start, end)] = np.iinfo(np.int64).max
+        part = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(keys, part, axis=1), axis=1)
+        return np.take_along_axis(part, order, axis=1)
+
+    def nn_lists_from_grid(self, k: int, pool: 'multiprocessing.pool.Pool' = None) -> np.ndarray:
+        """ Busca los k vecinos mas cercanos de cada nodo con una grilla de buckets, ampliando el radio de busqueda
+            hasta que ningun nodo fuera del radio pueda estar a menor o igual distancia que el k-esimo vecino """
+        lists = np.empty((self.n, k), dtype=np.int32)
+        coords = self.kernel_coords()
+        grid = NeighbourGrid(coords[0], coords[1])
+        pending = np.arange(self.n)
+        r = int(math.ceil(math.sqrt(k / (2.0 * math.pi)))) + 1
+
+        while pending.size:
+            chunk_size = max(1, GRID_CELLS // (2 * r + 1) ** 2)
+            if pool is not None:
+                chunk_size = max(1, min(chunk_size, math.ceil(pending.size / (PARALLEL_BLOCKS * self.workers))))
+            chunks = np.array_split(pending, math.ceil(pending.size / chunk_size))
+
+            if pool is not None:
+                results = pool.map(nn_grid_task, [(chunk, r, k) for chunk in chunks])
+            else:
+                results = [self.nn_grid_chunk(grid, coords, chunk, r, k) for chunk in chunks]
+
+            failed = []
+            for chunk, (found, found_lists) in zip(chunks, results):
+                lists[chunk[found]] = found_lists
+                failed.append(chunk[~found])
+
+            pending = np.concatenate(failed)
+            r += max(1, r // 2)
+
+        return lists
+
+    def nn_grid_chunk(self, grid: NeighbourGrid, coords: tuple, chunk: np.ndarray, r: int, k: int) -> tuple:
+        """ Busca los k vecinos mas cercanos de los nodos de chunk entre los nodos a r celdas o menos en la grilla
+
+            Returns
+            -------
+            tuple
+                (found, lists) mascara de los nodos de chunk cuyos vecinos quedaron determinados y sus listas
+        """
+        # la distancia ATT es la distancia euclidiana dividida por raiz de 10
+        scale = math.sqrt(10.0) if self.distance_type == Distance_type.ATT else 1.0
+        # cota inferior de la distancia entera de los nodos fuera del radio de busqueda
+        bound = math.floor(r * grid.size / scale) - 1
+
+        owner, candidate = grid.candidates(chunk, r)
+        keep = candidate != chunk[owner]
+        owner, candidate = owner[keep], candidate[keep]
+        dist = self.compute_distance_pairs(chunk[owner], candidate, coords)
+        # ordenar por nodo, distancia e indice del candidato con una sola clave entera cuando no hay desborde
+        key = dist * self.n + candidate
+        span = int(key.max(initial=0)) + 1
+        if len(chunk) * span < 2**62:
+            order = np.argsort(owner * span + key)
+        else:
+            order = np.lexsort((key, owner))
+        owner, candidate, dist = owner[order], candidate[order], dist[order]
+
+        total = np.bincount(owner, minlength=len(chunk))
+        first = np.cumsum(total) - total
+        found = total >= k
+        if not grid.covers(r):
+            kth = np.full(len(chunk), np.iinfo(np.int64).max)
+            kth[found] = dist[first[found] + k - 1]
+            found &= kth < bound
+
+        rank = np.arange(len(owner)) - first[owner]
+        return found, candidate[(rank < k) & found[owner]].reshape(-1, k)
+
+
+# Estado de cada proceso del pool de preprocesamiento: instancia liviana, coordenadas, grilla y matriz compartida
+WORKER = {}
+
+def init_worker(reader: TSPlibReader, shared: tuple) -> None:
+    """ Inicializa un proceso del pool de preprocesamiento con la instancia y la matriz compartida """
+    WORKER['reader'] = reader
+    WORKER['coords'] = reader.kernel_coords()
+    WORKER['grid'] = None
+    WORKER['matrix'] = None
+    if shared is not None:
+        buffer, dtype = shared
+        WORKER['matrix'] = np.frombuffer(buffer, dtype=dtype).reshape(reader.n, reader.n)
+
+def distance_block_task(block: tuple) -> int:
+    """ Calcula las filas [start, end) de la matriz en la matriz compartida y retorna su distancia maxima """
+    start, end = block
+    rows = WORKER['reader'].compute_distance_rows(start, end, WORKER['coords'])
+    WORKER['matrix'][start:end] = rows
+    return int(rows.max())
 
-            # Crear seccion del vecindario con las posiciones de los vecinos
-            m_nnear.append([])
-            for i in range(nn): 
-                m_nnear[node].append(distances[i].position)
+def nn_rows_task(block: tuple) -> tuple:
+    """ Selecciona los vecinos de los nodos [start, end) desde la matriz compartida o calculando sus filas """
+    start, end, k = block
+    reader = WORKER['reader']
+    if WORKER['matrix'] is not None:
+        rows = WORKER['matrix'][start:end]
+    else:
+        rows = reader.compute_distance_rows(start, end, WORKER['coords'])
+    return start, reader.nn_rows_block(rows, start, k)
 
-        self.nn_list = m_nnear
\ No newline at end of file
+def nn_grid_task(task: tuple) -> tuple:
+    """ Busca los vecinos de un bloque de nodos en la grilla, la grilla se construye una vez por proceso """
+    chunk, r, k = task
+    if WORKER['grid'] is None:
+        WORKER['grid'] = NeighbourGrid(WORKER['coords'][0], WORKER['coords'][1])
+    return WORKER['reader'].nn_grid_chunk(WORKER['grid'], WORKER['coords'], chunk, r, k)
@@ -857,7 +857,7 @@ class Gui():
         # asignar modo gui a la lectura de instancias para gestionar los errores
         TSPlibReader.gui = self.options.gui
         # leer e interpretar el problema TSP leido desde la instancia definida
-        problem = Tsp(filename=options.instance)
+        problem = Tsp(filename=options.instance, options=options)
         
         # si hubo algun error al leer la instancia e interpretarla
         if problem.error:
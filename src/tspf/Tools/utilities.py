@@ -84,6 +84,16 @@ def dtrunc (x: float) -> float:
 
 
 
+def format_bytes(size: int) -> str:
+    """ Retorna una cantidad de bytes como texto legible (B, KB, MB o GB) """
+    for unit in ['B', 'KB', 'MB']:
+        if size < 1024:
+            return f"{size:.2f} {unit}"
+        size /= 1024
+    return f"{size:.2f} GB"
+
+
+
 def printSolToFile(outputFile: str, tour: list) -> None:
     """ Guardar la solución para una instacia y ejecución en un archivo recibido por parámetro """
     if not outputFile or not tour:
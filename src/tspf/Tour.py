@@ -3,7 +3,7 @@ Modulo que contiene la clase la cual represente un recorrido para una solución
 
 """
 
-from . import Tsp, InitialSolution, TSPMove
+from . import Tsp, InitialSolution, TSPMove, chain, islice
 from .Tools import utilities, bcolors
 
 class Tour():
@@ -19,6 +19,11 @@ class Tour():
             Tipo de solución inicial
         tour : Tour
             Otra instancia de la misma clase
+        cost : int, optional
+            Costo ya conocido del recorrido current (por ejemplo calculado en lote con Tsp.evaluate_many), evita recalcularlo
+        trusted : bool, optional
+            El recorrido current fue generado por los operadores del framework y no se valida (salvo en modo estricto),
+            los recorridos generados por el problema y las copias de otro tour siempre son confiables
 
         Atributes
         ---------
@@ -28,6 +33,8 @@ class Tour():
             Recorrido actual para un tour el cual es una lista con los puntos a recorrer secuencialmente
         cost : int
             El costo o resultado de la funcion objetivo para un recorrido
+        position : list
+            Indice de cada nodo en el recorrido actual (nodo -> indice), se actualiza con los movimientos
         tour : Tour
             Otra instancia de la misma clase
 
@@ -45,6 +52,8 @@ class Tour():
 
         self.cost = 0 # costo solución actual
 
+        self.position = [] # indice de cada nodo en la solucion actual
+
         # Si trae el problema TSP
         if ('problem' in kwargs):
             self.problem = kwargs['problem']
@@ -57,6 +66,16 @@ class Tour():
                 self.current = self.problem.greedy_nearest_n(-1)
             elif (kwargs['type_initial_sol'] == InitialSolution.DETERMINISTIC):
                 self.current = self.problem.deterministic_tour()
+            elif (kwargs['type_initial_sol'] == InitialSolution.GREEDY_EDGE):
+                self.current = self.problem.greedy_edge()
+            elif (kwargs['type_initial_sol'] == InitialSolution.SPACE_FILLING_CURVE):
+                self.current = self.problem.space_filling_curve_tour()
+            elif (kwargs['type_initial_sol'] == InitialSolution.NEAREST_INSERTION):
+                self.current = self.problem.nearest_insertion()
+            elif (kwargs['type_initial_sol'] == InitialSolution.FARTHEST_INSERTION):
+                self.current = self.problem.farthest_insertion()
+            elif (kwargs['type_initial_sol'] == InitialSolution.CHEAPEST_INSERTION):
+                self.current = self.problem.cheapest_insertion()
             else:
                 self.current = self.problem.random_tour()
         
@@ -64,8 +83,9 @@ class Tour():
         if ('tour' in kwargs):
             # actualizar problema
             self.problem = kwargs['tour'].problem
-            # copiar solución actual
+            # copiar solución actual y sus posiciones
             self.current = kwargs['tour'].current.copy()
+            self.position = kwargs['tour'].position.copy()
             # actualizar costo
             self.cost = kwargs['tour'].cost
 
@@ -73,18 +93,47 @@ class Tour():
         if ('current' in kwargs):
             self.current = kwargs['current'].copy()
 
-        if (not self.problem.tsp_check_tour(self.current)):
-            print(f"{bcolors.FAIL}Error: Error al inicializar la solución inicial {bcolors.ENDC}")
+        # Posiciones de los nodos, salvo que se hayan copiado desde otro tour
+        if ('tour' not in kwargs or 'current' in kwargs):
+            self.updatePosition()
+
+        # Solo se valida el recorrido si viene desde fuera o en modo estricto
+        trusted = kwargs.get('trusted', 'current' not in kwargs)
+        if (self.problem.strict or not trusted):
+            if (not self.problem.tsp_check_tour(self.current)):
+                print(f"{bcolors.FAIL}Error: Error al inicializar la solución inicial {bcolors.ENDC}")
+                exit()
+
+        # Determinar costo de la solución inicial, salvo que ya venga calculado o copiado
+        known = 'cost' in kwargs or ('tour' in kwargs and 'current' not in kwargs)
+        if ('cost' in kwargs):
+            self.cost = int(kwargs['cost'])
+        elif (not known):
+            self.cost = self.problem.compute_tour_length(self.current)
+
+        # En modo estricto se verifica el costo recibido o copiado
+        if (self.problem.strict and known and self.cost != self.problem.compute_tour_length(self.current)):
+            print(f"{bcolors.FAIL}Error: El costo {self.cost} no corresponde al recorrido ({self.problem.compute_tour_length(self.current)}) {bcolors.ENDC}")
             exit()
 
-        # Determinar costo de la solución inicial
-        self.cost = self.problem.compute_tour_length(self.current)
-
     def copy(self, tour: 'Tour') -> None:
         """ Copia una solución de otra instancia del objeto recibida por parametro actualizando la solución actual """
         self.current = tour.current.copy()
+        self.position = tour.position.copy()
         self.cost = tour.cost
 
+    def updatePosition(self, start: int = 0, end: int = None) -> None:
+        """ Actualiza el indice de los nodos del recorrido entre los indices [start, end), por defecto todo el recorrido """
+        n = len(self.current) - 1 # el ultimo elemento repite el inicio
+        if (len(self.position) != n):
+            self.position = [0] * max(n, 0)
+            start, end = 0, n
+        elif (end is None or end > n):
+            end = n
+        position, current = self.position, self.current
+        for i in range(start, end):
+            position[current[i]] = i
+
     def printSol(self, final: bool = False) -> None:
         """ Escribir solución y costo """
         self.problem.print_solution_and_cost(self.current, final)
@@ -163,15 +212,17 @@ class Tour():
         if (n1 >= self.problem.getSize() or n2 >= self.problem.getSize()): return
         if (n1 < 0 or n2 < 0): return
 
-        tour = self.current.copy()
+        # Actualizar costo antes de modificar el tour
+        self.cost = self.delta_cost_swap(self.current, self.cost, n1, n2)
 
-        # Aplicar SWAP
+        # Aplicar SWAP en el mismo tour
+        tour = self.current
         tour[n1], tour[n2] = tour[n2], tour[n1]
         # Igualar inicio y final
         tour[len(tour)-1] = tour[0]
-        # Actualizar costo y tour
-        self.cost = self.delta_cost_swap(self.current, self.cost, n1, n2)
-        self.current = tour.copy()
+        # Actualizar posiciones
+        self.position[tour[n1]] = n1
+        self.position[tour[n2]] = n2
 
 
     """ 2 - O P T """
@@ -217,7 +268,8 @@ class Tour():
         return cost
     
     def twoOptSwap(self, n1: int, n2: int) -> None:
-        """ Aplica el movimiento 2-opt entre dos nodos modificando la solución actual y su costo """
+        """ Aplica el movimiento 2-opt entre dos nodos modificando la solución actual y su costo, invierte en el mismo tour
+            el lado mas corto del ciclo intercambiando nodos con dos indices (modulo n) y actualizando sus posiciones """
         # Si es el mismo nodo, no hay swap
         if (n1 == n2): return
         # Indice fuera de los limites
@@ -227,30 +279,202 @@ class Tour():
         # Identificar el indice menor y el mayor
         s = min(n1, n2)
         e = max(n1, n2)
-        new_tour = [] # Tour nuevo
-        section = [] # seccion a aplicar 2-opt
+        n = self.problem.getSize()
+        current, position = self.current, self.position
+
+        # Actualizar costo antes de modificar el tour
+        self.cost = self.delta_cost_two_opt(current, self.cost, s, e)
+
+        # Ambos lados dan el mismo recorrido: la seccion [s,e] o la complementaria [e+1,n) + [0,s) que da la vuelta
+        length = e - s + 1
+        if (length <= n - length):
+            pairs = zip(range(s, s + length // 2), range(e, e - length // 2, -1))
+        else:
+            length = n - length
+            pairs = islice(zip(chain(range(e + 1, n), range(s)), chain(range(s - 1, -1, -1), range(n - 1, e, -1))), length // 2)
+        for i, j in pairs:
+            x, y = current[j], current[i]
+            current[i] = x
+            current[j] = y
+            position[x] = i
+            position[y] = j
+
+        # Igualar inicio y final
+        current[n] = current[0]
 
-        # Agregar la primera parte del tour no modificado por 2-opt
-        new_tour = self.current[:s]
 
-        # Extraer e invertir la seccion del tour entre [s,e] 
-        section = self.current[s:e+1] # extraer
-        section.reverse() # invertir
-        new_tour.extend(section) # unir al nuevo tour
+    """ O R - O P T """
 
-        # Agregar la parte final del tour no modificado por 2-opt 
-        new_tour.extend(self.current[e+1:])
+    def delta_cost_or_opt(self, tour: list, cost: int, i: int, length: int, p: int, reverse: bool = False) -> int:
+        """ Recalcula en O(1) el costo de un tour al mover el segmento de nodos [i, i+length) entre las posiciones p y p+1,
+            los indices se toman modulo n por lo que el segmento y la insercion pueden pasar por el final del tour
+
+            Parameters
+            ----------
+            tour : list
+                Lista del tour a modificar sin haber sido modificado aun
+            cost : int
+                El costo actual del tour
+            i, length : int
+                Indice de inicio y largo (1 a 3) del segmento
+            p : int
+                Indice del nodo tras el cual se inserta el segmento, la arista (p,p+1) no debe tocar el segmento
+            reverse : bool
+                Insertar el segmento invertido
+
+            Returns
+            -------
+                int
+                    El nuevo costo luego de aplicar or-opt
+        """
+        if not self.valid_or_opt(i, length, p):
+            return cost
+        n = self.problem.getSize()
+        distance = self.problem.get_distance
+        prev, first, last, after = tour[(i - 1) % n], tour[i], tour[(i + length - 1) % n], tour[(i + length) % n]
+        x, y = tour[p], tour[(p + 1) % n]
+        cost = cost - distance(prev, first) - distance(last, after) + distance(prev, after) - distance(x, y)
+        if reverse:
+            return cost + distance(x, last) + distance(first, y)
+        return cost + distance(x, first) + distance(last, y)
+
+    def valid_or_opt(self, i: int, length: int, p: int) -> bool:
+        """ Retorna verdadero si el segmento [i, i+length) se puede insertar entre p y p+1 """
+        n = self.problem.getSize()
+        if (length < 1 or n < length + 2 or i < 0 or i >= n or p < 0 or p >= n):
+            return False
+        # la arista (p,p+1) no puede ser una de las que tocan el segmento, p en i-1 .. i+length-1 (modulo n)
+        return (p - i + 1) % n > length
+
+    def orOptMove(self, i: int, length: int, p: int, reverse: bool = False) -> None:
+        """ Aplica el movimiento or-opt moviendo en el mismo tour el segmento [i, i+length) entre p y p+1 (invertido o no),
+            solo se desplazan los nodos entre el segmento y el punto de insercion """
+        if not self.valid_or_opt(i, length, p):
+            return
+        current = self.current
+        # Actualizar costo antes de modificar el tour
+        self.cost = self.delta_cost_or_opt(current, self.cost, i, length, p, reverse)
+
+        n = self.problem.getSize()
+        if i + length > n:
+            # el segmento pasa por el final del tour, se rota el recorrido para que comience en el segmento
+            current[:n] = current[i:n] + current[:i]
+            p = (p - i) % n
+            i = 0
+            self.updatePosition()
+
+        segment = current[i:i + length]
+        if reverse:
+            segment.reverse()
+        if p > i:
+            # insertar despues: se desplaza hacia atras el tramo (i+length, p]
+            current[i:p + 1] = current[i + length:p + 1] + segment
+            self.updatePosition(i, p + 1)
+        else:
+            # insertar antes: se desplaza hacia adelante el tramo (p, i)
+            current[p + 1:i + length] = segment + current[p + 1:i]
+            self.updatePosition(p + 1, i + length)
 
         # Igualar inicio y final
-        new_tour[len(self.current)-1] = new_tour[0]
-        
-        # Actualizar costo y tour
-        self.cost = self.delta_cost_two_opt(self.current, self.cost, s, e)
-        self.current = new_tour.copy()
+        current[len(current)-1] = current[0]
+
+    def randomOrOpt(self) -> None:
+        """ Aplica un movimiento or-opt aleatorio con un segmento de 1 a 3 nodos """
+        n = self.problem.getSize()
+        if n < 3:
+            return
+        length = utilities.random.randint(1, min(3, n - 2))
+        i = utilities.random.randint(0, n - 1)
+        # posiciones validas de insercion: todas menos las length+1 aristas que tocan el segmento
+        p = (i + length + utilities.random.randint(0, n - length - 2)) % n
+        reverse = utilities.random.random() < 0.5
+        self.orOptMove(i, length, p, reverse)
 
 
     """ 3 - O P T """
        
+    def delta_cost_three_opt(self, tour: list, cost: int, i: int, j: int, k: int) -> tuple:
+        """ Evalua en O(1) y sin modificar el tour las 7 reconexiones 3-opt al cortar las aristas (A,B), (C,D) y (E,F)
+            con A = tour[i-1], B = tour[i], C = tour[j-1], D = tour[j], E = tour[k-1] y F = tour[k]. Con los tramos
+            S1 = B..C y S2 = D..E las reconexiones son:
+
+            1. A C..B D..E F (invertir S1)
+            2. A B..C E..D F (invertir S2)
+            3. A E..D C..B F (invertir S1 + S2)
+            4. A D..E B..C F (intercambiar S1 y S2)
+            5. A D..E C..B F (intercambiar e invertir S1)
+            6. A E..D B..C F (intercambiar e invertir S2)
+            7. A C..B E..D F (invertir S1 y S2 en su lugar)
+
+            Parameters
+            ----------
+            tour : list
+                Lista del tour a modificar sin haber sido modificado aun
+            cost : int
+                El costo actual del tour
+            i, j, k : int
+                Indices del recorrido con j >= i+2, k >= j+2 y k < n si i = 0 (k <= n si i > 0)
+
+            Returns
+            -------
+                tuple
+                    (nuevo costo, reconexion) de la reconexion de menor costo, (cost, 0) si ninguna mejora el tour
+        """
+        deltas = self.three_opt_deltas(tour, i, j, k)
+        best = min(deltas)
+        if best >= 0:
+            return cost, 0
+        return cost + best, deltas.index(best) + 1
+
+    def three_opt_deltas(self, tour: list, i: int, j: int, k: int) -> tuple:
+        """ Cambio de costo de cada una de las 7 reconexiones 3-opt (ver delta_cost_three_opt), en orden de 1 a 7 """
+        n = self.problem.getSize()
+        distance = self.problem.get_distance
+        A, B = tour[i - 1 if i > 0 else n - 1], tour[i]
+        C, D = tour[j - 1], tour[j]
+        E, F = tour[k - 1], tour[k % n]
+
+        AB, CD, EF = distance(A, B), distance(C, D), distance(E, F)
+        AC, AD, AE = distance(A, C), distance(A, D), distance(A, E)
+        BD, BE, BF = distance(B, D), distance(B, E), distance(B, F)
+        CE, CF, DF = distance(C, E), distance(C, F), distance(D, F)
+
+        d0 = AB + CD + EF
+        d = (AC + BD + EF, AB + CE + DF, AE + CD + BF, AD + BE + CF, AD + CE + BF, AE + BD + CF, AC + BE + DF)
+        return tuple(dk - d0 for dk in d)
+
+    def threeOptMove(self, i: int, j: int, k: int, move: int) -> None:
+        """ Aplica en el mismo tour la reconexion 3-opt move (1 a 7, ver delta_cost_three_opt) entre los indices i, j, k
+            sin actualizar el costo, solo se modifica el tramo [i, k) """
+        current = self.current
+        if move == 1:
+            current[i:j] = current[i:j][::-1]
+            self.updatePosition(i, j)
+        elif move == 2:
+            current[j:k] = current[j:k][::-1]
+            self.updatePosition(j, k)
+        elif move == 3:
+            current[i:k] = current[i:k][::-1]
+            self.updatePosition(i, k)
+        elif move == 4:
+            current[i:k] = current[j:k] + current[i:j]
+            self.updatePosition(i, k)
+        elif move == 5:
+            current[i:k] = current[j:k] + current[i:j][::-1]
+            self.updatePosition(i, k)
+        elif move == 6:
+            current[i:k] = current[j:k][::-1] + current[i:j]
+            self.updatePosition(i, k)
+        elif move == 7:
+            current[i:j] = current[i:j][::-1]
+            current[j:k] = current[j:k][::-1]
+            self.updatePosition(i, k)
+        else:
+            return
+
+        # Igualar inicio y final
+        current[len(current)-1] = current[0]
+
     def bestThreeOptSwap(self, i: int, j: int, k: int) -> int:
         """ Determina y realiza la mejor opcion para aplicar el moviemiento 3-opt  
 
@@ -266,43 +490,11 @@ class Tour():
         """
         if not self.current or not self.problem:
             return
-        delta = 0
-        self.current.pop()
-        # Puntos de corte para calcular las distancias y el delta
-        A, B = self.current[i-1], self.current[i]
-        C, D = self.current[j-1], self.current[j]
-        E, F = self.current[k-1], self.current[k % self.problem.getSize()]
-        
-        # Calculo de los puntos para determinara la mejor opcion para realizar el movimiento
-        d0 = self.problem.get_distance(A, B) + self.problem.get_distance(C, D) + self.problem.get_distance(E, F)
-        d1 = self.problem.get_distance(A, C) + self.problem.get_distance(B, D) + self.problem.get_distance(E, F)
-        d2 = self.problem.get_distance(A, B) + self.problem.get_distance(C, E) + self.problem.get_distance(D, F)
-        d3 = self.problem.get_distance(A, D) + self.problem.get_distance(E, B) + self.problem.get_distance(C, F)
-        d4 = self.problem.get_distance(F, B) + self.problem.get_distance(C, D) + self.problem.get_distance(E, A)
-
-        if d0 > d1:
-            self.current[i:j] = reversed(self.current[i:j])
-            #print(tour)
-            delta = -d0 + d1
-
-        elif d0 > d2:
-            self.current[j:k] = reversed(self.current[j:k])
-            #print(tour)
-            delta = -d0 + d2
-
-        elif d0 > d4:
-            self.current[i:k] = reversed(self.current[i:k])
-            #print(tour)
-            delta = -d0 + d4
-
-        elif d0 > d3:
-            tmp = self.current[j:k] + self.current[i:j]
-            self.current[i:k] = tmp
-            #print(tour)
-            delta = -d0 + d3
-        # Actualizar costo y completar tour con el valor delta
-        self.cost += delta
-        self.current.append(self.current[0])
+        cost, move = self.delta_cost_three_opt(self.current, self.cost, i, j, k)
+        delta = cost - self.cost
+        if move:
+            self.threeOptMove(i, j, k, move)
+            self.cost = cost
         
         return delta
     
@@ -327,33 +519,39 @@ class Tour():
             self.swap(n1, n2)
         elif (move_type == TSPMove.THREE_OPT):
             self.bestThreeOptSwap(i, j, k)
+        elif (move_type == TSPMove.OR_OPT):
+            self.randomOrOpt()
         else:
             self.swap(n1, n2)
             
-    def getIndThreeOpt(self) -> int:
-        """ Retorna 3 indices aleatorios para realizar el movimiento 3 opt 
+    def getIndThreeOpt(self) -> tuple:
+        """ Retorna 3 indices aleatorios (i, j, k) para realizar el movimiento 3 opt, con j >= i+2, k >= j+2 y k < n si i = 0
+            (k <= n si i > 0). Se eligen uniformemente entre todos los tripletes validos en O(1): con i = 0 son los pares
+            1 <= j-1 < k-2 <= n-3 y con i > 0 los tripletes 1 <= i < j-1 < k-2 <= n-2
         """
         n = self.problem.getSize()
-        for i in range(n):
-            for j in range(i + 2, n):
-                for k in range(j + 2, n + (i > 0)):
-                    if utilities.random.randint(0, 100) <= 1: # probabilidad de retornar los indices en el ciclo for que cumple para 3opt
-                        return i, j, k
-                    
-        return 0, 2, 4 # si no se cumplio la probabilidad en algun casos se retornan los indices minimos
+        first = (n - 3) * (n - 4) // 2 # tripletes con i = 0
+        rest = (n - 2) * (n - 3) * (n - 4) // 6 # tripletes con i > 0
+        if first + rest <= 0:
+            return 0, 2, 4 # no hay tripletes validos, se retornan los indices minimos
+        if utilities.random.randrange(first + rest) < first:
+            b, c = sorted(utilities.random.sample(range(1, n - 2), 2))
+            return 0, b + 1, c + 2
+        a, b, c = sorted(utilities.random.sample(range(1, n - 1), 3))
+        return a, b + 1, c + 2
     
     
     def neighbourTour(self, start: int) -> None:
         """ Aplica la heuristica del vecino mas cercano """
         self.current = self.problem.greedy_nearest_n(start)
+        self.updatePosition()
                     
 
     def getPosition(self, node: int) -> int:
-        """ Retorna el indice de un nodo """
-        try:
-            return self.current.index(node)
-        except:
-            return -1
+        """ Retorna el indice de un nodo en O(1) desde el arreglo de posiciones, -1 si no esta en el recorrido """
+        if (0 <= node < len(self.position)):
+            return self.position[node]
+        return -1
 
     def getNode(self, pos: int) -> int:
         """ Retorna el nodo de un indice recibido """
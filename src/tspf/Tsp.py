@@ -3,9 +3,12 @@ Modulo que contiene la clase la cual representa el problema TSP
 
 """
 
-from . import TSPlibReader
+from . import TSPlibReader, AlgorithmsOptions, LowerBound, heapq, np
 from .Tools import utilities, bcolors, plot
 
+# Cantidad de inserciones candidatas que guarda cada nodo libre en la insercion mas barata
+INSERTION_CANDIDATES = 16
+
 class Tsp():
     """
     Clase que representa el problema TSP, lee una instancia, evalua soluciones del TSP y provee metodos para crear soluciones
@@ -14,14 +17,21 @@ class Tsp():
     ----------
     nodes : int
         Numero de Nodos
-    distances : list[list]
-        Matriz con la distacia
-    neighbours : int
-        Matriz con vecinos mas cercanos
+    distances : np.ndarray | PackedDistance | LazyDistance
+        Matriz con la distacia (enteros int16, int32 o int64 contiguos, np.memmap de solo lectura si se mapea desde el cache),
+        triangulo empaquetado en instancias EXPLICIT u oraculo de distancias bajo demanda en modo lazy
+    neighbours : np.ndarray
+        Listas de candidatos con los k vecinos mas cercanos de cada nodo (matriz n x k)
     tsplib_instance : TSPlibReader
         Instancia TSP
-    options : AlgorithmsOptions
-        Opciones
+    options : AlgorithmsOptions, optional
+        Opciones, se utilizan las relacionadas con el calculo de las distancias
+    strict : bool
+        Modo estricto, valida todos los tours construidos y sus costos (depuracion)
+    bound : LowerBound
+        Cota inferior de Held-Karp, solo se calcula si se pide la cota o un gap objetivo (None si no)
+    target_gap : float
+        Gap objetivo en porcentaje sobre la cota inferior para terminar la búsqueda (0 sin criterio)
     
 
     Methods
@@ -34,10 +44,33 @@ class Tsp():
     # errores de lectura en TSPLIB
     error = ''
 
-    def __init__(self, filename: str) -> None:
+    # modo estricto de validacion de tours
+    strict = False
+
+    # cota inferior y gap objetivo
+    bound = None
+    target_gap = 0.0
+
+    def __init__(self, filename: str, options: AlgorithmsOptions = None) -> None:
+
+        # Modo de distancias bajo demanda y tamaño de su cache
+        lazy = options.lazy_distance if options else False
+        cache_rows = options.cache_rows if options else AlgorithmsOptions.cache_rows
+        # Cantidad de vecinos en las listas de candidatos
+        nn_size = options.nn_size if options else AlgorithmsOptions.nn_size
+        # Cache en disco de la instancia preprocesada
+        cache = options.use_cache if options else AlgorithmsOptions.use_cache
+        # Matriz mapeada en memoria desde el cache y compartida entre procesos
+        mmap = options.mmap_distance if options else AlgorithmsOptions.mmap_distance
+        # Procesos para calcular la matriz y las listas de candidatos en paralelo
+        workers = options.workers if options else AlgorithmsOptions.workers
+        # Validacion completa de todos los tours construidos
+        self.strict = options.strict_check if options else AlgorithmsOptions.strict_check
+        if options and options.clear_cache:
+            TSPlibReader.clear_cache()
 
         # Atributos de instancia
-        self.instance = TSPlibReader(tsp_file_name=filename) # Instancia TSPlibReader que lee el archivo y calcula las distancias
+        self.instance = TSPlibReader(tsp_file_name=filename, lazy=lazy, cache_rows=cache_rows, nn_size=nn_size, cache=cache, mmap=mmap, workers=workers) # Instancia TSPlibReader que lee el archivo y calcula las distancias
         
         
         self.error = self.instance.error
@@ -47,16 +80,44 @@ class Tsp():
 
             self.distances = self.instance.distance # Matriz con las distacias
 
-            self.neighbours = self.instance.nn_list # Matriz con vecinos mas cercanos 
+            self._view = self.distance_view() # Vista de la matriz que entrega enteros de python sin pasar por numpy
+
+            self.neighbours = self.instance.nn_list # Listas de candidatos con los vecinos mas cercanos
             
             self.nodes = self.instance.n # Numero de Nodos
 
-            # Guardar coordenadas de los puntos del para generar mapeado al utilizar la graficacion
-            plot.Graph.coords = self.instance.nodeptr.copy()
+            # Guardar coordenadas de los puntos del para generar mapeado al utilizar la graficacion (se comparte el arreglo, no se modifica)
+            plot.Graph.coords = self.instance.nodeptr
+
+            # Cota inferior de Held-Karp para reportar el gap y terminar al alcanzar el gap objetivo
+            self.target_gap = options.target_gap if options else AlgorithmsOptions.target_gap
+            if options and (options.lower_bound or self.target_gap > 0):
+                print('Calculando la cota inferior de Held-Karp...')
+                self.bound = LowerBound(self)
+                if self.bound.bound is not None:
+                    print(f"{bcolors.OKBLUE}Cota inferior: {bcolors.ENDC}{self.bound.bound}" + ("" if self.bound.exact else " (estimada)"))
         
         
 
 
+    def __getstate__(self) -> dict:
+        """ Estado del objeto para ser guardado con pickle, la vista memoryview no es serializable """
+        state = self.__dict__.copy()
+        state.pop('_view', None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """ Restaura el estado del objeto guardado con pickle y reconstruye la vista de la matriz """
+        self.__dict__.update(state)
+        if not self.error:
+            self._view = self.distance_view()
+
+    def distance_view(self):
+        """ Retorna el objeto indexable [i, j] utilizado por get_distance, una memoryview de la matriz o el oraculo en modo lazy """
+        if isinstance(self.distances, np.ndarray):
+            return memoryview(self.distances)
+        return self.distances
+
     def getSize(self) -> int:
         """ Obtener numero de nodos"""
         return self.nodes
@@ -71,14 +132,65 @@ class Tsp():
 
     def get_distance(self, i: int, j: int) -> int:
         """ Obtener distancia entre los nodos por su indice i y j"""
-        return self.distances[i][j]
+        return self._view[i, j]
 
     def compute_tour_length(self, tour: list) -> int:
         """ Computar y retornar el costo de un tour """
-        tour_length = 0
-        for i in range(self.nodes):
-            tour_length += self.distances[tour[i]][tour[i + 1]]
-        return tour_length
+        tour = np.asarray(tour[:self.nodes + 1])
+        return int(self.distances[tour[:-1], tour[1:]].sum())
+
+    def evaluate_many(self, tours) -> np.ndarray:
+        """ Computar el costo de varios tours a la vez
+
+            Parameters
+            ----------
+            tours : np.ndarray | list
+                Matriz de enteros (m x n+1) con un tour cerrado por fila, se aceptan tambien tours de n nodos sin cerrar
+
+            Returns
+            -------
+            np.ndarray
+                Arreglo int64 con el costo de cada tour
+        """
+        tours = np.asarray(tours, dtype=np.int64)
+        if tours.ndim != 2:
+            raise ValueError("evaluate_many espera una matriz de tours (m x n+1)")
+        if tours.shape[0] == 0:
+            return np.zeros(0, dtype=np.int64)
+        tours = tours[:, :self.nodes + 1]
+        # Cerrar los tours que no vuelven al nodo inicial
+        if tours.shape[1] == self.nodes:
+            tours = np.concatenate((tours, tours[:, :1]), axis=1)
+        # Un solo gather sobre la matriz de distancias para todos los arcos de todos los tours
+        edges = self.distances[tours[:, :-1].ravel(), tours[:, 1:].ravel()]
+        return np.asarray(edges, dtype=np.int64).reshape(tours.shape[0], -1).sum(axis=1)
+
+    def gap(self, cost: int) -> float:
+        """ Retorna el gap en porcentaje del costo sobre la cota inferior, None si no hay cota """
+        if (self.bound is None or self.bound.bound is None or self.bound.bound <= 0):
+            return None
+        return 100.0 * (cost - self.bound.bound) / self.bound.bound
+
+    def print_gap(self, cost: int) -> None:
+        """ Escribe el gap del costo sobre la cota inferior, si hay cota """
+        gap = self.gap(cost)
+        if gap is not None:
+            print(f"{bcolors.BOLD}Gap sobre la cota inferior ({self.bound.bound}):{bcolors.ENDC} {bcolors.OKBLUE}{gap:.2f}%{bcolors.ENDC}")
+
+    def gap_log(self, cost: int) -> dict:
+        """ Retorna las columnas bound y gap del registro de soluciones, vacias si no se calculo la cota inferior """
+        gap = self.gap(cost)
+        return {
+            "bound": self.bound.bound if self.bound is not None and self.bound.bound is not None else "",
+            "gap": f"{gap:.4f}" if gap is not None else ""
+        }
+
+    def target_reached(self, cost: int) -> bool:
+        """ Retorna verdadero si el costo esta dentro del gap objetivo sobre la cota inferior """
+        if (self.target_gap <= 0):
+            return False
+        gap = self.gap(cost)
+        return gap is not None and gap <= self.target_gap
 
     def tsp_check_tour(self, tour: list) -> bool:
         """ Revisa la correctitud de una solución del TSP """
@@ -141,26 +253,335 @@ class Tsp():
         return tour
     
     def greedy_nearest_n(self, start: int) -> list:
-        """ Genera una solución del tsp usando la heuristica del nodo mas cercano comenzando del nodo start """
-        tour = [0] * self.nodes
-        selected = [False] * self.nodes
-
+        """ Genera una solución del tsp usando la heuristica del nodo mas cercano comenzando del nodo start,
+            en O(n·k) con las listas de candidatos y un indice espacial de los nodos libres cuando estas se agotan """
         # Si el nodo inicial es menor que 0 se genera uno aleatorio para comenzar
         if (start < 0):
             start = utilities.random.randint(0, self.nodes-1)
-        tour[0] = start
-        selected[start] = True
+
+        # Indice de los nodos no visitados, se consulta solo cuando se agotan los candidatos
+        unvisited = self.instance.unvisited_index()
+        visited = unvisited.visited
+        neighbours = self.neighbours
+        tour = [start]
+        unvisited.visit(start)
 
         # Ciclo para los nodos del tour
-        for i in range(1,self.nodes):            
-            for j in range(self.nodes):
-                if (not selected[self.neighbours[tour[i-1]][j]]):
-                    tour[i] = self.neighbours[tour[i-1]][j]
-                    selected[self.neighbours[tour[i-1]][j]] = True
+        node = start
+        for _ in range(1, self.nodes):
+            last = node
+            node = -1
+            # Buscar el primer candidato no seleccionado en la lista de vecinos
+            for candidate in neighbours[last].tolist():
+                if (not visited[candidate]):
+                    node = candidate
                     break
+            # Si todos los candidatos ya fueron seleccionados se busca el nodo libre mas cercano
+            if (node < 0):
+                node = unvisited.nearest(last)
+            tour.append(node)
+            unvisited.visit(node)
         tour.append(tour[0])
         return tour
     
+    def greedy_edge(self) -> list:
+        """ Genera una solución del tsp con la heuristica greedy de aristas (estilo Kruskal): recorre las aristas de las listas
+            de candidatos de menor a mayor largo y agrega cada una si ambos nodos tienen grado menor a 2 y no cierra un ciclo
+            (union-find), O(n·k log(n·k)). Los fragmentos resultantes se unen por el extremo libre mas cercano """
+        n = self.nodes
+        if (n < 3):
+            return self.deterministic_tour()
+
+        # Aristas de las listas de candidatos sin repetir (i < j) ordenadas por distancia e indices
+        k = self.neighbours.shape[1]
+        first = np.repeat(np.arange(n, dtype=np.int64), k)
+        second = self.neighbours.ravel().astype(np.int64)
+        keys = np.sort(np.minimum(first, second) * n + np.maximum(first, second))
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        first, second = keys // n, keys % n
+        dist = np.asarray(self.distances[first, second], dtype=np.int64)
+        order = np.lexsort((keys, dist))
+
+        parent = list(range(n)) # union-find de los fragmentos
+        adjacent = [[] for _ in range(n)] # aristas elegidas de cada nodo
+        for i, j in zip(first[order].tolist(), second[order].tolist()):
+            if (len(adjacent[i]) == 2 or len(adjacent[j]) == 2):
+                continue
+            # raices de los fragmentos con compresion de caminos por mitades
+            a = i
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            b = j
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            # la arista cerraria un ciclo
+            if (a == b):
+                continue
+            parent[a] = b
+            adjacent[i].append(j)
+            adjacent[j].append(i)
+
+        # Unir los fragmentos (caminos y nodos aislados) recorriendolos y saltando al extremo libre mas cercano,
+        # el indice de nodos no visitados solo contiene los extremos de los fragmentos
+        unvisited = self.instance.unvisited_index()
+        for node in range(n):
+            if (len(adjacent[node]) == 2):
+                unvisited.visit(node)
+        tour = []
+        node = next(node for node in range(n) if len(adjacent[node]) < 2)
+        while True:
+            # recorrer el fragmento desde el extremo node hasta el otro extremo
+            unvisited.visit(node)
+            prev = -1
+            while True:
+                tour.append(node)
+                following = [nxt for nxt in adjacent[node] if nxt != prev]
+                if (not following):
+                    break
+                prev, node = node, following[0]
+            if (len(tour) == n):
+                break
+            if (prev >= 0):
+                unvisited.visit(node)
+            node = unvisited.nearest(node)
+        tour.append(tour[0])
+        return tour
+
+    def space_filling_curve_tour(self) -> list:
+        """ Genera una solución del tsp ordenando los nodos segun su posicion en la curva de Hilbert sobre sus coordenadas,
+            O(n log n) sin utilizar distancias (sirve en modo lazy). Las instancias EXPLICIT no tienen coordenadas,
+            en ese caso se utiliza la heuristica del vecino mas cercano desde el nodo 0 """
+        order = self.instance.hilbert_order()
+        if (order is None):
+            return self.greedy_nearest_n(0)
+        tour = order.tolist()
+        tour.append(tour[0])
+        return tour
+
+    def distance_row(self, node: int) -> np.ndarray:
+        """ Retorna la fila de distancias del nodo como arreglo int64 (matriz, triangulo empaquetado u oraculo lazy) """
+        return np.asarray(self.distances[node], dtype=np.int64)
+
+    def distance_rows(self, nodes: np.ndarray) -> np.ndarray:
+        """ Retorna las filas de distancias de varios nodos como matriz (len(nodes) x n) del tipo entero de la matriz """
+        if isinstance(self.distances, np.ndarray):
+            return self.distances[nodes]
+        return np.array([self.distance_row(node) for node in nodes.tolist()], dtype=np.int64).reshape(len(nodes), self.nodes)
+
+    def nearest_insertion(self) -> list:
+        """ Genera una solución del tsp con la heuristica de insercion del nodo mas cercano al tour """
+        return self.insertion_tour(farthest=False)
+
+    def farthest_insertion(self) -> list:
+        """ Genera una solución del tsp con la heuristica de insercion del nodo mas lejano al tour """
+        return self.insertion_tour(farthest=True)
+
+    def insertion_tour(self, farthest: bool = False) -> list:
+        """ Genera una solución del tsp insertando en cada paso el nodo libre mas cercano (o mas lejano) al tour parcial,
+            en la arista donde aumenta menos el costo. La distancia de cada nodo libre al tour se actualiza con la fila
+            del nodo insertado y la seleccion usa una cola de prioridad con entradas obsoletas descartadas al extraerlas,
+            O(n^2) en total en vez de O(n^3)
+
+            Parameters
+            ----------
+            farthest : bool
+                insertar el nodo mas lejano al tour en vez del mas cercano
+
+            Returns
+            -------
+            list
+                tour cerrado comenzando en el nodo 0
+        """
+        n = self.nodes
+        if (n < 3):
+            return self.deterministic_tour()
+        sign = -1 if farthest else 1
+
+        # Tour parcial como lista enlazada de sucesores con el largo de la arista que sale de cada nodo
+        succ = np.zeros(n, dtype=np.int64)
+        edge = np.zeros(n, dtype=np.int64)
+        members = np.zeros(n, dtype=np.int64) # nodos del tour parcial
+        in_tour = np.zeros(n, dtype=bool)
+        in_tour[0] = True
+        size = 1
+
+        # Distancia de cada nodo al tour parcial y cola de prioridad con (+-distancia, nodo)
+        closest = self.distance_row(0)
+        heap = [(sign * value, node) for node, value in enumerate(closest.tolist()) if node != 0]
+        heapq.heapify(heap)
+
+        for _ in range(n - 1):
+            # Extraer el siguiente nodo descartando entradas de nodos insertados o con distancia desactualizada
+            while True:
+                key, node = heapq.heappop(heap)
+                if (not in_tour[node] and sign * key == closest[node]):
+                    break
+            row = self.distance_row(node)
+
+            # Arista del tour parcial donde insertar el nodo aumenta menos el costo
+            tails = members[:size]
+            heads = succ[tails]
+            best = int(tails[np.argmin(row[tails] + row[heads] - edge[tails])])
+            succ[node], edge[node] = succ[best], row[succ[best]]
+            succ[best], edge[best] = node, row[best]
+            members[size] = node
+            size += 1
+            in_tour[node] = True
+
+            # Actualizar la distancia al tour de los nodos libres que quedaron mas cerca del nodo insertado
+            improved = np.flatnonzero(~in_tour & (row < closest))
+            closest[improved] = row[improved]
+            for other, value in zip(improved.tolist(), row[improved].tolist()):
+                heapq.heappush(heap, (sign * value, other))
+
+        return self.linked_tour(succ)
+
+    def cheapest_insertion(self, trace: list = None) -> list:
+        """ Genera una solución del tsp insertando en cada paso el nodo libre con la insercion de menor costo.
+            Cada nodo libre guarda su mejor arista de insercion y hasta 2 * INSERTION_CANDIDATES inserciones candidatas
+            (costo, origen, destino) con todas las aristas del tour de costo menor a su cota. Al insertar un nodo solo se
+            evaluan las dos aristas nuevas para todos los nodos libres; los nodos cuya mejor arista fue eliminada toman
+            la mejor candidata cuya arista siga en el tour (succ[origen] == destino) y solo se recalculan sobre todo el
+            tour cuando se agotan sus candidatas. La seleccion usa una cola de prioridad con entradas obsoletas descartadas
+
+            Parameters
+            ----------
+            trace : list, optional
+                si se entrega se agregan en orden las inserciones realizadas como tuplas (nodo, origen de la arista, costo)
+
+            Returns
+            -------
+            list
+                tour cerrado comenzando en el nodo 0
+        """
+        n = self.nodes
+        if (n < 3):
+            return self.deterministic_tour()
+
+        # Tour parcial como lista enlazada de sucesores con el largo de la arista que sale de cada nodo
+        succ = np.zeros(n, dtype=np.int64)
+        edge = np.zeros(n, dtype=np.int64)
+        members = np.zeros(n, dtype=np.int64) # nodos del tour parcial
+        in_tour = np.zeros(n, dtype=bool)
+        in_tour[0] = True
+        size = 1
+
+        # Mejor insercion de cada nodo libre: costo y nodo de origen de la arista, al inicio el ciclo 0 -> 0
+        cost = 2 * self.distance_row(0).astype(np.int64)
+        tail = np.zeros(n, dtype=np.int64)
+        heap = [(value, node) for node, value in enumerate(cost.tolist()) if node != 0]
+        heapq.heapify(heap)
+
+        # Inserciones candidatas por nodo (costo, origen, destino), las casillas libres tienen costo limit.
+        # Estan todas las aristas del tour con costo menor a bound, las que ya no estan en el tour se descartan al compactar
+        K = INSERTION_CANDIDATES
+        limit = np.iinfo(np.int64).max
+        values = np.full((n, 2 * K), limit, dtype=np.int64)
+        tails = np.zeros((n, 2 * K), dtype=np.int64)
+        heads = np.zeros((n, 2 * K), dtype=np.int64)
+        used = np.zeros(n, dtype=np.int64) # casillas ocupadas
+        bound = np.full(n, np.iinfo(np.int64).min, dtype=np.int64) # sin candidatas hasta el primer recalculo
+
+        for _ in range(n - 1):
+            # Extraer el nodo con la insercion mas barata descartando entradas obsoletas
+            while True:
+                key, node = heapq.heappop(heap)
+                if (not in_tour[node] and key == cost[node]):
+                    break
+            before, after = int(tail[node]), int(succ[tail[node]])
+            row = self.distance_row(node)
+            if (trace is not None):
+                trace.append((node, before, key))
+
+            # Nodos libres cuya mejor arista (before, after) se elimina con la insercion
+            free = ~in_tour
+            free[node] = False
+            stale = np.flatnonzero(free & (tail == before))
+
+            succ[node], edge[node] = after, row[after]
+            succ[before], edge[before] = node, row[before]
+            members[size] = node
+            size += 1
+            in_tour[node] = True
+
+            # Evaluar las dos aristas nuevas (before, node) y (node, after) para todos los nodos libres
+            row_before, row_after = self.distance_row(before), self.distance_row(after)
+            changed = [stale]
+            for origin, head, value in ((before, node, row_before + row - edge[before]), (node, after, row + row_after - edge[node])):
+                better = np.flatnonzero(free & (value < cost))
+                cost[better] = value[better]
+                tail[better] = origin
+                changed.append(better)
+
+                # Agregar la arista a las candidatas de los nodos en que queda bajo la cota
+                nodes = np.flatnonzero(free & (value < bound))
+                full = nodes[used[nodes] == 2 * K]
+                if (full.size):
+                    # Compactar: descartar aristas eliminadas y dejar las K mejores, la cota baja a la primera descartada
+                    block = np.where(succ[tails[full]] == heads[full], values[full], limit)
+                    order = np.argsort(block, axis=1, kind='stable')
+                    block = np.take_along_axis(block, order, axis=1)
+                    bound[full] = np.minimum(bound[full], block[:, K])
+                    block[:, K:] = limit
+                    values[full] = block
+                    tails[full] = np.take_along_axis(tails[full], order, axis=1)
+                    heads[full] = np.take_along_axis(heads[full], order, axis=1)
+                    used[full] = (block < limit).sum(axis=1)
+                    nodes = nodes[value[nodes] < bound[nodes]]
+                slot = used[nodes]
+                values[nodes, slot] = value[nodes]
+                tails[nodes, slot] = origin
+                heads[nodes, slot] = head
+                used[nodes] += 1
+
+            if (stale.size):
+                # Los nodos que perdieron su mejor arista toman su mejor candidata que siga en el tour
+                block = np.where(succ[tails[stale]] == heads[stale], values[stale], limit)
+                position = np.argmin(block, axis=1)
+                best = block[np.arange(len(stale)), position]
+                found = best < limit
+                cost[stale[found]] = best[found]
+                tail[stale[found]] = tails[stale[found], position[found]]
+
+                # Recalcular sobre todo el tour los nodos sin candidatas
+                empty = stale[~found]
+                if (empty.size):
+                    origins = members[:size]
+                    targets = succ[origins]
+                    rows = self.distance_rows(empty)
+                    block = rows[:, origins].astype(np.int64) + rows[:, targets] - edge[origins]
+                    keep = min(K, size)
+                    order = np.argpartition(block, keep, axis=1)[:, :keep + 1] if size > K else np.tile(np.arange(size), (len(empty), 1))
+                    block = np.take_along_axis(block, order, axis=1)
+                    sort = np.argsort(block, axis=1, kind='stable')
+                    block, order = np.take_along_axis(block, sort, axis=1), np.take_along_axis(order, sort, axis=1)
+                    bound[empty] = block[:, K] if size > K else limit
+                    values[empty] = limit
+                    values[empty, :keep] = block[:, :keep]
+                    tails[empty, :keep] = origins[order[:, :keep]]
+                    heads[empty, :keep] = targets[order[:, :keep]]
+                    used[empty] = keep
+                    cost[empty] = block[:, 0]
+                    tail[empty] = origins[order[:, 0]]
+
+            for other in np.unique(np.concatenate(changed)).tolist():
+                heapq.heappush(heap, (int(cost[other]), other))
+
+        return self.linked_tour(succ)
+
+    def linked_tour(self, succ: np.ndarray) -> list:
+        """ Convierte un tour como lista enlazada de sucesores en un tour cerrado comenzando en el nodo 0 """
+        succ = succ.tolist()
+        tour = [0]
+        node = succ[0]
+        while node != 0:
+            tour.append(node)
+            node = succ[node]
+        tour.append(0)
+        return tour
+
     def deterministic_tour(self) -> list:
         """ Genera una solución deterministica """
         # Crear lista deterministica (rango secuencial 0 al numero de nodos)
@@ -0,0 +1,188 @@
+"""
+Modulo que contiene la clase con la representacion de un tour como lista doblemente enlazada de dos niveles
+
+"""
+
+from . import math
+
+class TwoLevelList():
+    """ Clase que representa un recorrido como lista de dos niveles: el tour se divide en ~sqrt(n) segmentos,
+        cada segmento guarda sus nodos y un bit de inversion, y los segmentos forman un ciclo ordenado.
+        next, prev y between son O(1), walk y el movimiento 2-opt son O(sqrt(n)): se cortan a lo mas dos segmentos
+        y se invierte el orden de los segmentos del camino (cambiando sus bits) sin mover los nodos
+
+        Parameters
+        ----------
+        tour : list
+            Recorrido cerrado (el ultimo nodo repite el primero) o abierto con los nodos 0..n-1
+
+        Attributes
+        ----------
+        n : int
+            Numero de nodos
+        segments : list
+            Nodos de cada segmento en el orden en que se guardan
+        reversed : list
+            Bit de inversion de cada segmento, si es verdadero el segmento se recorre desde el final
+        order : list
+            Identificadores de los segmentos en el orden del tour
+        rank : list
+            Indice de cada segmento en order
+        parent : list
+            Segmento de cada nodo
+        index : list
+            Indice de cada nodo dentro de la lista de su segmento
+
+        Examples
+        --------
+        >>> tl = TwoLevelList(tour.current)
+        >>> b, d = tl.next(a), tl.next(c)
+        >>> tl.move(a, b, c, d)
+        >>> tour = Tour(problem=problem, current=tl.tour(), trusted=True)
+    """
+
+    def __init__(self, tour: list) -> None:
+
+        if len(tour) > 1 and tour[0] == tour[-1]:
+            tour = tour[:-1]
+
+        self.n = len(tour) # Numero de nodos
+
+        self.start = tour[0] if tour else 0 # Nodo de inicio al convertir a lista
+
+        self.build(tour)
+
+    def build(self, tour: list) -> None:
+        """ Divide el recorrido en segmentos de tamaño sqrt(n) """
+        n = self.n
+        size = max(int(math.sqrt(n)), 1)
+        self.size = size # tamaño de los segmentos al construir
+        self.segments = [tour[i:i + size] for i in range(0, n, size)]
+        self.reversed = [False] * len(self.segments)
+        self.order = list(range(len(self.segments)))
+        self.rank = list(range(len(self.segments)))
+        self.parent = [0] * n
+        self.index = [0] * n
+        for s, nodes in enumerate(self.segments):
+            for i, node in enumerate(nodes):
+                self.parent[node] = s
+                self.index[node] = i
+
+    def tour(self, start: int = None, forward: bool = True) -> list:
+        """ Retorna el recorrido como lista cerrada comenzando en start (por defecto el nodo de inicio), siguiendo next
+            o prev si forward es falso. Se copian segmentos completos, O(sqrt(n)) operaciones de Python """
+        tour = []
+        for s in self.order:
+            tour.extend(reversed(self.segments[s]) if self.reversed[s] else self.segments[s])
+        if not tour:
+            return tour
+        first = tour.index(self.start if start is None else start)
+        tour = tour[first:] + tour[:first]
+        if not forward:
+            tour[1:] = tour[:0:-1]
+        tour.append(tour[0])
+        return tour
+
+    def next(self, node: int) -> int:
+        """ Retorna el nodo siguiente en el tour """
+        s = self.parent[node]
+        i = self.index[node]
+        nodes = self.segments[s]
+        if not self.reversed[s]:
+            if i + 1 < len(nodes):
+                return nodes[i + 1]
+        elif i > 0:
+            return nodes[i - 1]
+        s = self.order[self.rank[s] + 1 if self.rank[s] + 1 < len(self.order) else 0]
+        return self.segments[s][-1] if self.reversed[s] else self.segments[s][0]
+
+    def prev(self, node: int) -> int:
+        """ Retorna el nodo anterior en el tour """
+        s = self.parent[node]
+        i = self.index[node]
+        nodes = self.segments[s]
+        if not self.reversed[s]:
+            if i > 0:
+                return nodes[i - 1]
+        elif i + 1 < len(nodes):
+            return nodes[i + 1]
+        s = self.order[self.rank[s] - 1]
+        return self.segments[s][0] if self.reversed[s] else self.segments[s][-1]
+
+    def sequence(self, node: int) -> tuple:
+        """ Retorna la posicion del nodo en el tour como (indice del segmento, indice dentro del segmento) """
+        s = self.parent[node]
+        i = self.index[node]
+        return (self.rank[s], len(self.segments[s]) - 1 - i if self.reversed[s] else i)
+
+    def walk(self, node: int, steps: int) -> int:
+        """ Retorna el nodo que esta steps posiciones despues de node siguiendo next, saltando segmentos completos """
+        steps %= self.n
+        r, i = self.sequence(node)
+        while True:
+            s = self.order[r]
+            size = len(self.segments[s])
+            if i + steps < size:
+                break
+            steps -= size - i
+            r = r + 1 if r + 1 < len(self.order) else 0
+            i = 0
+        return self.segments[s][size - 1 - (i + steps)] if self.reversed[s] else self.segments[s][i + steps]
+
+    def between(self, a: int, b: int, c: int) -> bool:
+        """ Retorna verdadero si b esta en el camino que va desde a hasta c siguiendo el tour """
+        pa, pb, pc = self.sequence(a), self.sequence(b), self.sequence(c)
+        if pa <= pc:
+            return pa <= pb <= pc
+        return pb >= pa or pb <= pc
+
+    def split(self, s: int, cut: int) -> None:
+        """ Divide el segmento s en sus nodos [0, cut) y [cut, len), el nuevo segmento queda a continuacion en el tour """
+        nodes = self.segments[s]
+        right = nodes[cut:]
+        del nodes[cut:]
+        t = len(self.segments)
+        self.segments.append(right)
+        self.reversed.append(self.reversed[s])
+        self.rank.append(0)
+        for i, node in enumerate(right):
+            self.parent[node] = t
+            self.index[node] = i
+        # un segmento invertido se recorre desde el final, la parte derecha va antes
+        position = self.rank[s] if self.reversed[s] else self.rank[s] + 1
+        self.order.insert(position, t)
+        for r in range(position, len(self.order)):
+            self.rank[self.order[r]] = r
+
+    def split_before(self, node: int) -> None:
+        """ Corta el segmento del nodo para que el nodo sea el primero de su segmento en el tour """
+        s = self.parent[node]
+        i = self.index[node]
+        if not self.reversed[s]:
+            if i > 0:
+                self.split(s, i)
+        elif i < len(self.segments[s]) - 1:
+            self.split(s, i + 1)
+
+    def move(self, a: int, b: int, c: int, d: int) -> None:
+        """ Movimiento 2-opt que reemplaza las aristas (a,b) y (c,d) por (a,c) y (b,d), con b = next(a) y d = next(c),
+            invirtiendo el camino b..c o su complemento d..a (el que no da la vuelta al arreglo de segmentos) """
+        if b == c or a == d:
+            return
+        # b y d deben comenzar un segmento, por lo que a y c terminan el suyo
+        self.split_before(b)
+        self.split_before(d)
+        first, last = self.rank[self.parent[b]], self.rank[self.parent[c]]
+        if first > last:
+            first, last = self.rank[self.parent[d]], self.rank[self.parent[a]]
+        # invertir el orden de los segmentos y sus bits
+        section = self.order[first:last + 1]
+        section.reverse()
+        self.order[first:last + 1] = section
+        for r in range(first, last + 1):
+            s = self.order[r]
+            self.rank[s] = r
+            self.reversed[s] = not self.reversed[s]
+        # reconstruir si los cortes duplicaron la cantidad de segmentos
+        if len(self.order) > 2 * (self.n // self.size + 1):
+            self.build(self.tour()[:-1])
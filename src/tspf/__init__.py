@@ -4,15 +4,21 @@ Paquete principal del framework que contiene los modulos para obtener soluciones
 """
 
 import argparse
+import hashlib
+import heapq
 import math
+import multiprocessing
 import os
 import sys
 import time
 from enum import Enum
-from decimal import Decimal
+from collections import OrderedDict
+from itertools import chain, islice
 import numpy as np
 
 from src.tspf.TSPlibReader import TSPlibReader
-from src.tspf.AlgorithmsOptions import AlgorithmsOptions, InitialSolution, CoolingType, MHType, SelectionStrategy, SelectionType, CrossoverType, TSPMove, PerturbationType
+from src.tspf.AlgorithmsOptions import AlgorithmsOptions, InitialSolution, CoolingType, MHType, SelectionStrategy, SelectionType, CrossoverType, TSPMove, PerturbationType, TourBackend
+from src.tspf.TwoLevelList import TwoLevelList
+from src.tspf.LowerBound import LowerBound
 from src.tspf.Tsp import Tsp
 from src.tspf.Tour import Tour
\ No newline at end of file
@@ -3,7 +3,7 @@ Modulo principal que utiliza todas las demas clases para ejecutar el framework
 
 """
 
-from .Algorithms import GeneticAlgorithm, SimulatedAnnealing, LocalSearch, IteratedLocalSearch, timer
+from .Algorithms import GeneticAlgorithm, SimulatedAnnealing, LocalSearch, IteratedLocalSearch, DynamicProgramming, timer
 from .Tools import bcolors, gui
 from . import sys, os, AlgorithmsOptions, MHType, Tsp, Tour
 
@@ -29,7 +29,7 @@ def main(argv=sys.argv) -> None:
     options.printOptions()
 
     # leer e interpretar el problema TSP leido desde la instancia definida
-    problem = Tsp(filename=options.instance)
+    problem = Tsp(filename=options.instance, options=options)
 
     # Ejecutar Simulated Annealing
     if (options.metaheuristic == MHType.SA):
@@ -66,6 +66,13 @@ def main(argv=sys.argv) -> None:
         # Ejecutar la busqueda
         solver.search(first_solution)
 
+    # Ejecutar Programacion Dinamica
+    elif (options.metaheuristic == MHType.DP):
+        # Crear solver
+        solver = DynamicProgramming(options=options, problem=problem)
+        # Ejecutar la busqueda (la solucion inicial solo se construye si se ejecuta Local Search)
+        solver.search()
+
     else: 
         # Crear solver
         solver = GeneticAlgorithm(options=options, problem=problem)
@@ -0,0 +1,12 @@
+"""
+Configuracion de pytest, agrega la raiz del repositorio al path para importar el paquete src.tspf
+
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
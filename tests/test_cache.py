@@ -0,0 +1,77 @@
+"""
+Pruebas del cache de instancias preprocesadas
+
+"""
+
+import os
+import shutil
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from src.tspf.TSPlibReader import TSPlibReader
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """ Carpeta del cache temporal, las pruebas no escriben en el cache del usuario """
+    folder = tmp_path / "cache"
+    monkeypatch.setattr(sys.modules["src.tspf.TSPlibReader"], "CACHE_DIR", str(folder))
+    return folder
+
+def matrix(reader: TSPlibReader) -> np.ndarray:
+    """ Matriz de distancias completa del lector """
+    return np.asarray(reader.distance[0:reader.n])
+
+def explicit_instance(folder, n: int = 12, seed: int = 0) -> str:
+    """ Instancia EXPLICIT FULL_MATRIX simetrica aleatoria, guardada en el cache como triangulo empaquetado """
+    rng = np.random.default_rng(seed)
+    weights = rng.integers(1, 1000, (n, n))
+    weights = np.triu(weights, 1) + np.triu(weights, 1).T
+    filename = folder / "explicit.tsp"
+    rows = "\n".join(" ".join(map(str, row)) for row in weights)
+    filename.write_text(f"NAME : explicit\nTYPE : TSP\nDIMENSION : {n}\nEDGE_WEIGHT_TYPE : EXPLICIT\n"
+                        f"EDGE_WEIGHT_FORMAT : FULL_MATRIX\nEDGE_WEIGHT_SECTION\n{rows}\nEOF\n")
+    return str(filename)
+
+
+@pytest.mark.parametrize("mmap", [False, True], ids=["memory", "mmap"])
+@pytest.mark.parametrize("name", ["burma14", "berlin52", "explicit"])
+def test_cache_round_trip(name, mmap, cache_dir, tmp_path, capsys):
+    filename = explicit_instance(tmp_path) if name == "explicit" else str(ROOT / "instances" / f"{name}.tsp")
+    saved = TSPlibReader(filename, cache=True)
+    assert os.path.exists(saved.cache_file + ".npz") and os.path.exists(saved.cache_file + ".npy")
+    assert os.path.dirname(saved.cache_file) == str(cache_dir)
+    capsys.readouterr()
+
+    loaded = TSPlibReader(filename, cache=True, mmap=mmap)
+    assert "Cargando instancia desde el cache" in capsys.readouterr().out
+    assert loaded.cache_file == saved.cache_file
+    assert (loaded.name, loaded.n, loaded.distance_type) == (saved.name, saved.n, saved.distance_type)
+    assert np.array_equal(matrix(loaded), matrix(saved))
+    assert np.array_equal(loaded.nn_list, saved.nn_list)
+    assert np.array_equal(loaded.nodeptr.x, saved.nodeptr.x) and np.array_equal(loaded.nodeptr.y, saved.nodeptr.y)
+    # y ambos iguales a la instancia leida sin cache
+    assert np.array_equal(matrix(loaded), matrix(TSPlibReader(filename, cache=False)))
+
+def test_changed_instance_invalidates_cache(cache_dir, tmp_path, capsys):
+    filename = tmp_path / "berlin52.tsp"
+    shutil.copy(ROOT / "instances" / "berlin52.tsp", filename)
+    old = TSPlibReader(str(filename), cache=True)
+
+    # mover la primera ciudad cambia el contenido y por lo tanto el hash sha256 de la entrada
+    lines = filename.read_text().splitlines()
+    first = next(i for i, line in enumerate(lines) if line.startswith("NODE_COORD_SECTION")) + 1
+    lines[first] = "1 1000.0 1000.0"
+    filename.write_text("\n".join(lines) + "\n")
+    capsys.readouterr()
+
+    new = TSPlibReader(str(filename), cache=True)
+    assert "Cargando instancia desde el cache" not in capsys.readouterr().out
+    assert new.cache_file != old.cache_file
+    assert np.array_equal(matrix(new), matrix(TSPlibReader(str(filename), cache=False)))
+    assert not np.array_equal(matrix(new), matrix(old))
+    # la entrada de la version anterior del archivo se elimina
+    assert sorted(os.listdir(cache_dir)) == sorted(os.path.basename(new.cache_file) + ext for ext in (".npy", ".npz"))
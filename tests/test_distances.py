@@ -0,0 +1,167 @@
+"""
+Pruebas de las distancias GEO y ATT calculadas con aritmetica entera, deben ser identicas a la definicion
+original de TSPLIB calculada con Decimal
+
+"""
+
+import math
+import random
+import sys
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from src.tspf.TSPlibReader import TSPlibReader, Edge_weight_format, compact_dtype, RRR, decimal_parts, decimal_add, decimal_sub, decimal_mul, decimal_float
+from src.tspf.Tools import utilities
+
+GEO_INSTANCES = ["burma14", "ulysses16", "ulysses22"]
+ATT_INSTANCES = ["att48", "att532"]
+
+
+def decimal_radians(value: float) -> float:
+    """ Conversion de una coordenada GEO a radianes con Decimal (definicion original) """
+    deg = utilities.dtrunc(value)
+    min = float(Decimal(f"{value}") - Decimal(f"{deg}"))
+    return math.pi * (deg + 5.0 * min / 3.0) / 180.0
+
+def decimal_geo(x1: float, y1: float, x2: float, y2: float) -> int:
+    """ Distancia GEO con Decimal (definicion original) """
+    lati, latj = decimal_radians(x1), decimal_radians(x2)
+    longi, longj = decimal_radians(y1), decimal_radians(y2)
+    q1 = math.cos(float(Decimal(f"{longi}") - Decimal(f"{longj}")))
+    q2 = math.cos(float(Decimal(f"{lati}") - Decimal(f"{latj}")))
+    q3 = math.cos(float(Decimal(f"{lati}") + Decimal(f"{latj}")))
+    return int(RRR * math.acos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0)
+
+def decimal_att(x1: float, y1: float, x2: float, y2: float) -> int:
+    """ Distancia ATT con Decimal (definicion original) """
+    diferencia_x = Decimal(f"{x1}") - Decimal(f"{x2}")
+    diferencia_y = Decimal(f"{y1}") - Decimal(f"{y2}")
+    rij = math.sqrt(float(pow(diferencia_x, 2) + pow(diferencia_y, 2)) / 10.0)
+    tij = utilities.dtrunc(rij)
+    return int(tij + 1) if tij < rij else int(tij)
+
+def reference_matrix(reader: TSPlibReader, distance) -> np.ndarray:
+    """ Matriz completa de distancias calculada par a par con la definicion original (incluida la diagonal) """
+    xs, ys = reader.nodeptr.x.tolist(), reader.nodeptr.y.tolist()
+    n = reader.n
+    matrix = np.zeros((n, n), dtype=np.int64)
+    for i in range(n):
+        for j in range(n):
+            matrix[i, j] = distance(xs[i], ys[i], xs[j], ys[j])
+    return matrix
+
+def read(name: str) -> TSPlibReader:
+    return TSPlibReader(str(ROOT / "instances" / f"{name}.tsp"), cache=False)
+
+def explicit_instance(folder, matrix: np.ndarray, fmt: Edge_weight_format) -> str:
+    """ Escribe la matriz simetrica en una instancia EXPLICIT con el formato fmt (definicion de TSPLIB), 7 valores
+        por linea para que las lineas no coincidan con las filas de la matriz """
+    n = len(matrix)
+    name = fmt.value
+    if fmt == Edge_weight_format.FULL_MATRIX:
+        keep = lambda r, c: True
+    elif name.startswith("UPPER"):
+        keep = (lambda r, c: c >= r) if "DIAG" in name else (lambda r, c: c > r)
+    else:
+        keep = (lambda r, c: c <= r) if "DIAG" in name else (lambda r, c: c < r)
+    # en los formatos _COL se recorre la matriz por columnas
+    if name.endswith("COL"):
+        values = [matrix[r, c] for c in range(n) for r in range(n) if keep(r, c)]
+    else:
+        values = [matrix[r, c] for r in range(n) for c in range(n) if keep(r, c)]
+    lines = [" ".join(map(str, values[k:k + 7])) for k in range(0, len(values), 7)]
+    filename = folder / f"{name.lower()}.tsp"
+    filename.write_text(f"NAME : {name.lower()}\nTYPE : TSP\nDIMENSION : {n}\nEDGE_WEIGHT_TYPE : EXPLICIT\n"
+                        f"EDGE_WEIGHT_FORMAT : {name}\nEDGE_WEIGHT_SECTION\n" + "\n".join(lines) + "\nEOF\n")
+    return str(filename)
+
+
+@pytest.mark.parametrize("name", GEO_INSTANCES)
+def test_geo_matrix_matches_decimal(name):
+    reader = read(name)
+    expected = reference_matrix(reader, decimal_geo)
+    assert np.array_equal(np.asarray(reader.distance, dtype=np.int64), expected)
+    # distancias por par (usadas cerca de los limites de redondeo)
+    assert all(reader.geo_distance(i, j) == expected[i, j] for i in range(reader.n) for j in range(reader.n))
+
+@pytest.mark.parametrize("name", ATT_INSTANCES)
+def test_att_matrix_matches_decimal(name):
+    reader = read(name)
+    expected = reference_matrix(reader, decimal_att)
+    assert np.array_equal(np.asarray(reader.distance, dtype=np.int64), expected)
+    assert all(reader.att_distance(i, j) == expected[i, j] for i in range(reader.n) for j in range(reader.n))
+
+def test_decimal_operations_match_decimal():
+    rng = random.Random(0)
+    values = [rng.uniform(-1e4, 1e4) for _ in range(4000)]
+    values += [rng.uniform(-1, 1) * 10 ** rng.randint(-20, 20) for _ in range(4000)]
+    values += [k * math.pi / 180.0 for k in range(-360, 361)] + [k + 0.5 for k in range(-50, 50)]
+    for a, b in zip(values, reversed(values)):
+        x, y = Decimal(f"{a}"), Decimal(f"{b}")
+        pa, pb = decimal_parts(a), decimal_parts(b)
+        assert decimal_float(decimal_sub(pa, pb)) == float(x - y)
+        assert decimal_float(decimal_add(pa, pb)) == float(x + y)
+        assert decimal_float(decimal_add(decimal_mul(pa, pa), decimal_mul(pb, pb))) == float(pow(x, 2) + pow(y, 2))
+
+@pytest.mark.parametrize("high", [1000, 10 ** 5, 3 * 10 ** 9], ids=["int16", "int32", "int64"])
+@pytest.mark.parametrize("chunk", [1 << 20, 16], ids=["chunk1M", "chunk16"])
+@pytest.mark.parametrize("fmt", list(Edge_weight_format), ids=lambda fmt: fmt.value)
+def test_explicit_formats_match_full_matrix(fmt, chunk, high, tmp_path, monkeypatch):
+    # con bloques de lectura pequeños los numeros y las filas quedan cortados entre bloques
+    monkeypatch.setattr(sys.modules["src.tspf.TSPlibReader"], "READ_CHUNK", chunk)
+    rng = np.random.default_rng(3)
+    n = 23
+    upper = np.triu(rng.integers(1, high, (n, n), dtype=np.int64), 1)
+    matrix = upper + upper.T
+    reader = TSPlibReader(explicit_instance(tmp_path, matrix, fmt), cache=False)
+    distance = reader.distance
+    assert reader.n == n and len(distance.packed) == n * (n + 1) // 2
+    assert distance.dtype == compact_dtype(int(matrix.max()))
+    # todos los accesos del triangulo empaquetado: par, fila, bloque de filas y arreglos de pares
+    assert all(distance[i, j] == matrix[i, j] for i in range(n) for j in range(n))
+    assert all(np.array_equal(distance[i], matrix[i]) for i in range(n))
+    assert np.array_equal(distance[5:17], matrix[5:17])
+    i, j = rng.integers(0, n, 100), rng.integers(0, n, 100)
+    assert np.array_equal(distance[i, j], matrix[i, j])
+    # listas de candidatos ordenadas por distancia
+    for node in range(n):
+        row = matrix[node][reader.nn_list[node]]
+        assert node not in reader.nn_list[node] and np.all(row[:-1] <= row[1:])
+
+def variant_instance(folder, name: str, edge_weight_type: str, scale: float = 1.0) -> str:
+    """ Copia de la instancia con otro EDGE_WEIGHT_TYPE y las coordenadas multiplicadas por scale """
+    lines = (ROOT / "instances" / f"{name}.tsp").read_text().splitlines()
+    start = next(i for i, line in enumerate(lines) if line.startswith("NODE_COORD_SECTION")) + 1
+    for i, line in enumerate(lines):
+        if line.startswith("EDGE_WEIGHT_TYPE"):
+            lines[i] = f"EDGE_WEIGHT_TYPE : {edge_weight_type}"
+        elif i >= start and line.split() and line.split()[0] != "EOF":
+            index, x, y = line.split()
+            lines[i] = f"{index} {float(x) * scale:.1f} {float(y) * scale:.1f}"
+    filename = folder / f"{name}-{edge_weight_type.lower()}-{scale:g}.tsp"
+    filename.write_text("\n".join(lines) + "\n")
+    return str(filename)
+
+@pytest.mark.parametrize("lazy", [False, True], ids=["matrix", "lazy"])
+@pytest.mark.parametrize("instance", ["berlin52", "ulysses22", "att532", "1000-3", "ceil_2d", "int64"])
+def test_parallel_matches_serial(instance, lazy, tmp_path, capsys):
+    if instance == "ceil_2d":
+        filename = variant_instance(tmp_path, "kroA100", "CEIL_2D")
+    elif instance == "int64":
+        # distancias sobre el maximo de int32, la matriz compartida se crea con int64
+        filename = variant_instance(tmp_path, "kroA100", "EUC_2D", 1e6)
+    else:
+        filename = str(ROOT / "instances" / f"{instance}.tsp")
+    serial = TSPlibReader(filename, lazy=lazy, cache=False)
+    capsys.readouterr()
+    parallel = TSPlibReader(filename, lazy=lazy, cache=False, workers=2)
+    assert "Preprocesamiento en paralelo con 2 procesos" in capsys.readouterr().out
+    assert np.array_equal(parallel.nn_list, serial.nn_list)
+    if lazy:
+        return
+    assert parallel.distance.dtype == serial.distance.dtype
+    assert instance != "int64" or serial.distance.dtype == np.int64
+    assert np.array_equal(parallel.distance, serial.distance)
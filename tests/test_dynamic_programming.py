@@ -0,0 +1,74 @@
+"""
+Pruebas de la programación dinámica de Held-Karp
+
+"""
+
+import random
+import sys
+from itertools import permutations
+
+import pytest
+
+from conftest import ROOT
+from src.tspf import AlgorithmsOptions, Tsp
+from src.tspf.Algorithms import DynamicProgramming
+
+MODULE = "src.tspf.Algorithms.DynamicProgramming"
+
+
+@pytest.fixture(autouse=True)
+def options(monkeypatch) -> AlgorithmsOptions:
+    monkeypatch.setattr(AlgorithmsOptions, "use_cache", False)
+    monkeypatch.setattr(sys, "argv", sys.argv[:1]) # AlgorithmsOptions lee los argumentos de la linea de comandos
+    options = AlgorithmsOptions()
+    options.silent = True
+    return options
+
+def random_instance(folder, seed: int, n: int) -> str:
+    rng = random.Random(seed)
+    filename = folder / f"random{seed}.tsp"
+    with open(filename, "w") as file:
+        file.write(f"NAME : random{seed}\nTYPE : TSP\nDIMENSION : {n}\nEDGE_WEIGHT_TYPE : EUC_2D\nNODE_COORD_SECTION\n")
+        for i in range(n):
+            file.write(f"{i + 1} {rng.uniform(0, 1000):.2f} {rng.uniform(0, 1000):.2f}\n")
+        file.write("EOF\n")
+    return str(filename)
+
+def brute_force(problem: Tsp) -> int:
+    """ Costo optimo revisando todos los tours que comienzan en el nodo 0 """
+    n = problem.getSize()
+    return min(problem.compute_tour_length([0, *order, 0]) for order in permutations(range(1, n)))
+
+def solve(problem: Tsp, options: AlgorithmsOptions) -> DynamicProgramming:
+    solver = DynamicProgramming(options=options, problem=problem)
+    solver.search()
+    assert solver.best_tour.current[0] == solver.best_tour.current[-1]
+    assert sorted(solver.best_tour.current[:-1]) == list(range(problem.getSize()))
+    assert solver.best_tour.cost == problem.compute_tour_length(solver.best_tour.current)
+    return solver
+
+
+@pytest.mark.parametrize("n", range(4, 9))
+@pytest.mark.parametrize("seed", range(3))
+def test_dynamic_programming_matches_brute_force(n, seed, options, tmp_path):
+    problem = Tsp(filename=random_instance(tmp_path, 100 * n + seed, n))
+    solver = solve(problem, options)
+    assert solver.optimal
+    assert solver.best_tour.cost == brute_force(problem)
+
+def test_dynamic_programming_burma14_optimum(options):
+    solver = solve(Tsp(filename=str(ROOT / "instances" / "burma14.tsp")), options)
+    assert solver.optimal
+    assert solver.best_tour.cost == 3323
+
+WARNINGS = {"DP_MAX_NODES": "resuelve hasta 10 nodos", "DP_MEMORY_LIMIT": "el límite es"}
+
+@pytest.mark.parametrize("limit", WARNINGS)
+def test_dynamic_programming_falls_back_to_local_search(limit, options, monkeypatch, capsys):
+    monkeypatch.setattr(sys.modules[MODULE], limit, 10)
+    solver = solve(Tsp(filename=str(ROOT / "instances" / "burma14.tsp")), options)
+    output = capsys.readouterr().out
+    # solo la advertencia del limite superado, luego la búsqueda de Local Search
+    assert [message in output for message in WARNINGS.values()] == [key == limit for key in WARNINGS]
+    assert not solver.optimal
+    assert solver.evaluations > 1 and solver.trajectory
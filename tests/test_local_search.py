@@ -0,0 +1,41 @@
+"""
+Pruebas de la búsqueda local
+
+"""
+
+import sys
+
+import pytest
+from prettytable import PrettyTable
+
+from conftest import ROOT
+from src.tspf import AlgorithmsOptions, Tsp, Tour, InitialSolution, TourBackend, TSPMove
+from src.tspf.Algorithms import LocalSearch
+from src.tspf.Tools import utilities
+
+
+def two_opt_search(problem: Tsp, backend: TourBackend, best: bool, seed: int) -> tuple:
+    """ Búsqueda 2-opt desde un tour aleatorio, retorna el tour final, su costo, el mejor tour y la trayectoria """
+    options = AlgorithmsOptions(tour_backend=backend.value)
+    options.move, options.bestImprovement, options.silent = TSPMove.TWO_OPT, best, True
+    utilities.random.seed(seed)
+    first = Tour(problem=problem, type_initial_sol=InitialSolution.RANDOM)
+    solver = LocalSearch(options=options, problem=problem)
+    solver.best_tour.copy(first)
+    tour = Tour(tour=first)
+    solver.twoOptSearch(tour, PrettyTable())
+    trajectory = [(point.tour, point.cost) for point in solver.trajectory]
+    return tour.current, tour.cost, solver.best_tour.current, solver.best_tour.position, trajectory, solver.evaluations
+
+
+@pytest.mark.parametrize("name", ["burma14", "berlin52", "st70"])
+@pytest.mark.parametrize("best", [False, True])
+def test_linked_two_opt_search_matches_array(name, best, monkeypatch):
+    monkeypatch.setattr(AlgorithmsOptions, "use_cache", False)
+    monkeypatch.setattr(sys, "argv", sys.argv[:1]) # AlgorithmsOptions lee los argumentos de la linea de comandos
+    problem = Tsp(filename=str(ROOT / "instances" / f"{name}.tsp"))
+    for seed in range(3):
+        array = two_opt_search(problem, TourBackend.ARRAY, best, seed)
+        linked = two_opt_search(problem, TourBackend.LINKED, best, seed)
+        assert linked == array
+        assert linked[1] == problem.compute_tour_length(linked[0])
@@ -0,0 +1,43 @@
+"""
+Pruebas de la cota inferior de Held-Karp
+
+"""
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from src.tspf import AlgorithmsOptions, Tsp, LowerBound
+
+# Optimos conocidos de TSPLIB
+OPTIMUM = {"eil51": 426, "berlin52": 7542, "st70": 675, "kroA100": 21282}
+
+
+@pytest.mark.parametrize("name", OPTIMUM)
+@pytest.mark.parametrize("one_tree", ["sparse", "dense"])
+def test_held_karp_bound_below_optimum(name, one_tree, monkeypatch):
+    monkeypatch.setattr(AlgorithmsOptions, "use_cache", False)
+    if one_tree == "dense":
+        # sin 1-arboles sobre las listas de candidatos todas las iteraciones usan Prim sobre el grafo completo
+        monkeypatch.setattr(LowerBound, "sparse_one_tree", lambda self, pi, edges: None)
+    problem = Tsp(filename=str(ROOT / "instances" / f"{name}.tsp"))
+    bound = LowerBound(problem)
+    assert bound.exact
+    assert 0.95 * OPTIMUM[name] <= bound.bound <= OPTIMUM[name]
+
+@pytest.mark.parametrize("name", OPTIMUM)
+def test_one_trees_are_lower_bounds(name, monkeypatch):
+    monkeypatch.setattr(AlgorithmsOptions, "use_cache", False)
+    problem = Tsp(filename=str(ROOT / "instances" / f"{name}.tsp"))
+    bound = LowerBound(problem, iterations=0)
+    edges = bound.candidate_edges()
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        pi = rng.normal(0.0, 0.05 * OPTIMUM[name] / problem.nodes, problem.nodes)
+        dense, degree = bound.dense_one_tree(pi, edges)
+        # cualquier penalizacion da una cota valida con el 1-arbol sobre el grafo completo
+        assert dense - 2.0 * pi.sum() <= OPTIMUM[name] + 1e-6
+        assert degree.sum() == 2 * problem.nodes
+        # restringido a las aristas candidatas el 1-arbol no puede ser mas liviano
+        sparse = bound.sparse_one_tree(pi, edges)
+        assert sparse is None or sparse[0] >= dense - 1e-6
@@ -0,0 +1,103 @@
+"""
+Pruebas de los movimientos aleatorios del tour
+
+"""
+
+import math
+from collections import Counter
+
+import pytest
+
+from conftest import ROOT
+from src.tspf import AlgorithmsOptions, Tsp, Tour, InitialSolution
+from src.tspf.Tools import utilities
+
+
+def load(name: str, monkeypatch) -> Tour:
+    monkeypatch.setattr(AlgorithmsOptions, "use_cache", False)
+    problem = Tsp(filename=str(ROOT / "instances" / f"{name}.tsp"))
+    return Tour(problem=problem, type_initial_sol=InitialSolution.RANDOM)
+
+def three_opt_triples(n: int) -> list:
+    """ Tripletes validos del movimiento 3-opt, los mismos que recorre la búsqueda local """
+    return [(i, j, k) for i in range(n) for j in range(i + 2, n) for k in range(j + 2, n + (i > 0))]
+
+
+@pytest.mark.parametrize("name", ["burma14", "ulysses16"])
+def test_three_opt_sampler_is_uniform(name, monkeypatch):
+    tour = load(name, monkeypatch)
+    valid = three_opt_triples(tour.problem.getSize())
+    samples = 200 * len(valid)
+    utilities.random.seed(1)
+    counts = Counter(tour.getIndThreeOpt() for _ in range(samples))
+
+    # solo tripletes validos y todos aparecen
+    assert set(counts) == set(valid)
+    # chi cuadrado de Pearson contra la distribucion uniforme, limite de ~6 desviaciones (aproximacion normal)
+    expected = samples / len(valid)
+    chi2 = sum((counts[t] - expected) ** 2 / expected for t in valid)
+    df = len(valid) - 1
+    assert chi2 < df + 6 * math.sqrt(2 * df)
+
+def test_or_opt_covers_wrapping_segments(monkeypatch):
+    tour = load("burma14", monkeypatch)
+    problem = tour.problem
+    n = problem.getSize()
+    moves = 0
+    for i in range(n):
+        for length in range(1, 4):
+            for p in range(n):
+                if not tour.valid_or_opt(i, length, p):
+                    continue
+                for reverse in (False, True):
+                    moved = Tour(tour=tour)
+                    moved.orOptMove(i, length, p, reverse)
+                    assert moved.cost == problem.compute_tour_length(moved.current)
+                    assert moved.cost == tour.delta_cost_or_opt(tour.current, tour.cost, i, length, p, reverse)
+                    assert all(moved.getPosition(node) == moved.current.index(node) for node in range(n))
+                    moves += 1
+    # cada segmento (incluidos los que pasan por el final) se puede insertar en las n-length-1 aristas restantes
+    assert moves == sum(2 * n * (n - length - 1) for length in range(1, 4))
+
+def edges(current: list) -> set:
+    """ Aristas no dirigidas de un recorrido cerrado """
+    return {frozenset(edge) for edge in zip(current, current[1:])}
+
+@pytest.mark.parametrize("name", ["berlin52", "ulysses16"])
+def test_two_opt_swap_matches_section_reversal(name, monkeypatch):
+    tour = load(name, monkeypatch)
+    problem = tour.problem
+    n = problem.getSize()
+    utilities.random.seed(2)
+    for _ in range(500):
+        n1, n2 = utilities.random.randrange(n), utilities.random.randrange(n)
+        s, e = min(n1, n2), max(n1, n2)
+        # definicion original: invertir la seccion [s,e]
+        expected = tour.current[:s] + tour.current[s:e + 1][::-1] + tour.current[e + 1:]
+        expected[n] = expected[0]
+        tour.twoOptSwap(n1, n2)
+        assert tour.current[n] == tour.current[0]
+        assert edges(tour.current) == edges(expected)
+        assert tour.cost == problem.compute_tour_length(tour.current)
+        assert all(tour.getPosition(node) == index for index, node in enumerate(tour.current[:n]))
+
+@pytest.mark.parametrize("move", range(1, 8))
+@pytest.mark.parametrize("name", ["burma14", "ulysses16"])
+def test_three_opt_delta_matches_move(name, move, monkeypatch):
+    tour = load(name, monkeypatch)
+    problem = tour.problem
+    n = problem.getSize()
+    for i, j, k in three_opt_triples(n):
+        moved = Tour(tour=tour)
+        moved.threeOptMove(i, j, k, move)
+        real = problem.compute_tour_length(moved.current) - tour.cost
+        deltas = tour.three_opt_deltas(tour.current, i, j, k)
+        assert deltas[move - 1] == real
+        assert moved.current[n] == moved.current[0] and sorted(moved.current[:n]) == list(range(n))
+        assert all(moved.getPosition(node) == index for index, node in enumerate(moved.current[:n]))
+        # la mejor reconexion retornada es la de menor cambio real
+        cost, best = tour.delta_cost_three_opt(tour.current, tour.cost, i, j, k)
+        if best:
+            assert cost - tour.cost == min(deltas) < 0 and deltas[best - 1] == min(deltas)
+        else:
+            assert cost == tour.cost and min(deltas) >= 0
@@ -0,0 +1,65 @@
+"""
+Pruebas de las soluciones iniciales del problema
+
+"""
+
+import random
+import sys
+
+import pytest
+
+from conftest import ROOT
+from src.tspf import AlgorithmsOptions, Tsp
+
+
+def clustered_instance(folder, seed: int, n: int = 100, clusters: int = 10) -> str:
+    """ Instancia EUC_2D con nodos agrupados alrededor de centros aleatorios, muchas inserciones con costos parecidos """
+    rng = random.Random(seed)
+    centers = [(rng.uniform(0, 1e7), rng.uniform(0, 1e7)) for _ in range(clusters)]
+    filename = folder / f"clustered{seed}.tsp"
+    with open(filename, "w") as file:
+        file.write(f"NAME : clustered{seed}\nTYPE : TSP\nDIMENSION : {n}\nEDGE_WEIGHT_TYPE : EUC_2D\nNODE_COORD_SECTION\n")
+        for i in range(n):
+            x, y = centers[i % clusters]
+            file.write(f"{i + 1} {rng.gauss(x, 1e5):.0f} {rng.gauss(y, 1e5):.0f}\n")
+        file.write("EOF\n")
+    return str(filename)
+
+def check_cheapest_insertion(problem: Tsp) -> None:
+    """ Repite las inserciones de cheapest_insertion sobre el ciclo parcial, en cada paso la insercion elegida debe
+        tener el menor costo de todas (referencia ingenua sobre todos los nodos libres y aristas) """
+    n = problem.getSize()
+    # el ciclo inicial 0 -> 0 no tiene largo (en GEO la diagonal de la matriz es 1)
+    distance = lambda i, j: problem.get_distance(i, j) if i != j else 0
+    trace = []
+    tour = problem.cheapest_insertion(trace)
+    assert len(trace) == n - 1
+
+    succ = {0: 0}
+    for node, before, cost in trace:
+        assert node not in succ and before in succ
+        best = min(distance(i, v) + distance(v, j) - distance(i, j)
+                   for v in range(n) if v not in succ for i, j in succ.items())
+        after = succ[before]
+        assert cost == distance(before, node) + distance(node, after) - distance(before, after) == best
+        succ[before], succ[node] = node, after
+
+    # el tour retornado es el ciclo construido
+    assert tour[0] == tour[-1] == 0 and sorted(tour[:-1]) == list(range(n))
+    assert all(succ[a] == b for a, b in zip(tour, tour[1:]))
+
+
+@pytest.fixture(params=[1, 16], ids=lambda k: f"candidates{k}")
+def candidates(request, monkeypatch):
+    """ Cantidad de inserciones candidatas, con pocas las listas se compactan y agotan mas seguido """
+    monkeypatch.setattr(AlgorithmsOptions, "use_cache", False)
+    monkeypatch.setattr(sys.modules["src.tspf.Tsp"], "INSERTION_CANDIDATES", request.param)
+    return request.param
+
+@pytest.mark.parametrize("name", ["burma14", "eil51", "kroA100"])
+def test_cheapest_insertion_steps_match_naive(name, candidates):
+    check_cheapest_insertion(Tsp(filename=str(ROOT / "instances" / f"{name}.tsp")))
+
+@pytest.mark.parametrize("seed", range(6))
+def test_cheapest_insertion_steps_match_naive_clustered(seed, candidates, tmp_path):
+    check_cheapest_insertion(Tsp(filename=clustered_instance(tmp_path, seed)))